@@ -18,6 +18,28 @@ load_dotenv(BASE_DIR / ".env")
 # Gemini API
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite")
+# API 엔드포인트 재지정 (예: scripts/fake_gemini.py 로컬 가짜 서버). 비우면 기본 엔드포인트.
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "")
+
+# Gemini HTTP 연결 풀 (공유 클라이언트)
+GEMINI_HTTP_POOL_SIZE = int(os.getenv("GEMINI_HTTP_POOL_SIZE", "20"))
+GEMINI_HTTP_KEEPALIVE_SECONDS = float(os.getenv("GEMINI_HTTP_KEEPALIVE_SECONDS", "60"))
+GEMINI_HTTP_TIMEOUT_SECONDS = int(os.getenv("GEMINI_HTTP_TIMEOUT_SECONDS", "120"))
+
+# Gemini 호출 공용 Rate Limit (토큰 버킷, 0이면 비활성화)
+GEMINI_RATE_LIMIT_RPM = float(os.getenv("GEMINI_RATE_LIMIT_RPM", "60"))
+GEMINI_RATE_LIMIT_BURST = int(os.getenv("GEMINI_RATE_LIMIT_BURST", "10"))
+
+# Gemini 생성 호출 재시도 / 데드라인 / hedging / 서킷 브레이커
+GEMINI_DEADLINE_SECONDS = float(os.getenv("GEMINI_DEADLINE_SECONDS", "60"))
+GEMINI_BACKGROUND_DEADLINE_SECONDS = float(os.getenv("GEMINI_BACKGROUND_DEADLINE_SECONDS", "300"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+GEMINI_RETRY_BASE_DELAY = float(os.getenv("GEMINI_RETRY_BASE_DELAY", "1"))
+GEMINI_RETRY_MAX_DELAY = float(os.getenv("GEMINI_RETRY_MAX_DELAY", "20"))
+GEMINI_HEDGE_ENABLED = os.getenv("GEMINI_HEDGE_ENABLED", "false").lower() == "true"
+GEMINI_HEDGE_MIN_SAMPLES = int(os.getenv("GEMINI_HEDGE_MIN_SAMPLES", "20"))
+GEMINI_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("GEMINI_CIRCUIT_FAILURE_THRESHOLD", "5"))
+GEMINI_CIRCUIT_RESET_SECONDS = float(os.getenv("GEMINI_CIRCUIT_RESET_SECONDS", "30"))
 
 # JWT 인증
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "change-this-secret-key")
@@ -27,6 +49,29 @@ JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "480"))
 # 교정 모드: "auto" 또는 "manual"
 CORRECTION_MODE = os.getenv("CORRECTION_MODE", "manual")
 
+# 대화 히스토리: 최근 N턴은 토큰 예산 안에서 원문 유지, 그 이전은 누적 요약으로 대체
+# (밀려난 대화가 HISTORY_SUMMARY_MIN_CHARS자 이상 쌓이면 응답 후 백그라운드에서 요약 갱신)
+HISTORY_MAX_TURNS = int(os.getenv("HISTORY_MAX_TURNS", "6"))
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "4000"))
+HISTORY_CHARS_PER_TOKEN = float(os.getenv("HISTORY_CHARS_PER_TOKEN", "2"))
+HISTORY_SUMMARY_MAX_CHARS = int(os.getenv("HISTORY_SUMMARY_MAX_CHARS", "800"))
+HISTORY_SUMMARY_MIN_CHARS = int(os.getenv("HISTORY_SUMMARY_MIN_CHARS", "1000"))
+
+# 로컬 교정 인덱스: 질문과 겹치는 승인 교정이 있을 때만 교정 Store 검색
+CORRECTION_INDEX_ENABLED = os.getenv("CORRECTION_INDEX_ENABLED", "true").lower() == "true"
+CORRECTION_INDEX_MIN_OVERLAP = float(os.getenv("CORRECTION_INDEX_MIN_OVERLAP", "0.3"))
+
+# 승인 교정 직접 답변 (fast path): 원 질문 유사도·신뢰도가 모두 기준 이상이면 Gemini 호출 생략
+CORRECTION_FAST_PATH_ENABLED = os.getenv("CORRECTION_FAST_PATH_ENABLED", "false").lower() == "true"
+CORRECTION_FAST_PATH_THRESHOLD = float(os.getenv("CORRECTION_FAST_PATH_THRESHOLD", "0.85"))
+CORRECTION_FAST_PATH_MIN_CONFIDENCE = float(os.getenv("CORRECTION_FAST_PATH_MIN_CONFIDENCE", "0.9"))
+
+# 세션 제목 생성: 배치 모드면 유휴 시간에 대기 중인 제목을 한 번의 호출로 생성
+TITLE_BATCH_ENABLED = os.getenv("TITLE_BATCH_ENABLED", "false").lower() == "true"
+TITLE_BATCH_MAX_SIZE = int(os.getenv("TITLE_BATCH_MAX_SIZE", "20"))
+TITLE_BATCH_INTERVAL_SECONDS = float(os.getenv("TITLE_BATCH_INTERVAL_SECONDS", "10"))
+TITLE_BATCH_IDLE_SECONDS = float(os.getenv("TITLE_BATCH_IDLE_SECONDS", "5"))
+
 # 서버
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "8000"))
@@ -34,6 +79,46 @@ PORT = int(os.getenv("PORT", "8000"))
 # File Search Store 이름 (런타임에 설정됨)
 PRIMARY_STORE_DISPLAY_NAME = "사내규정-원본"
 CORRECTION_STORE_DISPLAY_NAME = "사내규정-교정"
+# display_name → Store 리소스 이름 해석 캐시 유효 시간(초)
+STORE_CACHE_TTL_SECONDS = int(os.getenv("STORE_CACHE_TTL_SECONDS", "600"))
+
+# 문서 업로드: 동시에 전송하는 최대 파일 수
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "8"))
+
+# HWP 업로드 시 본문(BodyText/Section*)을 텍스트로 추출해 전송 (실패하면 원본 바이너리 전송)
+HWP_TEXT_EXTRACTION = os.getenv("HWP_TEXT_EXTRACTION", "true").lower() == "true"
+
+# 업로드 작업 큐: 동시에 처리하는 작업 수, 브라우저 업로드 파일 보관 위치 (전송 즉시 삭제)
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+INGEST_STAGING_DIR = DATA_DIR / "ingest_staging"
+# 스테이징 공간 한도(MB): 넘으면 대기 파일이 전송될 때까지 요청 본문 수신을 멈춤
+INGEST_STAGING_MAX_MB = int(os.getenv("INGEST_STAGING_MAX_MB", "512"))
+
+# 업로드 후 카테고리 일괄 분류: 한 번의 호출로 분류하는 파일 수 (응답에서 빠진 항목은 절반 크기로 재요청)
+CATEGORY_BATCH_SIZE = int(os.getenv("CATEGORY_BATCH_SIZE", "50"))
+
+# 재개 가능한 분할 업로드: 청크 크기(MB), 보관 공간 한도(MB), 미완료 업로드 보관 시간
+RESUMABLE_DIR = DATA_DIR / "resumable"
+RESUMABLE_CHUNK_MB = int(os.getenv("RESUMABLE_CHUNK_MB", "4"))
+RESUMABLE_MAX_MB = int(os.getenv("RESUMABLE_MAX_MB", "4096"))
+RESUMABLE_EXPIRE_HOURS = int(os.getenv("RESUMABLE_EXPIRE_HOURS", "72"))
+
+# 폴더 감시 수집 데몬 (scripts/01_load.py): 감시 디렉토리(쉼표 구분), 쓰기가 잠잠해질 때까지 기다릴 시간(초),
+# inotify를 쓸 수 없을 때 mtime/크기 비교 주기(초)
+WATCH_DIRS = [d.strip() for d in os.getenv("WATCH_DIRS", "").split(",") if d.strip()]
+WATCH_DEBOUNCE_SECONDS = float(os.getenv("WATCH_DEBOUNCE_SECONDS", "5"))
+WATCH_SCAN_INTERVAL_SECONDS = float(os.getenv("WATCH_SCAN_INTERVAL_SECONDS", "60"))
+
+# 답변 캐시 (히스토리 없는 반복 질문)
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "500"))
+
+# 동일 질문 동시 요청 병합 (히스토리 없는 질문, 같은 지식 베이스 지문)
+COALESCE_ENABLED = os.getenv("COALESCE_ENABLED", "true").lower() == "true"
+COALESCE_FOLLOWER_TIMEOUT_SECONDS = float(os.getenv("COALESCE_FOLLOWER_TIMEOUT_SECONDS", "60"))
+
+# 단계별 지연 메트릭 (/metrics Prometheus 노출 + API 응답 Server-Timing 헤더)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
 
 # 시스템 프롬프트 — 교정 데이터 우선순위 규칙
 SYSTEM_PROMPT = """당신은 사내 규정 전문가 AI 어시스턴트입니다.
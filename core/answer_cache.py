@@ -0,0 +1,89 @@
+"""
+답변 캐시 모듈
+히스토리 없는 질문에 대해 (정규화된 질문 + 지식 베이스 지문) → 답변을 LRU로 캐시
+"""
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+import config
+from server.database import get_db
+
+_cache: OrderedDict[tuple, dict] = OrderedDict()
+_lock = threading.Lock()
+_hits = 0
+_misses = 0
+
+
+def normalize_question(message: str) -> str:
+    """공백·대소문자·전각문자·끝 문장부호 차이를 제거한 질문 키"""
+    text = unicodedata.normalize("NFKC", message).lower()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.rstrip("?!.。？！ ")
+
+
+def knowledge_base_fingerprint() -> str:
+    """
+    현재 지식 베이스 상태의 지문.
+    문서 업로드/최신 버전 지정/교정 승인 시 값이 바뀌도록 DB 집계값으로 계산한다.
+    """
+    conn = get_db()
+    try:
+        docs = conn.execute(
+            "SELECT count(*), max(rowid), sum(is_latest * rowid) FROM documents"
+        ).fetchone()
+        corrections = conn.execute(
+            "SELECT count(*), max(reviewed_at) FROM corrections WHERE status = 'approved'"
+        ).fetchone()
+    finally:
+        conn.close()
+    raw = f"{tuple(docs)}|{tuple(corrections)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def make_key(message: str, use_correction_store: bool) -> tuple:
+    return (normalize_question(message), use_correction_store, knowledge_base_fingerprint())
+
+
+def get(key: tuple) -> dict | None:
+    """캐시 조회 (히트 시 LRU 순서 갱신)"""
+    global _hits, _misses
+    with _lock:
+        result = _cache.get(key)
+        if result is None:
+            _misses += 1
+            return None
+        _cache.move_to_end(key)
+        _hits += 1
+        return dict(result)
+
+
+def put(key: tuple, result: dict):
+    """캐시 저장 (최대 크기 초과 시 가장 오래 안 쓰인 항목 제거)"""
+    with _lock:
+        _cache[key] = dict(result)
+        _cache.move_to_end(key)
+        while len(_cache) > config.ANSWER_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def purge() -> int:
+    """전체 캐시 비우기. 제거된 항목 수 반환."""
+    with _lock:
+        count = len(_cache)
+        _cache.clear()
+        return count
+
+
+def stats() -> dict:
+    with _lock:
+        total = _hits + _misses
+        return {
+            "enabled": config.ANSWER_CACHE_ENABLED,
+            "entries": len(_cache),
+            "max_entries": config.ANSWER_CACHE_MAX_ENTRIES,
+            "hits": _hits,
+            "misses": _misses,
+            "hit_rate": round(_hits / total, 4) if total else 0.0,
+        }
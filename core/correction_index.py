@@ -0,0 +1,176 @@
+"""
+승인 교정 데이터 로컬 전문 검색 인덱스 (SQLite FTS5)
+original_question / extracted_fact를 문자 bigram으로 색인하여,
+질문과 겹치는 교정이 있을 때만 교정 Store를 File Search 대상에 포함시킨다.
+"""
+import re
+import sqlite3
+import unicodedata
+import config
+from server.database import get_db
+
+INDEX_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS correction_index USING fts5(
+    correction_id UNINDEXED,
+    question_grams,
+    fact_grams,
+    tokenize = 'unicode61'
+);
+"""
+
+# FTS5 사용 가능 여부 (init_index에서 결정, 불가하면 항상 교정 Store 포함)
+_available = False
+
+
+def char_ngrams(text: str, n: int = 2) -> set[str]:
+    """
+    한국어 대응 문자 n-gram 집합.
+    조사가 붙은 어절("연차는")도 "연차"와 겹치도록 어절 단위로 n글자씩 자른다.
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    grams = set()
+    for word in re.findall(r"\w+", text):
+        if len(word) <= n:
+            grams.add(word)
+        else:
+            grams.update(word[i:i + n] for i in range(len(word) - n + 1))
+    return grams
+
+
+def _index_row(conn, correction_id: str, original_question: str, extracted_fact: str):
+    conn.execute("DELETE FROM correction_index WHERE correction_id = ?", (correction_id,))
+    conn.execute(
+        "INSERT INTO correction_index (correction_id, question_grams, fact_grams) VALUES (?, ?, ?)",
+        (
+            correction_id,
+            " ".join(sorted(char_ngrams(original_question))),
+            " ".join(sorted(char_ngrams(extracted_fact))),
+        ),
+    )
+
+
+def init_index():
+    """인덱스 테이블 생성 + 승인 교정 수와 다르면 전체 재색인 (서버 시작 시 호출)"""
+    global _available
+    conn = get_db()
+    try:
+        conn.executescript(INDEX_SQL)
+    except sqlite3.OperationalError as e:
+        print(f"⚠️ FTS5를 사용할 수 없어 교정 인덱스를 비활성화합니다: {e}")
+        _available = False
+        return
+    finally:
+        conn.close()
+    _available = True
+
+    conn = get_db()
+    try:
+        indexed = conn.execute("SELECT count(*) FROM correction_index").fetchone()[0]
+        rows = conn.execute(
+            "SELECT id, original_question, extracted_fact FROM corrections WHERE status = 'approved'"
+        ).fetchall()
+        if indexed != len(rows):
+            conn.execute("DELETE FROM correction_index")
+            for r in rows:
+                _index_row(conn, r["id"], r["original_question"], r["extracted_fact"])
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def index_correction(conn, correction_id: str, original_question: str, extracted_fact: str):
+    """승인된 교정 1건 색인 (호출자의 트랜잭션 안에서 실행)"""
+    if _available:
+        _index_row(conn, correction_id, original_question, extracted_fact)
+
+
+def search(question: str, limit: int = 5) -> list[dict]:
+    """
+    질문과 겹치는 승인 교정 검색.
+    반환: [{"correction_id": str, "score": float, "question_score": float}]
+        score는 질문 bigram 중 교정 질문/사실과 겹치는 비율, question_score는 교정 원 질문과의 유사도
+    """
+    grams = char_ngrams(question)
+    if not _available or not grams:
+        return []
+
+    match = " OR ".join(f'"{g}"' for g in grams)
+    conn = get_db()
+    try:
+        rows = conn.execute(
+            """SELECT correction_id, question_grams, fact_grams FROM correction_index
+            WHERE correction_index MATCH ? ORDER BY bm25(correction_index) LIMIT ?""",
+            (match, limit),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    results = []
+    for r in rows:
+        question_grams = set(r["question_grams"].split())
+        doc_grams = question_grams | set(r["fact_grams"].split())
+        results.append({
+            "correction_id": r["correction_id"],
+            "score": len(grams & doc_grams) / len(grams),
+            # 교정 원 질문과의 Dice 유사도 (직접 답변 판단용)
+            "question_score": 2 * len(grams & question_grams) / (len(grams) + len(question_grams))
+            if question_grams else 0.0,
+        })
+    results.sort(key=lambda x: x["score"], reverse=True)
+    return results
+
+
+def has_unindexed_documents() -> bool:
+    """
+    교정 Store에 승인 교정("{correction_id}.txt")이 아닌 문서가 있는지.
+    관리자가 store_type="correction"으로 직접 올린 문서는 인덱스에 없으므로 질문과 무관하게 검색해야 한다.
+    """
+    conn = get_db()
+    try:
+        row = conn.execute(
+            """SELECT 1 FROM documents d WHERE d.store_type = 'correction'
+            AND NOT EXISTS (SELECT 1 FROM corrections c WHERE c.id || '.txt' = d.file_name)
+            LIMIT 1"""
+        ).fetchone()
+    finally:
+        conn.close()
+    return row is not None
+
+
+def has_likely_match(question: str) -> bool:
+    """
+    교정 Store를 검색에 포함할 만한 승인 교정이 있는지.
+    인덱스 비활성이거나 인덱스 밖의 교정 Store 문서가 있으면 항상 True.
+    """
+    if not _available or not config.CORRECTION_INDEX_ENABLED:
+        return True
+    if has_unindexed_documents():
+        return True
+    return any(r["score"] >= config.CORRECTION_INDEX_MIN_OVERLAP for r in search(question))
+
+
+def find_direct_answer(question: str) -> dict | None:
+    """
+    원 질문이 거의 같고 신뢰도가 높은 승인 교정 1건 반환 (직접 답변 fast path용).
+    기준: question_score >= CORRECTION_FAST_PATH_THRESHOLD, confidence >= CORRECTION_FAST_PATH_MIN_CONFIDENCE
+    """
+    candidates = [
+        r for r in search(question)
+        if r["question_score"] >= config.CORRECTION_FAST_PATH_THRESHOLD
+    ]
+    if not candidates:
+        return None
+    best = max(candidates, key=lambda r: r["question_score"])
+
+    conn = get_db()
+    try:
+        row = conn.execute(
+            """SELECT id, original_question, extracted_fact, confidence FROM corrections
+            WHERE id = ? AND status = 'approved' AND confidence >= ?""",
+            (best["correction_id"], config.CORRECTION_FAST_PATH_MIN_CONFIDENCE),
+        ).fetchone()
+    finally:
+        conn.close()
+    if not row:
+        return None
+    return {**dict(row), "similarity": best["question_score"]}
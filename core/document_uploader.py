@@ -1,11 +1,22 @@
 """
 문서 업로드 및 인덱싱 모듈
 HWP, PDF, DOCX 등 파일을 File Search Store에 업로드하고 인덱싱 완료를 대기
+여러 파일은 UPLOAD_CONCURRENCY개까지 동시에 업로드하고, 인덱싱 operation은 프로세스 공용 폴러 하나가
+적응형 간격(MIME 타입·크기별 학습된 예상 시간 + 지수 백오프)으로 함께 확인한다.
 """
+import hashlib
+import heapq
+import io
+import itertools
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from google import genai
+from typing import Callable
+from google.genai import types
 import config
+from core import hwp_text, resilience
+from core.gemini_client import get_client
 
 # 지원 확장자 → MIME 타입 매핑
 MIME_MAP = {
@@ -22,90 +33,358 @@ MIME_MAP = {
 
 # 최대 폴링 대기 시간(초)
 MAX_POLL_SECONDS = 300
-POLL_INTERVAL = 5
+# 적응형 폴링: 첫 확인 간격(초), 백오프 배수, 최대 간격(초)
+POLL_INITIAL_INTERVAL = 0.5
+POLL_BACKOFF = 2
+POLL_MAX_INTERVAL = 10
+# 학습된 예상 인덱싱 시간의 이 비율 시점에 첫 확인 (EWMA 가중치)
+POLL_EXPECTED_RATIO = 0.8
+POLL_EWMA_ALPHA = 0.3
+# 일시적 조회 오류(5xx/타임아웃/연결 오류)가 연속 이 횟수에 닿으면 해당 파일 실패 처리
+POLL_MAX_ERRORS = 5
+# upload_files(more=...) 사용 시 새 파일 도착 확인 간격(초)
+MORE_POLL_SECONDS = 0.5
 
 
-def _get_client() -> genai.Client:
-    return genai.Client(api_key=config.GEMINI_API_KEY)
+# 해시 계산 시 한 번에 읽는 크기
+HASH_CHUNK_SIZE = 1024 * 1024
 
 
-def upload_file(file_path: str | Path, store_name: str) -> dict:
-    """
-    단일 파일을 File Search Store에 업로드하고 인덱싱 완료까지 대기.
-    한글 파일명 등 non-ASCII 경로 대응: 임시 ASCII 심링크 생성 후 업로드.
-    반환: {"success": bool, "file": str, "error": str | None}
-    """
-    import uuid
-    import shutil
-    import tempfile
+def file_sha256(file_path: str | Path) -> str:
+    """파일 내용 SHA-256 (고정 크기 청크로 스트리밍 — 큰 파일도 메모리 일정)"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-    file_path = Path(file_path)
 
-    if not file_path.exists():
-        return {"success": False, "file": str(file_path), "error": "파일이 존재하지 않습니다"}
+def _result(file_path: Path, error: str | None = None, document_name: str | None = None) -> dict:
+    return {"success": error is None, "file": str(file_path), "error": error, "document_name": document_name}
+
+
+def _document_name(operation) -> str | None:
+    """완료된 업로드 operation의 Store 문서 리소스 이름"""
+    return getattr(getattr(operation, "response", None), "document_name", None)
+
 
+def _validate(file_path: Path) -> str | None:
+    """업로드 불가 사유 (없으면 None)"""
+    if not file_path.exists():
+        return "파일이 존재하지 않습니다"
     ext = file_path.suffix.lower()
     if ext not in MIME_MAP:
-        return {"success": False, "file": str(file_path), "error": f"지원하지 않는 파일 형식: {ext}"}
+        return f"지원하지 않는 파일 형식: {ext}"
+    return None
 
-    client = _get_client()
-    original_name = file_path.name  # 원본 파일명 (한글 포함 가능)
 
-    # non-ASCII 파일 경로 여부 확인 → 임시 ASCII 경로로 복사
-    temp_copy_path = None
-    upload_path = file_path
-    try:
-        str(file_path).encode("ascii")
-    except UnicodeEncodeError:
-        # ASCII 인코딩 불가 → 임시 디렉터리에 UUID 기반 ASCII 이름으로 복사
-        temp_dir = tempfile.mkdtemp()
-        safe_name = f"{uuid.uuid4().hex}{ext}"
-        temp_copy_path = Path(temp_dir) / safe_name
-        shutil.copy2(file_path, temp_copy_path)
-        upload_path = temp_copy_path
+# 업로드 전송 방식별 횟수 (HWP 텍스트 추출 효과 측정용)
+_transfer_lock = threading.Lock()
+_transfer_stats = {
+    "stream": 0,              # 열린 파일 객체(또는 추출 텍스트)를 그대로 전송 (복사 없음)
+    "hwp_text": 0,            # HWP 본문을 UTF-8 텍스트로 추출해 전송
+    "hwp_binary": 0,          # 추출 실패(암호·배포용·본문 없음 등) → 원본 바이너리 전송
+    "hwp_original_bytes": 0,  # 텍스트로 보낸 HWP의 원본 크기 합
+    "hwp_text_bytes": 0,      # 실제로 보낸 텍스트 크기 합
+}
+
 
+def transfer_stats() -> dict:
+    """전송 방식별 횟수와 HWP 텍스트 추출 전송량"""
+    with _transfer_lock:
+        return dict(_transfer_stats)
+
+
+def _hwp_body_text(file_path: Path) -> bytes | None:
+    """
+    HWP 본문 텍스트(UTF-8). HWP가 아니거나 HWP_TEXT_EXTRACTION이 꺼져 있으면 None.
+    암호·배포용 문서, 추출 실패, 본문이 비어 있으면(이미지뿐인 문서 등) None → 원본 바이너리 전송.
+    """
+    if file_path.suffix.lower() != ".hwp" or not config.HWP_TEXT_EXTRACTION:
+        return None
     try:
-        # Store에 업로드 (ASCII-safe 경로 사용, display_name은 원본 한글명 유지)
+        text = hwp_text.extract_text(file_path)
+    except Exception as e:
+        print(f"⚠️ HWP 본문 추출 실패, 원본으로 업로드 ({file_path.name}): {e}")
+        text = ""
+    body = text.encode("utf-8") if text.strip() else None
+    with _transfer_lock:
+        if body is None:
+            _transfer_stats["hwp_binary"] += 1
+        else:
+            _transfer_stats["hwp_text"] += 1
+            _transfer_stats["hwp_original_bytes"] += file_path.stat().st_size
+            _transfer_stats["hwp_text_bytes"] += len(body)
+    return body
+
+
+def _start_upload(file_path: Path, store_name: str):
+    """
+    파일 전송 후 인덱싱 operation 반환 (인덱싱 완료는 기다리지 않음).
+    열린 파일 객체를 그대로 스트리밍하므로 한글 파일명도 복사 없이 업로드된다 (google-genai>=1.49.0).
+    HWP는 본문 텍스트를 추출할 수 있으면 원본 파일명 그대로 텍스트만 보낸다 (전송량·인덱싱 시간 절감).
+    """
+    client = get_client()
+    upload_config = {
+        "display_name": file_path.name,  # 원본 파일명 (한글 포함 가능)
+        "mime_type": MIME_MAP[file_path.suffix.lower()],
+    }
+    body = _hwp_body_text(file_path)
+    if body is not None:
+        upload_config["mime_type"] = "text/plain"
+
+    with io.BytesIO(body) if body is not None else open(file_path, "rb") as f:
         operation = client.file_search_stores.upload_to_file_search_store(
-            file=str(upload_path),
+            file=f,
             file_search_store_name=store_name,
-            config={"display_name": original_name},
+            config=upload_config,
         )
+    with _transfer_lock:
+        _transfer_stats["stream"] += 1
+    return operation
 
-        # 인덱싱 완료 대기
-        elapsed = 0
-        while not operation.done and elapsed < MAX_POLL_SECONDS:
-            time.sleep(POLL_INTERVAL)
-            elapsed += POLL_INTERVAL
-            operation = client.operations.get(operation)
 
-        if not operation.done:
-            return {"success": False, "file": str(file_path), "error": "인덱싱 타임아웃"}
+class _PendingIndex:
+    def __init__(self, operation, key: tuple):
+        self.operation = operation
+        self.key = key
+        self.sent_at = time.monotonic()
+        self.last_poll = self.sent_at
+        self.interval = POLL_INITIAL_INTERVAL
+        self.errors = 0  # 연속 조회 오류 수
+        self.future: Future = Future()
 
-        return {"success": True, "file": str(file_path), "error": None}
 
-    except Exception as e:
-        return {"success": False, "file": str(file_path), "error": str(e)}
-    finally:
-        # 임시 복사본 정리
-        if temp_copy_path and temp_copy_path.exists():
-            shutil.rmtree(temp_copy_path.parent, ignore_errors=True)
+class _IndexPoller:
+    """
+    모든 업로드의 인덱싱 operation을 스레드 하나에서 확인.
+    첫 확인은 (MIME 타입, 크기 구간)별 학습된 예상 시간 직전, 이후는 짧은 간격부터 지수 백오프.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap: list[tuple[float, int, _PendingIndex]] = []
+        self._seq = itertools.count()
+        self._thread: threading.Thread | None = None
+        self._expected: dict[tuple, float] = {}
+        self._stats = {"tracked": 0, "completed": 0, "timeouts": 0, "polls": 0, "poll_errors": 0}
+
+    def track(self, operation, mime_type: str, size: int) -> Future:
+        """operation 등록. 인덱싱 완료 시 결과가 설정되는 Future 반환 (타임아웃/에러는 예외)."""
+        # 크기 구간: 4배 단위 (…, 64~256KB, 256KB~1MB, …)
+        item = _PendingIndex(operation, (mime_type, size.bit_length() // 2))
+        with self._cond:
+            expected = self._expected.get(item.key)
+            first = max(POLL_INITIAL_INTERVAL, expected * POLL_EXPECTED_RATIO) if expected else POLL_INITIAL_INTERVAL
+            self._push(item, item.sent_at + first)
+            self._stats["tracked"] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="index-poller", daemon=True)
+                self._thread.start()
+        return item.future
+
+    def _push(self, item: _PendingIndex, at: float):
+        heapq.heappush(self._heap, (at, next(self._seq), item))
+        self._cond.notify()
+
+    def _retry_poll(self, item: _PendingIndex, error: Exception) -> bool:
+        """
+        일시적 조회 오류면 백오프 간격 뒤 다시 확인하도록 재등록.
+        재시도 불가 에러이거나 연속 POLL_MAX_ERRORS회·MAX_POLL_SECONDS를 넘기면 False (호출자가 실패 처리).
+        """
+        now = time.monotonic()
+        item.errors += 1
+        with self._cond:
+            self._stats["poll_errors"] += 1
+            if (
+                not resilience.is_retryable(error)
+                or item.errors >= POLL_MAX_ERRORS
+                or now - item.sent_at >= MAX_POLL_SECONDS
+            ):
+                return False
+            self._push(item, now + item.interval)
+            item.interval = min(POLL_MAX_INTERVAL, item.interval * POLL_BACKOFF)
+        return True
+
+    def _learn(self, item: _PendingIndex, now: float):
+        # 완료 시점은 직전 확인과 이번 확인 사이 어딘가 → 중간값으로 추정
+        observed = (item.last_poll + now) / 2 - item.sent_at
+        previous = self._expected.get(item.key)
+        self._expected[item.key] = observed if previous is None else (
+            POLL_EWMA_ALPHA * observed + (1 - POLL_EWMA_ALPHA) * previous
+        )
+
+    def _run(self):
+        client = get_client()
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                now = time.monotonic()
+                if self._heap[0][0] > now:
+                    self._cond.wait(self._heap[0][0] - now)
+                    continue
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap)[2])
+
+            for item in due:
+                try:
+                    item.operation = client.operations.get(item.operation)
+                except Exception as e:
+                    if not self._retry_poll(item, e):
+                        item.future.set_exception(e)
+                    continue
+                item.errors = 0
+                now = time.monotonic()
+                with self._cond:
+                    self._stats["polls"] += 1
+                    if item.operation.done:
+                        self._learn(item, now)
+                        self._stats["completed"] += 1
+                    elif now - item.sent_at >= MAX_POLL_SECONDS:
+                        self._stats["timeouts"] += 1
+                    else:
+                        item.last_poll = now
+                        self._push(item, now + item.interval)
+                        item.interval = min(POLL_MAX_INTERVAL, item.interval * POLL_BACKOFF)
+                        continue
+                if item.operation.done:
+                    item.future.set_result(item.operation)
+                else:
+                    item.future.set_exception(TimeoutError("인덱싱 타임아웃"))
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                **self._stats,
+                "pending": len(self._heap),
+                "polls_per_upload": round(self._stats["polls"] / max(1, self._stats["completed"]), 2),
+                "expected_seconds": {
+                    f"{mime}|~{4 ** bucket // 1024}KB": round(seconds, 2)
+                    for (mime, bucket), seconds in sorted(self._expected.items())
+                },
+            }
+
+
+_poller = _IndexPoller()
+
+
+def polling_stats() -> dict:
+    """인덱싱 폴러 통계 (확인 횟수, MIME·크기별 학습된 예상 인덱싱 시간)"""
+    return _poller.stats()
+
+
+def upload_files(
+    file_paths: list[str | Path],
+    store_name: str,
+    on_result: Callable[[dict], None] | None = None,
+    on_sent: Callable[[str, str], None] | None = None,
+    resume: dict[str, str] | None = None,
+    more: Callable[[bool], list[str | Path] | None] | None = None,
+) -> list[dict]:
+    """
+    여러 파일을 최대 UPLOAD_CONCURRENCY개씩 동시에 업로드하고, 인덱싱 완료는 공용 폴러로 함께 확인.
+    콜백은 모두 호출한 스레드에서 실행된다 (호출자의 SQLite 연결을 그대로 써도 됨).
+
+    Args:
+        file_paths: 업로드할 파일 경로 목록
+        store_name: 대상 File Search Store 이름
+        on_result: 파일별 결과가 확정될 때마다 호출 (완료 순서)
+        on_sent: 전송이 끝나 인덱싱 operation이 생기면 (파일 경로, operation 이름)으로 호출
+        resume: 이미 전송된 파일의 경로 → operation 이름. 다시 보내지 않고 인덱싱 확인만 이어감 (재시작 후 재개용)
+        more: 진행 중에 새로 도착한 파일을 가져오는 함수. 진행 중인 파일이 없으면 True로 호출되므로
+              그때는 잠시 기다려도 된다. None을 반환하면 더 올 파일이 없음.
+
+    Returns:
+        처리 순서대로 [{"success": bool, "file": str, "error": str | None, "document_name": str | None}, ...]
+    """
+    paths: list[Path] = []
+    results: list[dict | None] = []
+
+    def finish(i: int, error: str | None = None, document_name: str | None = None):
+        results[i] = _result(paths[i], error, document_name)
+        if on_result:
+            on_result(results[i])
 
+    # 전송 Future와 인덱싱 Future를 함께 대기: Future → (인덱스, 인덱싱 단계 여부)
+    futures: dict[Future, tuple[int, bool]] = {}
 
-def upload_directory(dir_path: str | Path, store_name: str) -> list[dict]:
+    with ThreadPoolExecutor(max_workers=max(1, config.UPLOAD_CONCURRENCY), thread_name_prefix="upload") as pool:
+
+        def add(file_path: str | Path):
+            i = len(paths)
+            path = Path(file_path)
+            paths.append(path)
+            results.append(None)
+            if resume and str(path) in resume:
+                # 이미 전송됨 → 원본이 지워졌어도 인덱싱 확인만 이어감
+                operation = types.UploadToFileSearchStoreOperation(name=resume[str(path)])
+                size = path.stat().st_size if path.exists() else 0
+                futures[_poller.track(operation, MIME_MAP.get(path.suffix.lower(), ""), size)] = (i, True)
+                return
+            error = _validate(path)
+            if error:
+                finish(i, error)
+            else:
+                futures[pool.submit(_start_upload, path, store_name)] = (i, False)
+
+        for file_path in file_paths:
+            add(file_path)
+
+        while futures or more:
+            if more:
+                arrived = more(not futures)
+                if arrived is None:
+                    more = None
+                else:
+                    for file_path in arrived:
+                        add(file_path)
+                if not futures:
+                    continue
+            # 새 파일을 받는 중이면 짧게 대기하고 다시 확인
+            done, _ = wait(futures, timeout=MORE_POLL_SECONDS if more else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, indexing = futures.pop(future)
+                try:
+                    operation = future.result()
+                except Exception as e:
+                    finish(i, str(e))
+                    continue
+                if not indexing and not operation.done:
+                    # 전송 완료 → 인덱싱 완료 확인은 공용 폴러에 맡김 (전송 슬롯 즉시 반납)
+                    mime_type = MIME_MAP[paths[i].suffix.lower()]
+                    futures[_poller.track(operation, mime_type, paths[i].stat().st_size)] = (i, True)
+                if not indexing and on_sent and operation.name:
+                    # 콜백이 원본을 지울 수 있으므로 크기 확인 이후에 호출
+                    on_sent(str(paths[i]), operation.name)
+                if indexing or operation.done:
+                    finish(i, None, _document_name(operation))
+
+    return results
+
+
+def upload_file(file_path: str | Path, store_name: str) -> dict:
     """
-    디렉토리 내 모든 지원 파일을 업로드.
-    반환: 각 파일의 업로드 결과 리스트
+    단일 파일을 File Search Store에 업로드하고 인덱싱 완료까지 대기.
+    반환: {"success": bool, "file": str, "error": str | None, "document_name": str | None}
+    """
+    return upload_files([file_path], store_name)[0]
+
+
+def upload_directory(
+    dir_path: str | Path,
+    store_name: str,
+    on_result: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """
+    디렉토리 내 모든 지원 파일을 동시 업로드.
+    반환: 각 파일의 업로드 결과 리스트 (파일명 순)
     """
     dir_path = Path(dir_path)
-    results = []
 
     if not dir_path.is_dir():
         return [{"success": False, "file": str(dir_path), "error": "디렉토리가 아닙니다"}]
 
-    for f in sorted(dir_path.iterdir()):
-        if f.is_file() and f.suffix.lower() in MIME_MAP:
-            result = upload_file(f, store_name)
-            results.append(result)
-
-    return results
+    files = [f for f in sorted(dir_path.iterdir()) if f.is_file() and f.suffix.lower() in MIME_MAP]
+    return upload_files(files, store_name, on_result)
@@ -0,0 +1,50 @@
+"""
+Gemini 클라이언트 공용 제공 모듈
+프로세스 전체에서 하나의 genai.Client를 공유하여 HTTP 연결(keep-alive)을 재사용
+"""
+import threading
+import httpx
+from google import genai
+from google.genai import types
+import config
+
+_client: genai.Client | None = None
+_lock = threading.Lock()
+
+
+def _http_options() -> types.HttpOptions:
+    """연결 풀 크기·keep-alive·타임아웃(+ GEMINI_BASE_URL 재지정)이 반영된 HTTP 옵션 구성"""
+    limits = httpx.Limits(
+        max_connections=config.GEMINI_HTTP_POOL_SIZE,
+        max_keepalive_connections=config.GEMINI_HTTP_POOL_SIZE,
+        keepalive_expiry=config.GEMINI_HTTP_KEEPALIVE_SECONDS,
+    )
+    return types.HttpOptions(
+        base_url=config.GEMINI_BASE_URL or None,
+        timeout=config.GEMINI_HTTP_TIMEOUT_SECONDS * 1000,  # SDK는 밀리초 단위
+        client_args={"limits": limits},
+        async_client_args={"limits": limits},
+    )
+
+
+def get_client() -> genai.Client:
+    """공유 Gemini 클라이언트 반환 (최초 호출 시 생성)"""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = genai.Client(
+                    api_key=config.GEMINI_API_KEY,
+                    http_options=_http_options(),
+                )
+    return _client
+
+
+async def close_client():
+    """공유 클라이언트의 동기/비동기 연결 풀 정리 (서버 종료 시 호출)"""
+    global _client
+    with _lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+        await client.aio.aclose()
@@ -0,0 +1,166 @@
+"""
+대화 히스토리 관리 모듈
+최근 N턴은 토큰 예산 안에서 원문 그대로 유지하고, 그 이전 대화는 세션별 누적 요약으로 대체.
+요약 갱신(Gemini 호출)은 응답을 보낸 뒤 백그라운드에서 하므로 채팅 응답 경로에는 DB 조회만 남는다.
+"""
+import asyncio
+import math
+import threading
+from datetime import datetime, timezone
+from google.genai import types
+import config
+from core.gemini_client import get_client
+from core import rate_limiter, resilience
+from server.database import get_db
+
+SUMMARY_PROMPT = """다음은 사내 규정 질의응답 대화의 기존 요약과, 그 뒤에 이어진 대화입니다.
+기존 요약에 새 대화 내용을 반영하여 갱신된 요약을 작성하세요.
+
+[규칙]
+- 사용자가 물었던 질문, 답변의 핵심 사실, 언급된 규정/조항명을 유지하세요.
+- 중복과 인사말은 제거하세요.
+- {max_chars}자 이내의 한국어 평문으로만 출력하세요.
+
+[기존 요약]
+{summary}
+
+[이어진 대화]
+{conversation}
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """문자 수 기반 토큰 수 근사치 (한국어 위주 텍스트 기준)"""
+    return math.ceil(len(text) / config.HISTORY_CHARS_PER_TOKEN)
+
+
+def _load_window(conn, session_id: str) -> tuple[list[dict], dict | None]:
+    """
+    최근 메시지를 토큰 예산/턴 수 한도 안에서 선택하고 저장된 요약을 함께 반환.
+    반환: (원문 유지 메시지 목록 [오래된 순], 요약 row 또는 None)
+    """
+    rows = conn.execute(
+        "SELECT id, role, content FROM messages WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+        (session_id, config.HISTORY_MAX_TURNS * 2),
+    ).fetchall()
+
+    kept = []
+    used = 0
+    for r in rows:
+        tokens = estimate_tokens(r["content"])
+        if kept and used + tokens > config.HISTORY_TOKEN_BUDGET:
+            break
+        kept.append(dict(r))
+        used += tokens
+    kept.reverse()
+
+    summary = conn.execute(
+        "SELECT summary, covered_message_id FROM session_summaries WHERE session_id = ?",
+        (session_id,),
+    ).fetchone()
+    return kept, dict(summary) if summary else None
+
+
+def _pending_rows(conn, session_id: str, kept: list[dict], summary: dict | None) -> list[dict]:
+    """요약에 아직 반영되지 않았고 원문 창에서도 밀려난 메시지 목록"""
+    if not kept:
+        return []
+    covered = summary["covered_message_id"] if summary else 0
+    rows = conn.execute(
+        """SELECT id, role, content FROM messages
+        WHERE session_id = ? AND id > ? AND id < ? ORDER BY id""",
+        (session_id, covered, kept[0]["id"]),
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def _summary_prompt(summary: dict | None, pending: list[dict]) -> str:
+    conversation = "\n".join(
+        f"{'사용자' if m['role'] == 'user' else 'AI'}: {m['content']}" for m in pending
+    )
+    return SUMMARY_PROMPT.format(
+        max_chars=config.HISTORY_SUMMARY_MAX_CHARS,
+        summary=summary["summary"] if summary else "(없음)",
+        conversation=conversation,
+    )
+
+
+def _save_summary(conn, session_id: str, text: str, covered_message_id: int):
+    conn.execute(
+        """INSERT INTO session_summaries (session_id, summary, covered_message_id, updated_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(session_id) DO UPDATE SET
+            summary = excluded.summary,
+            covered_message_id = excluded.covered_message_id,
+            updated_at = excluded.updated_at""",
+        (session_id, text, covered_message_id, datetime.now(timezone.utc).isoformat()),
+    )
+    conn.commit()
+
+
+def _compose(kept: list[dict], summary_text: str | None) -> list[dict]:
+    """요약(있으면, role "system") + 최근 원문 메시지를 query()의 history 형식으로 구성"""
+    history = []
+    if summary_text:
+        history.append({"role": "system", "content": f"[이전 대화 요약]\n{summary_text}"})
+    history.extend({"role": m["role"], "content": m["content"]} for m in kept)
+    return history
+
+
+def load_history(session_id: str) -> list[dict]:
+    """세션의 대화 히스토리를 토큰 예산에 맞춰 구성 (저장된 요약 사용, Gemini 호출 없음)"""
+    conn = get_db()
+    try:
+        kept, summary = _load_window(conn, session_id)
+    finally:
+        conn.close()
+    return _compose(kept, summary["summary"] if summary else None)
+
+
+async def load_history_async(session_id: str) -> list[dict]:
+    """load_history()의 asyncio 버전 (SQLite 조회는 스레드에서 실행)"""
+    return await asyncio.to_thread(load_history, session_id)
+
+
+# 요약 갱신 중인 세션 (같은 세션의 갱신이 겹치지 않게)
+_refreshing: set[str] = set()
+_refreshing_lock = threading.Lock()
+
+
+def refresh_summary(session_id: str):
+    """
+    원문 창에서 밀려난 메시지가 HISTORY_SUMMARY_MIN_CHARS자 이상 쌓였으면 기존 요약에 증분 반영해 저장.
+    응답 전송 후 백그라운드에서 호출 (실패하면 기존 요약 유지, 다음 턴에 재시도).
+    """
+    with _refreshing_lock:
+        if session_id in _refreshing:
+            return
+        _refreshing.add(session_id)
+    try:
+        conn = get_db()
+        try:
+            kept, summary = _load_window(conn, session_id)
+            pending = _pending_rows(conn, session_id, kept, summary)
+        finally:
+            conn.close()
+        if not pending or sum(len(m["content"]) for m in pending) < config.HISTORY_SUMMARY_MIN_CHARS:
+            return
+
+        response = resilience.call(
+            lambda timeout: get_client().models.generate_content(
+                model=config.GEMINI_MODEL,
+                contents=_summary_prompt(summary, pending),
+                config=types.GenerateContentConfig(http_options=resilience.http_options(timeout)),
+            ),
+            rate_limiter.SUMMARY,
+        )
+        conn = get_db()
+        try:
+            _save_summary(conn, session_id, response.text.strip(), pending[-1]["id"])
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"⚠️ 대화 요약 갱신 실패 [{session_id}]: {e}")
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(session_id)
@@ -0,0 +1,99 @@
+"""
+HWP(5.x) 본문 텍스트 추출 모듈
+OLE 컨테이너의 BodyText/Section* 스트림을 풀어(raw deflate) 문단 텍스트(HWPTAG_PARA_TEXT) 레코드만 모은다.
+표 셀·글상자 안의 문단도 같은 레코드로 저장되므로 문서 순서대로 함께 추출된다.
+텍스트가 대부분인 규정 문서는 원본 바이너리보다 훨씬 작은 UTF-8 텍스트로 업로드할 수 있다.
+"""
+import re
+import struct
+import zlib
+from pathlib import Path
+import olefile
+
+# FileHeader 속성 비트 (offset 36)
+_FLAG_COMPRESSED = 0x01
+_FLAG_PASSWORD = 0x02
+_FLAG_DISTRIBUTION = 0x04  # 배포용 문서: 본문이 ViewText에 암호화되어 있음
+
+# 레코드 태그 (HWPTAG_BEGIN = 0x10)
+_HWPTAG_PARA_TEXT = 0x10 + 51
+
+# 문단 텍스트의 제어 문자: 8 WCHAR(16바이트)를 차지하는 인라인/확장 컨트롤 (나머지 0~31은 1 WCHAR)
+_WIDE_CONTROLS = {1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 12, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23}
+# 텍스트로 옮길 제어 문자
+_CONTROL_TEXT = {9: "\t", 10: "\n", 24: "-", 30: " ", 31: " "}
+
+
+def _section_streams(ole: olefile.OleFileIO) -> list[str]:
+    """BodyText/Section0, Section1, ... (번호 순)"""
+    sections = []
+    for entry in ole.listdir(streams=True, storages=False):
+        if len(entry) == 2 and entry[0] == "BodyText" and re.fullmatch(r"Section\d+", entry[1]):
+            sections.append(entry)
+    sections.sort(key=lambda e: int(e[1][len("Section"):]))
+    return ["/".join(e) for e in sections]
+
+
+def _para_text(payload: bytes) -> str:
+    """HWPTAG_PARA_TEXT 본문(UTF-16LE) → 문자열 (개체·필드 등 컨트롤은 건너뜀)"""
+    out = []
+    count = len(payload) // 2
+    chars = struct.unpack_from(f"<{count}H", payload)
+    i = 0
+    while i < count:
+        code = chars[i]
+        if code >= 32:
+            out.append(chr(code))
+            i += 1
+            continue
+        if code in _CONTROL_TEXT:
+            out.append(_CONTROL_TEXT[code])
+        i += 8 if code in _WIDE_CONTROLS else 1
+    # 서로게이트 쌍은 chr()로 따로 들어가므로 UTF-16으로 다시 합침
+    return "".join(out).encode("utf-16-le", "surrogatepass").decode("utf-16-le", "replace")
+
+
+def _iter_records(data: bytes):
+    """레코드 헤더(태그 10비트, 레벨 10비트, 크기 12비트 — 0xFFF면 다음 4바이트가 크기) 순회"""
+    pos = 0
+    while pos + 4 <= len(data):
+        header, = struct.unpack_from("<I", data, pos)
+        pos += 4
+        tag, size = header & 0x3FF, (header >> 20) & 0xFFF
+        if size == 0xFFF:
+            if pos + 4 > len(data):
+                break
+            size, = struct.unpack_from("<I", data, pos)
+            pos += 4
+        yield tag, data[pos:pos + size]
+        pos += size
+
+
+def extract_text(file_path: str | Path) -> str:
+    """
+    HWP 본문 텍스트 추출. 문단은 줄바꿈으로 구분.
+    OLE 형식이 아니거나 암호·배포용 문서라 읽을 수 없으면 ValueError.
+    """
+    if not olefile.isOleFile(str(file_path)):
+        raise ValueError("HWP(OLE) 형식이 아닙니다 (HWPX 등)")
+
+    with olefile.OleFileIO(str(file_path)) as ole:
+        if not ole.exists("FileHeader"):
+            raise ValueError("FileHeader 스트림이 없습니다")
+        header = ole.openstream("FileHeader").read()
+        if not header.startswith(b"HWP Document File") or len(header) < 40:
+            raise ValueError("HWP 파일 헤더가 아닙니다")
+        flags, = struct.unpack_from("<I", header, 36)
+        if flags & (_FLAG_PASSWORD | _FLAG_DISTRIBUTION):
+            raise ValueError("암호가 걸렸거나 배포용 문서입니다")
+
+        paragraphs = []
+        for name in _section_streams(ole):
+            data = ole.openstream(name).read()
+            if flags & _FLAG_COMPRESSED:
+                data = zlib.decompressobj(-15).decompress(data)
+            for tag, payload in _iter_records(data):
+                if tag == _HWPTAG_PARA_TEXT:
+                    paragraphs.append(_para_text(payload).rstrip("\n"))
+
+    return "\n".join(paragraphs).strip() + "\n"
@@ -0,0 +1,101 @@
+"""
+단계별 지연 시간 메트릭
+채팅 요청의 각 단계(DB 히스토리 로드, Store 해석, Gemini 생성, 제목 생성, DB 저장)를
+히스토그램으로 누적해 Prometheus 텍스트 형식으로 내보내고,
+요청 단위로 측정한 단계 시간을 Server-Timing 헤더로 돌려준다.
+
+    with metrics.stage("gemini_generate"):
+        response = ...
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+import config
+
+# 계측 단계 이름
+DB_LOAD_HISTORY = "db_load_history"
+STORE_RESOLVE = "store_resolve"
+GEMINI_GENERATE = "gemini_generate"
+TITLE_GENERATE = "title_generate"
+DB_PERSIST = "db_persist"
+STAGES = (DB_LOAD_HISTORY, STORE_RESOLVE, GEMINI_GENERATE, TITLE_GENERATE, DB_PERSIST)
+
+# 히스토그램 버킷 상한(초)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# 현재 요청에서 측정한 (단계, 초) 목록. 요청 밖(백그라운드 작업)에서는 None.
+_request_timings: ContextVar[list | None] = ContextVar("request_timings", default=None)
+
+
+class _Histogram:
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+        self.count += 1
+        self.sum += seconds
+
+
+_lock = threading.Lock()
+_histograms = {name: _Histogram() for name in STAGES}
+
+
+def observe(name: str, seconds: float):
+    """단계 소요 시간 기록 (히스토그램 + 현재 요청의 Server-Timing)"""
+    if not config.METRICS_ENABLED:
+        return
+    with _lock:
+        _histograms.setdefault(name, _Histogram()).observe(seconds)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+@contextmanager
+def stage(name: str):
+    """블록 실행 시간을 name 단계로 기록 (예외가 나도 기록)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+def begin_request() -> list:
+    """요청 단위 단계 시간 수집 시작. 반환된 목록에 이 요청의 (단계, 초)가 쌓인다."""
+    timings = []
+    _request_timings.set(timings)
+    return timings
+
+
+def server_timing(timings: list, total: float) -> str:
+    """Server-Timing 헤더 값 (같은 단계가 여러 번이면 합산)"""
+    merged: dict[str, float] = {}
+    for name, seconds in timings:
+        merged[name] = merged.get(name, 0.0) + seconds
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in merged.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def render() -> str:
+    """Prometheus 텍스트 노출 형식"""
+    metric = "rag_stage_duration_seconds"
+    lines = [
+        f"# HELP {metric} 채팅 요청 단계별 소요 시간",
+        f"# TYPE {metric} histogram",
+    ]
+    with _lock:
+        for name, hist in _histograms.items():
+            for bound, count in zip(BUCKETS, hist.buckets):
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{bound}"}} {count}')
+            lines.append(f'{metric}_bucket{{stage="{name}",le="+Inf"}} {hist.count}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {hist.sum:.6f}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {hist.count}')
+    return "\n".join(lines) + "\n"
@@ -3,15 +3,17 @@ RAG 질의 엔진
 이중 File Search Store(원본 + 교정)를 활용한 Gemini 질의 처리
 대화 컨텍스트 유지, Citation 파싱
 """
+import asyncio
 import json
-from google import genai
+from typing import Iterator
 from google.genai import types
 import config
+from core.gemini_client import get_client
 from core.store_manager import get_or_create_store
+from core import answer_cache, metrics, rate_limiter, request_coalescer, resilience
+from core.correction_index import has_likely_match, find_direct_answer
 
-
-def _get_client() -> genai.Client:
-    return genai.Client(api_key=config.GEMINI_API_KEY)
+NO_ANSWER = "답변을 생성할 수 없습니다."
 
 
 def _build_conversation_contents(history: list[dict], new_message: str) -> list:
@@ -19,6 +21,9 @@ def _build_conversation_contents(history: list[dict], new_message: str) -> list:
     contents = []
 
     for msg in history:
+        if msg["role"] == "system":
+            # 이전 대화 요약은 시스템 지시로 전달 (_generation_config)
+            continue
         contents.append(types.Content(
             role=msg["role"],
             parts=[types.Part(text=msg["content"])],
@@ -53,6 +58,99 @@ def _parse_citations(response) -> list[dict]:
     return citations
 
 
+def _needs_correction_store(message: str, history: list[dict]) -> bool:
+    """로컬 교정 인덱스에 관련 교정이 있을 때만 교정 Store 검색 (후속 질문은 직전 질문도 함께 확인)"""
+    text = message
+    previous = [m["content"] for m in history if m["role"] == "user"]
+    if previous:
+        text = f"{previous[-1]} {message}"
+    return has_likely_match(text)
+
+
+def _resolve_store_names(use_correction_store: bool) -> list[str]:
+    """검색 대상 Store 이름 목록 조회 (없으면 생성)"""
+    with metrics.stage(metrics.STORE_RESOLVE):
+        store_names = [get_or_create_store(config.PRIMARY_STORE_DISPLAY_NAME)]
+        if use_correction_store:
+            store_names.append(get_or_create_store(config.CORRECTION_STORE_DISPLAY_NAME))
+    return store_names
+
+
+def _system_instruction(history: list[dict]) -> str:
+    """시스템 프롬프트 + 이전 대화 요약 (history의 role "system" 항목)"""
+    return "\n\n".join([config.SYSTEM_PROMPT, *(m["content"] for m in history if m["role"] == "system")])
+
+
+def _generation_config(store_names: list[str], timeout: float, history: list[dict]) -> types.GenerateContentConfig:
+    """시스템 프롬프트(+ 대화 요약) + File Search 도구 설정 (timeout: 남은 데드라인 초)"""
+    return types.GenerateContentConfig(
+        system_instruction=_system_instruction(history),
+        http_options=resilience.http_options(timeout),
+        tools=[
+            types.Tool(
+                file_search=types.FileSearch(
+                    file_search_store_names=store_names
+                )
+            )
+        ],
+    )
+
+
+def _to_result(response) -> dict:
+    """Gemini 응답 → query() 반환 형식"""
+    answer = response.text if response.text else NO_ANSWER
+    return {
+        "answer": answer,
+        "citations": _parse_citations(response),
+        "model": config.GEMINI_MODEL,
+        "fast_path": False,
+    }
+
+
+def _fast_path_answer(message: str, history: list[dict]) -> dict | None:
+    """
+    히스토리 없는 질문이 신뢰도 높은 승인 교정의 원 질문과 거의 같으면
+    Gemini 호출 없이 교정 사실로 바로 답변 (CORRECTION_FAST_PATH_ENABLED일 때만)
+    """
+    if history or not config.CORRECTION_FAST_PATH_ENABLED:
+        return None
+    correction = find_direct_answer(message)
+    if not correction:
+        return None
+    return {
+        "answer": correction["extracted_fact"],
+        "citations": [{
+            # 교정 문서는 "{correction_id}.txt"로 교정 Store에 업로드됨
+            "title": f"{correction['id']}.txt",
+            "uri": "",
+            "text": correction["extracted_fact"],
+        }],
+        "model": "correction-fast-path",
+        "fast_path": True,
+    }
+
+
+def _question_key(message: str, history: list[dict], use_correction_store: bool) -> tuple | None:
+    """
+    히스토리 없는 질문의 공유 키 (정규화 질문 + 지식 베이스 지문).
+    답변 캐시와 동시 요청 병합에 사용하며, 둘 다 비활성화면 None.
+    """
+    if history or not (config.ANSWER_CACHE_ENABLED or config.COALESCE_ENABLED):
+        return None
+    return answer_cache.make_key(message, use_correction_store)
+
+
+def _cached_answer(key: tuple | None) -> dict | None:
+    if key and config.ANSWER_CACHE_ENABLED:
+        return answer_cache.get(key)
+    return None
+
+
+def _store_answer(key: tuple | None, result: dict):
+    if key and config.ANSWER_CACHE_ENABLED and result["answer"] != NO_ANSWER:
+        answer_cache.put(key, result)
+
+
 def query(
     message: str,
     history: list[dict] | None = None,
@@ -63,7 +161,8 @@ def query(
 
     Args:
         message: 사용자 질문
-        history: 이전 대화 메시지 목록 [{"role": "user"|"assistant", "content": "..."}]
+        history: 이전 대화 메시지 목록 [{"role": "user"|"assistant"|"system", "content": "..."}]
+                 ("system"은 이전 대화 요약 — 대화 턴이 아니라 시스템 지시에 덧붙임)
         use_correction_store: 교정 Store도 검색에 포함할지 여부
 
     Returns:
@@ -71,59 +170,250 @@ def query(
             "answer": str,
             "citations": list[dict],
             "model": str,
+            "fast_path": bool,  # 승인 교정으로 바로 답변했는지 여부
         }
     """
-    client = _get_client()
     history = history or []
 
-    # Store 이름 조회 (없으면 생성)
-    primary_store = get_or_create_store(config.PRIMARY_STORE_DISPLAY_NAME)
-    store_names = [primary_store]
+    fast = _fast_path_answer(message, history)
+    if fast:
+        return fast
 
-    if use_correction_store:
-        correction_store = get_or_create_store(config.CORRECTION_STORE_DISPLAY_NAME)
-        store_names.append(correction_store)
+    # 히스토리 없는 반복 질문은 답변 캐시에서 바로 반환
+    key = _question_key(message, history, use_correction_store)
+    cached = _cached_answer(key)
+    if cached:
+        return cached
 
-    # 대화 컨텍스트 구성
-    contents = _build_conversation_contents(history, message)
+    def generate() -> dict:
+        client = get_client()
+        store_names = _resolve_store_names(
+            use_correction_store and _needs_correction_store(message, history)
+        )
 
-    # Gemini 호출 (File Search 도구 포함)
-    response = client.models.generate_content(
-        model=config.GEMINI_MODEL,
-        contents=contents,
-        config=types.GenerateContentConfig(
-            system_instruction=config.SYSTEM_PROMPT,
-            tools=[
-                types.Tool(
-                    file_search=types.FileSearch(
-                        file_search_store_names=store_names
-                    )
-                )
-            ],
-        ),
-    )
+        # 대화 컨텍스트 구성
+        contents = _build_conversation_contents(history, message)
 
-    # 응답 파싱
-    answer = response.text if response.text else "답변을 생성할 수 없습니다."
-    citations = _parse_citations(response)
+        # Gemini 호출 (File Search 도구 포함, 데드라인 안에서 일시적 에러 재시도)
+        with metrics.stage(metrics.GEMINI_GENERATE):
+            response = resilience.call(
+                lambda timeout: client.models.generate_content(
+                    model=config.GEMINI_MODEL,
+                    contents=contents,
+                    config=_generation_config(store_names, timeout, history),
+                ),
+                rate_limiter.CHAT,
+            )
 
-    return {
-        "answer": answer,
+        result = _to_result(response)
+        _store_answer(key, result)
+        return result
+
+    # 동일 질문이 동시에 진행 중이면 그 호출 결과를 공유
+    if key and config.COALESCE_ENABLED:
+        return request_coalescer.run(key, generate)
+    return generate()
+
+
+async def query_async(
+    message: str,
+    history: list[dict] | None = None,
+    use_correction_store: bool = True,
+) -> dict:
+    """
+    query()의 asyncio 버전. 비동기 클라이언트(client.aio)로 Gemini를 호출한다.
+    교정 인덱스(FTS)·지식 베이스 지문 조회 등 동기 SQLite 작업은 이벤트 루프를 막지 않도록 스레드에서 수행.
+    """
+    history = history or []
+
+    fast = await asyncio.to_thread(_fast_path_answer, message, history)
+    if fast:
+        return fast
+
+    key = await asyncio.to_thread(_question_key, message, history, use_correction_store)
+    cached = _cached_answer(key)
+    if cached:
+        return cached
+
+    def resolve_store_names() -> list[str]:
+        return _resolve_store_names(use_correction_store and _needs_correction_store(message, history))
+
+    async def generate() -> dict:
+        client = get_client()
+        # 교정 인덱스 검색과 Store 이름 해석(캐시 미스 시 네트워크)은 동기 작업이므로 스레드에서 수행
+        store_names = await asyncio.to_thread(resolve_store_names)
+        contents = _build_conversation_contents(history, message)
+
+        # 재시도 + (GEMINI_HEDGE_ENABLED면) p95 초과 시 hedging
+        with metrics.stage(metrics.GEMINI_GENERATE):
+            response = await resilience.acall(
+                lambda timeout: client.aio.models.generate_content(
+                    model=config.GEMINI_MODEL,
+                    contents=contents,
+                    config=_generation_config(store_names, timeout, history),
+                ),
+                rate_limiter.CHAT,
+                hedge=True,
+            )
+        result = _to_result(response)
+        _store_answer(key, result)
+        return result
+
+    if key and config.COALESCE_ENABLED:
+        return await request_coalescer.run_async(key, generate)
+    return await generate()
+
+
+def query_stream(
+    message: str,
+    history: list[dict] | None = None,
+    use_correction_store: bool = True,
+) -> Iterator[dict]:
+    """
+    RAG 질의를 스트리밍으로 수행. 생성되는 대로 이벤트 dict를 yield 한다.
+
+    이벤트 순서:
+        {"type": "token", "text": str}             # 0회 이상
+        {"type": "citations", "citations": list}   # 1회 (스트림 종료 후)
+        {"type": "done", "answer": str, "citations": list, "model": str, "fast_path": bool}
+    """
+    history = history or []
+
+    # 승인 교정 직접 답변 또는 캐시 히트 시 전체 답변을 토큰 하나로 즉시 전달
+    fast = _fast_path_answer(message, history)
+    if fast:
+        yield {"type": "token", "text": fast["answer"]}
+        yield {"type": "citations", "citations": fast["citations"]}
+        yield {"type": "done", **fast}
+        return
+
+    key = _question_key(message, history, use_correction_store)
+    cached = _cached_answer(key)
+    if cached:
+        yield {"type": "token", "text": cached["answer"]}
+        yield {"type": "citations", "citations": cached["citations"]}
+        yield {"type": "done", **cached}
+        return
+
+    client = get_client()
+    use_correction_store = use_correction_store and _needs_correction_store(message, history)
+    store_names = _resolve_store_names(use_correction_store)
+    contents = _build_conversation_contents(history, message)
+
+    # 이미 보낸 토큰은 되돌릴 수 없으므로 첫 청크를 받기 전까지만 재시도
+    parts = []
+    citations = []
+    with metrics.stage(metrics.GEMINI_GENERATE):
+        for chunk in resilience.stream(
+            lambda timeout: client.models.generate_content_stream(
+                model=config.GEMINI_MODEL,
+                contents=contents,
+                config=_generation_config(store_names, timeout, history),
+            ),
+            rate_limiter.CHAT,
+        ):
+            if chunk.text:
+                parts.append(chunk.text)
+                yield {"type": "token", "text": chunk.text}
+            # grounding 메타데이터는 보통 마지막 청크에 실려 온다
+            citations.extend(_parse_citations(chunk))
+
+    result = {
+        "answer": "".join(parts) or NO_ANSWER,
         "citations": citations,
         "model": config.GEMINI_MODEL,
+        "fast_path": False,
     }
+    _store_answer(key, result)
+    yield {"type": "citations", "citations": citations}
+    yield {"type": "done", **result}
+
+
+def _title_prompt(first_message: str) -> str:
+    return f'다음 질문을 10자 이내의 한국어 제목으로 요약해줘. 제목만 출력하고 다른 설명은 하지 마:\n"{first_message}"'
+
+
+def _clean_title(text: str) -> str:
+    title = text.strip().strip('"').strip("'")
+    # 너무 길면 자르기
+    return title[:30] if len(title) > 30 else title
+
+
+def fallback_title(first_message: str) -> str:
+    """제목 생성 전/실패 시 사용하는 첫 메시지 축약 제목"""
+    return first_message[:20] + "..." if len(first_message) > 20 else first_message
 
 
 def generate_session_title(first_message: str) -> str:
     """첫 메시지를 기반으로 세션 제목을 자동 생성"""
-    client = _get_client()
+    client = get_client()
     try:
-        response = client.models.generate_content(
-            model=config.GEMINI_MODEL,
-            contents=f'다음 질문을 10자 이내의 한국어 제목으로 요약해줘. 제목만 출력하고 다른 설명은 하지 마:\n"{first_message}"',
-        )
-        title = response.text.strip().strip('"').strip("'")
-        # 너무 길면 자르기
-        return title[:30] if len(title) > 30 else title
+        with metrics.stage(metrics.TITLE_GENERATE):
+            response = resilience.call(
+                lambda timeout: client.models.generate_content(
+                    model=config.GEMINI_MODEL,
+                    contents=_title_prompt(first_message),
+                    config=types.GenerateContentConfig(http_options=resilience.http_options(timeout)),
+                ),
+                rate_limiter.TITLE,
+            )
+        return _clean_title(response.text)
+    except Exception:
+        return fallback_title(first_message)
+
+
+async def generate_session_title_async(first_message: str) -> str:
+    """generate_session_title()의 asyncio 버전"""
+    client = get_client()
+    try:
+        with metrics.stage(metrics.TITLE_GENERATE):
+            response = await resilience.acall(
+                lambda timeout: client.aio.models.generate_content(
+                    model=config.GEMINI_MODEL,
+                    contents=_title_prompt(first_message),
+                    config=types.GenerateContentConfig(http_options=resilience.http_options(timeout)),
+                ),
+                rate_limiter.TITLE,
+            )
+        return _clean_title(response.text)
     except Exception:
-        return first_message[:20] + "..." if len(first_message) > 20 else first_message
+        return fallback_title(first_message)
+
+
+TITLE_BATCH_PROMPT = """다음 각 질문을 10자 이내의 한국어 제목으로 요약해줘.
+질문 번호를 키로, 제목을 값으로 하는 JSON 객체만 출력해. 다른 설명은 하지 마.
+
+{questions}
+"""
+
+
+def generate_session_titles_batch(first_messages: list[str]) -> list[str]:
+    """여러 세션의 첫 메시지를 한 번의 호출로 제목 생성. 실패한 항목은 축약 제목으로 대체."""
+    client = get_client()
+    questions = "\n".join(f'{i}. "{m}"' for i, m in enumerate(first_messages, 1))
+    titles = {}
+    try:
+        with metrics.stage(metrics.TITLE_GENERATE):
+            response = resilience.call(
+                lambda timeout: client.models.generate_content(
+                    model=config.GEMINI_MODEL,
+                    contents=TITLE_BATCH_PROMPT.format(questions=questions),
+                    config=types.GenerateContentConfig(
+                        response_mime_type="application/json",
+                        http_options=resilience.http_options(timeout),
+                    ),
+                ),
+                rate_limiter.TITLE,
+            )
+        parsed = json.loads(response.text)
+        # 유효한 JSON이어도 객체가 아니면(목록·문자열 등) 전부 축약 제목으로 대체
+        if not isinstance(parsed, dict):
+            raise ValueError(f"JSON 객체가 아닌 응답 ({type(parsed).__name__})")
+        titles = parsed
+    except Exception as e:
+        print(f"⚠️ 세션 제목 일괄 생성 실패: {e}")
+
+    return [
+        _clean_title(str(titles[str(i)])) if titles.get(str(i)) else fallback_title(m)
+        for i, m in enumerate(first_messages, 1)
+    ]
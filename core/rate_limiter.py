@@ -0,0 +1,221 @@
+"""
+Gemini 호출 공용 Rate Limiter
+프로세스 전체가 하나의 토큰 버킷을 공유하고, 대기 중인 요청은 우선순위 레인 순서로 처리
+(채팅 > 피드백 분석 > 세션 제목 > 대화 요약 > 카테고리 분류). 429 응답의 retryDelay 동안은 전체 호출을 멈춘다.
+대기 시간 한도(timeout)를 넘긴 요청은 대기열에서 빠지고 Busy 예외로 실패한다.
+"""
+import asyncio
+import heapq
+import itertools
+import re
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+import config
+
+# 우선순위 레인 (숫자가 작을수록 먼저 처리)
+CHAT = 0
+FEEDBACK = 1
+TITLE = 2
+SUMMARY = 3
+CATEGORY = 4
+LANE_NAMES = {CHAT: "chat", FEEDBACK: "feedback", TITLE: "title", SUMMARY: "summary", CATEGORY: "category"}
+
+# 429 응답에 retryDelay가 없을 때 기본 대기 시간(초)
+DEFAULT_RETRY_DELAY = 60
+
+
+class Busy(Exception):
+    """대기 시간 한도 안에 토큰을 받지 못함 (요청 혼잡 또는 429 일시 중지)"""
+
+
+class _Waiter:
+    def __init__(self, lane: int, loop: asyncio.AbstractEventLoop | None = None):
+        self.lane = lane
+        self.enqueued_at = time.monotonic()
+        self.loop = loop
+        if loop is None:
+            self.event = threading.Event()
+        else:
+            self.future = loop.create_future()
+
+    def grant(self) -> bool:
+        """토큰 배분 통지. 대기하던 이벤트 루프가 이미 닫혔으면 False (토큰은 소비하지 않음)"""
+        if self.loop is None:
+            self.event.set()
+            return True
+        try:
+            self.loop.call_soon_threadsafe(self._resolve)
+        except RuntimeError:
+            return False
+        return True
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+_cond = threading.Condition()
+_queue: list[tuple[int, int, _Waiter]] = []
+_seq = itertools.count()
+_tokens = float(config.GEMINI_RATE_LIMIT_BURST)
+_last_refill = time.monotonic()
+_paused_until = 0.0
+_dispatcher: threading.Thread | None = None
+_stats = {
+    "granted": {name: 0 for name in LANE_NAMES.values()},
+    "wait_seconds": {name: 0.0 for name in LANE_NAMES.values()},
+    "rate_limited": 0,
+    "busy": {name: 0 for name in LANE_NAMES.values()},
+}
+
+
+def _enabled() -> bool:
+    return config.GEMINI_RATE_LIMIT_RPM > 0
+
+
+def _refill(now: float):
+    global _tokens, _last_refill
+    rate = config.GEMINI_RATE_LIMIT_RPM / 60
+    _tokens = min(config.GEMINI_RATE_LIMIT_BURST, _tokens + (now - _last_refill) * rate)
+    _last_refill = now
+
+
+def _dispatch_loop():
+    """대기열에서 우선순위가 가장 높은 요청부터 토큰을 배분"""
+    global _tokens
+    with _cond:
+        while True:
+            while not _queue:
+                _cond.wait()
+
+            now = time.monotonic()
+            _refill(now)
+            if now < _paused_until:
+                _cond.wait(_paused_until - now)
+                continue
+            if _tokens < 1:
+                _cond.wait((1 - _tokens) * 60 / config.GEMINI_RATE_LIMIT_RPM)
+                continue
+
+            _, _, waiter = heapq.heappop(_queue)
+            if not waiter.grant():
+                continue
+            _tokens -= 1
+            name = LANE_NAMES[waiter.lane]
+            _stats["granted"][name] += 1
+            _stats["wait_seconds"][name] += now - waiter.enqueued_at
+
+
+def _enqueue(waiter: _Waiter):
+    global _dispatcher
+    with _cond:
+        if _dispatcher is None:
+            _dispatcher = threading.Thread(target=_dispatch_loop, name="gemini-rate-limiter", daemon=True)
+            _dispatcher.start()
+        heapq.heappush(_queue, (waiter.lane, next(_seq), waiter))
+        _cond.notify()
+
+
+def _abandon(waiter: _Waiter) -> bool:
+    """대기를 포기한 요청을 대기열에서 제거. 이미 토큰을 배분받았으면 False"""
+    with _cond:
+        for i, entry in enumerate(_queue):
+            if entry[2] is waiter:
+                _queue.pop(i)
+                heapq.heapify(_queue)
+                return True
+        return False
+
+
+def _busy(waiter: _Waiter, timeout: float) -> Busy:
+    name = LANE_NAMES[waiter.lane]
+    with _cond:
+        _stats["busy"][name] += 1
+    return Busy(f"Gemini 호출 대기 {timeout:.1f}초 초과 ({name} 레인, 요청 혼잡)")
+
+
+def retry_delay_from_error(error: Exception) -> float | None:
+    """429 / RESOURCE_EXHAUSTED 에러면 서버가 준 retryDelay(초) 반환, 아니면 None"""
+    err_str = str(error)
+    if "429" not in err_str and "RESOURCE_EXHAUSTED" not in err_str:
+        return None
+    m = re.search(r"retryDelay.*?(\d+(?:\.\d+)?)", err_str)
+    return float(m.group(1)) if m else DEFAULT_RETRY_DELAY
+
+
+def report_rate_limited(retry_delay: float):
+    """업스트림 429 수신 시 retryDelay 동안 모든 레인의 토큰 배분 중지"""
+    global _paused_until, _tokens
+    with _cond:
+        _paused_until = max(_paused_until, time.monotonic() + retry_delay)
+        _tokens = 0
+        _stats["rate_limited"] += 1
+        _cond.notify()
+
+
+def _after_error(error: Exception):
+    delay = retry_delay_from_error(error)
+    if delay is not None:
+        report_rate_limited(delay)
+
+
+@contextmanager
+def slot(lane: int, timeout: float | None = None):
+    """
+    동기 호출용: 토큰을 받을 때까지 대기 후 블록 실행. 블록에서 429가 나면 전체 일시 중지.
+    timeout(초) 안에 토큰을 받지 못하면 대기열에서 빠지고 Busy 발생.
+    """
+    if _enabled():
+        waiter = _Waiter(lane)
+        _enqueue(waiter)
+        if not waiter.event.wait(timeout) and _abandon(waiter):
+            raise _busy(waiter, timeout)
+    try:
+        yield
+    except Exception as e:
+        _after_error(e)
+        raise
+
+
+@asynccontextmanager
+async def aslot(lane: int, timeout: float | None = None):
+    """slot()의 asyncio 버전 (이벤트 루프를 막지 않고 대기)"""
+    if _enabled():
+        waiter = _Waiter(lane, asyncio.get_running_loop())
+        _enqueue(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            if _abandon(waiter):
+                raise _busy(waiter, timeout)
+            # 한도 직후 토큰이 배분된 경우 → 그대로 진행
+            await waiter.future
+        except asyncio.CancelledError:
+            # 요청 취소(클라이언트 연결 종료 등) → 버려진 요청에 토큰이 배분되지 않게 제거
+            _abandon(waiter)
+            raise
+    try:
+        yield
+    except Exception as e:
+        _after_error(e)
+        raise
+
+
+def stats() -> dict:
+    with _cond:
+        depth = {name: 0 for name in LANE_NAMES.values()}
+        for lane, _, _ in _queue:
+            depth[LANE_NAMES[lane]] += 1
+        return {
+            "enabled": _enabled(),
+            "rpm": config.GEMINI_RATE_LIMIT_RPM,
+            "burst": config.GEMINI_RATE_LIMIT_BURST,
+            "tokens": round(_tokens, 2),
+            "paused_for_seconds": round(max(0.0, _paused_until - time.monotonic()), 1),
+            "queue_depth": depth,
+            "granted": dict(_stats["granted"]),
+            "wait_seconds": {k: round(v, 2) for k, v in _stats["wait_seconds"].items()},
+            "rate_limited": _stats["rate_limited"],
+            "busy": dict(_stats["busy"]),
+        }
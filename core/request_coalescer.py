@@ -0,0 +1,115 @@
+"""
+동일 질문 요청 병합 (single-flight)
+같은 키의 요청이 동시에 들어오면 첫 요청(leader)만 업스트림을 호출하고 나머지(follower)는 그 결과를 공유
+"""
+import asyncio
+import threading
+from typing import Awaitable, Callable, TypeVar
+import config
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_stats = {"leaders": 0, "coalesced": 0, "follower_timeouts": 0}
+
+
+def _count(name: str):
+    with _lock:
+        _stats[name] += 1
+
+
+# ── 동기 (스레드) 버전 ────────────────────────────────
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+_inflight: dict[tuple, _Call] = {}
+
+
+def run(key: tuple, fn: Callable[[], T]) -> T:
+    """
+    key가 같은 진행 중 호출이 있으면 그 결과를 기다려 공유, 없으면 fn()을 직접 실행.
+    follower가 COALESCE_FOLLOWER_TIMEOUT_SECONDS 안에 결과를 못 받으면 직접 호출한다.
+    """
+    with _lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = _Call()
+            _stats["leaders"] += 1
+        else:
+            _stats["coalesced"] += 1
+
+    if not leader:
+        if not call.done.wait(config.COALESCE_FOLLOWER_TIMEOUT_SECONDS):
+            _count("follower_timeouts")
+            return fn()
+        if call.error:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = fn()
+        return call.result
+    except BaseException as e:
+        call.error = e
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+        call.done.set()
+
+
+# ── asyncio 버전 ──────────────────────────────────────
+
+_inflight_async: dict[tuple, asyncio.Future] = {}
+
+
+async def run_async(key: tuple, fn: Callable[[], Awaitable[T]]) -> T:
+    """run()의 asyncio 버전"""
+    future = _inflight_async.get(key)
+    if future is not None:
+        _count("coalesced")
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future), config.COALESCE_FOLLOWER_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            _count("follower_timeouts")
+            return await fn()
+        except asyncio.CancelledError:
+            # leader 요청이 취소된 경우(클라이언트 연결 종료 등) 직접 호출
+            if future.cancelled():
+                return await fn()
+            raise
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight_async[key] = future
+    _count("leaders")
+    try:
+        result = await fn()
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        # follower가 없을 때 "exception was never retrieved" 경고 방지
+        future.exception()
+        raise
+    finally:
+        _inflight_async.pop(key, None)
+
+
+def stats() -> dict:
+    with _lock:
+        return {
+            "enabled": config.COALESCE_ENABLED,
+            "in_flight": len(_inflight) + len(_inflight_async),
+            **_stats,
+        }
@@ -0,0 +1,366 @@
+"""
+Gemini 생성 호출 복원력 래퍼
+요청별 데드라인 예산 안에서 재시도 가능한 에러만 지수 백오프(지터)로 재시도하고,
+업스트림 장애가 이어지면 서킷 브레이커가 즉시 실패시킨다.
+asyncio 버전은 p95 지연을 넘긴 요청에 두 번째 요청을 보내는 hedging을 지원한다.
+
+호출 함수는 남은 시간(초)을 인자로 받아 요청 타임아웃으로 사용한다:
+    resilience.call(lambda timeout: client.models.generate_content(
+        ..., config=types.GenerateContentConfig(http_options=resilience.http_options(timeout)),
+    ), rate_limiter.CHAT)
+"""
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Iterable, Iterator, TypeVar
+import httpx
+from google.genai import types
+import config
+from core import rate_limiter
+
+T = TypeVar("T")
+
+# 재시도 대상 HTTP 상태 코드 (429는 rate_limiter가 retryDelay 동안 전체 호출을 멈춤)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRYABLE_STATUS_NAMES = ("RESOURCE_EXHAUSTED", "UNAVAILABLE", "DEADLINE_EXCEEDED", "INTERNAL")
+
+# p95 계산에 사용하는 최근 성공 호출 수
+LATENCY_WINDOW = 200
+
+
+class UpstreamUnavailable(Exception):
+    """Gemini를 일시적으로 사용할 수 없음 (라우트에서 503으로 변환)"""
+
+
+class CircuitOpenError(UpstreamUnavailable):
+    """서킷 브레이커가 열려 호출하지 않고 즉시 실패"""
+
+
+class DeadlineExceeded(UpstreamUnavailable):
+    """데드라인 예산 안에 성공하지 못함"""
+
+
+class Busy(DeadlineExceeded):
+    """남은 데드라인 안에 rate_limiter 차례가 오지 않음 (요청 혼잡 또는 429 일시 중지)"""
+
+
+class _CircuitBreaker:
+    """
+    연속 장애(5xx/타임아웃/연결 오류)가 임계치에 닿으면 open → 일정 시간 뒤 half-open에서
+    시험 호출 1건만 통과시키고, 성공하면 closed로 복귀한다. 429와 4xx는 장애로 세지 않는다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.opens = 0
+        self.rejected = 0
+
+    def before_call(self):
+        if config.GEMINI_CIRCUIT_FAILURE_THRESHOLD <= 0:
+            return
+        with self._lock:
+            if self.state == "closed":
+                return
+            if self.state == "open" and time.monotonic() - self.opened_at >= config.GEMINI_CIRCUIT_RESET_SECONDS:
+                self.state = "half_open"
+                self.probing = False
+            if self.state == "half_open" and not self.probing:
+                self.probing = True
+                return
+            self.rejected += 1
+        raise CircuitOpenError("Gemini 업스트림 장애로 서킷 브레이커가 열려 있습니다")
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probing = False
+            if self.state == "half_open" or (
+                self.state == "closed" and self.failures >= config.GEMINI_CIRCUIT_FAILURE_THRESHOLD > 0
+            ):
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self.opens += 1
+                print(f"🔌 Gemini 서킷 브레이커 open (연속 장애 {self.failures}회)")
+
+    def release(self):
+        """장애로 보지 않는 결과(429, 4xx, 취소) — half-open 시험 호출 자리만 반납"""
+        with self._lock:
+            self.probing = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "opens": self.opens,
+                "rejected": self.rejected,
+            }
+
+
+_breaker = _CircuitBreaker()
+_lock = threading.Lock()
+_latencies = {name: deque(maxlen=LATENCY_WINDOW) for name in rate_limiter.LANE_NAMES.values()}
+_stats = {"retries": 0, "exhausted": 0, "deadline_exceeded": 0, "hedged": 0, "hedge_wins": 0}
+
+
+def _count(name: str):
+    with _lock:
+        _stats[name] += 1
+
+
+def _record_latency(lane: int, seconds: float):
+    with _lock:
+        _latencies[rate_limiter.LANE_NAMES[lane]].append(seconds)
+
+
+def _p95(lane: int) -> float | None:
+    """레인의 최근 성공 호출 지연 p95 (표본이 GEMINI_HEDGE_MIN_SAMPLES 미만이면 None)"""
+    with _lock:
+        samples = sorted(_latencies[rate_limiter.LANE_NAMES[lane]])
+    if len(samples) < max(1, config.GEMINI_HEDGE_MIN_SAMPLES):
+        return None
+    return samples[int(0.95 * (len(samples) - 1))]
+
+
+def http_options(timeout: float) -> types.HttpOptions:
+    """남은 데드라인(초)을 요청 타임아웃으로 쓰는 HttpOptions"""
+    return types.HttpOptions(timeout=max(1, int(timeout * 1000)))
+
+
+def is_retryable(error: Exception) -> bool:
+    """일시적 에러(429, 5xx, 타임아웃, 연결 오류)인지"""
+    if isinstance(error, UpstreamUnavailable):
+        return False
+    if isinstance(error, (httpx.TransportError, asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS
+    return any(name in str(error) for name in RETRYABLE_STATUS_NAMES)
+
+
+def _default_deadline(lane: int) -> float:
+    if lane in (rate_limiter.CHAT, rate_limiter.FEEDBACK):
+        return config.GEMINI_DEADLINE_SECONDS
+    return config.GEMINI_BACKGROUND_DEADLINE_SECONDS
+
+
+def _retry_delay(error: Exception, attempt: int) -> float | None:
+    """실패한 시도를 브레이커에 반영하고, 재시도할 에러면 다음 시도까지 대기 시간(초) 반환"""
+    if not is_retryable(error):
+        _breaker.release()
+        return None
+    server_delay = rate_limiter.retry_delay_from_error(error)
+    if server_delay is not None:
+        # 할당량 초과는 장애가 아니므로 브레이커에 세지 않고 retryDelay만큼 대기
+        _breaker.release()
+        return server_delay
+    _breaker.record_failure()
+    ceiling = min(config.GEMINI_RETRY_MAX_DELAY, config.GEMINI_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    return random.uniform(0, ceiling)
+
+
+def _give_up(error: Exception, attempt: int, delay: float, deadline_at: float) -> Exception | None:
+    """재시도 횟수나 데드라인이 바닥났으면 대신 던질 예외 반환"""
+    if attempt > config.GEMINI_MAX_RETRIES:
+        _count("exhausted")
+        return UpstreamUnavailable(f"Gemini 호출 {attempt}회 실패: {error}")
+    if time.monotonic() + delay >= deadline_at:
+        _count("deadline_exceeded")
+        return DeadlineExceeded(f"Gemini 호출 데드라인 초과: {error}")
+    _count("retries")
+    return None
+
+
+def _busy(error: rate_limiter.Busy) -> Busy:
+    """rate_limiter 대기 한도 초과 → 호출하지 않았으므로 브레이커 자리만 반납"""
+    _breaker.release()
+    _count("deadline_exceeded")
+    return Busy(str(error))
+
+
+def _remaining(deadline_at: float) -> float:
+    remaining = deadline_at - time.monotonic()
+    if remaining <= 0:
+        _count("deadline_exceeded")
+        raise DeadlineExceeded("Gemini 호출 대기 중 데드라인 초과")
+    return remaining
+
+
+# ── 동기 버전 ─────────────────────────────────────────
+
+def call(fn: Callable[[float], T], lane: int, deadline: float | None = None) -> T:
+    """
+    fn(남은 시간)을 rate_limiter 레인 슬롯 안에서 실행. 재시도 가능한 에러는 데드라인 안에서 재시도.
+
+    Args:
+        fn: 남은 데드라인(초)을 받아 Gemini를 호출하는 함수
+        lane: rate_limiter 우선순위 레인
+        deadline: 전체 데드라인 예산(초). 생략 시 레인별 기본값
+    """
+    deadline_at = time.monotonic() + (deadline or _default_deadline(lane))
+    attempt = 0
+    while True:
+        attempt += 1
+        _breaker.before_call()
+        try:
+            with rate_limiter.slot(lane, _remaining(deadline_at)):
+                start = time.monotonic()
+                result = fn(_remaining(deadline_at))
+        except rate_limiter.Busy as e:
+            raise _busy(e) from e
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None:
+                raise
+            error = _give_up(e, attempt, delay, deadline_at)
+            if error:
+                raise error from e
+            time.sleep(delay)
+            continue
+        except BaseException:
+            _breaker.release()
+            raise
+        _record_latency(lane, time.monotonic() - start)
+        _breaker.record_success()
+        return result
+
+
+def stream(fn: Callable[[float], Iterable[T]], lane: int, deadline: float | None = None) -> Iterator[T]:
+    """
+    스트리밍 호출 버전. fn(남은 시간)이 돌려준 스트림의 청크를 그대로 yield 한다.
+    첫 청크를 받기 전(연결·대기 단계)의 재시도 가능한 에러만 데드라인 안에서 재시도하고,
+    이미 청크를 내보낸 뒤의 에러는 되돌릴 수 없으므로 브레이커에만 반영하고 그대로 던진다.
+    """
+    deadline_at = time.monotonic() + (deadline or _default_deadline(lane))
+    attempt = 0
+    while True:
+        attempt += 1
+        _breaker.before_call()
+        received = False
+        try:
+            with rate_limiter.slot(lane, _remaining(deadline_at)):
+                for chunk in fn(_remaining(deadline_at)):
+                    received = True
+                    yield chunk
+        except rate_limiter.Busy as e:
+            raise _busy(e) from e
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None or received:
+                raise
+            error = _give_up(e, attempt, delay, deadline_at)
+            if error:
+                raise error from e
+            time.sleep(delay)
+            continue
+        except BaseException:
+            # 소비자가 스트림을 닫은 경우(클라이언트 연결 종료) 포함
+            _breaker.release()
+            raise
+        _breaker.record_success()
+        return
+
+
+# ── asyncio 버전 ──────────────────────────────────────
+
+async def _attempt_async(fn: Callable[[float], Awaitable[T]], lane: int, deadline_at: float) -> T:
+    async with rate_limiter.aslot(lane, _remaining(deadline_at)):
+        remaining = _remaining(deadline_at)
+        start = time.monotonic()
+        result = await asyncio.wait_for(fn(remaining), remaining)
+    _record_latency(lane, time.monotonic() - start)
+    return result
+
+
+async def _hedged_attempt(fn: Callable[[float], Awaitable[T]], lane: int, deadline_at: float) -> T:
+    """첫 요청이 p95 안에 끝나지 않으면 두 번째 요청을 보내고 먼저 성공한 결과 사용"""
+    p95 = _p95(lane)
+    if p95 is None or time.monotonic() + p95 >= deadline_at:
+        return await _attempt_async(fn, lane, deadline_at)
+
+    first = asyncio.ensure_future(_attempt_async(fn, lane, deadline_at))
+    pending = {first}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=p95)
+        if not done:
+            _count("hedged")
+            pending.add(asyncio.ensure_future(_attempt_async(fn, lane, deadline_at)))
+
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not first:
+                        _count("hedge_wins")
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def acall(
+    fn: Callable[[float], Awaitable[T]],
+    lane: int,
+    deadline: float | None = None,
+    hedge: bool = False,
+) -> T:
+    """call()의 asyncio 버전. hedge=True이고 GEMINI_HEDGE_ENABLED면 p95 초과 시 hedging."""
+    deadline_at = time.monotonic() + (deadline or _default_deadline(lane))
+    hedge = hedge and config.GEMINI_HEDGE_ENABLED
+    attempt = 0
+    while True:
+        attempt += 1
+        _breaker.before_call()
+        try:
+            if hedge:
+                result = await _hedged_attempt(fn, lane, deadline_at)
+            else:
+                result = await _attempt_async(fn, lane, deadline_at)
+        except rate_limiter.Busy as e:
+            raise _busy(e) from e
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None:
+                raise
+            error = _give_up(e, attempt, delay, deadline_at)
+            if error:
+                raise error from e
+            await asyncio.sleep(delay)
+            continue
+        except BaseException:
+            _breaker.release()
+            raise
+        _breaker.record_success()
+        return result
+
+
+def stats() -> dict:
+    with _lock:
+        counters = dict(_stats)
+    p95 = {}
+    for lane, name in rate_limiter.LANE_NAMES.items():
+        value = _p95(lane)
+        p95[name] = round(value, 3) if value is not None else None
+    return {
+        **counters,
+        "circuit": _breaker.stats(),
+        "p95_seconds": p95,
+        "deadline_seconds": config.GEMINI_DEADLINE_SECONDS,
+        "hedge_enabled": config.GEMINI_HEDGE_ENABLED,
+    }
@@ -0,0 +1,93 @@
+"""
+세션 제목 생성 모듈
+첫 채팅 응답 이후 백그라운드에서 제목을 생성하고, 배치 모드에서는 유휴 시간에 모아서 한 번에 생성
+"""
+import asyncio
+import threading
+import time
+import config
+from core.query_engine import generate_session_title_async, generate_session_titles_batch
+from server.database import get_db
+
+# 배치 모드에서 제목 생성을 기다리는 세션: session_id → 첫 메시지
+_pending: dict[str, str] = {}
+_lock = threading.Lock()
+_last_activity = time.monotonic()
+_stop_event = threading.Event()
+_worker: threading.Thread | None = None
+
+
+def save_title(session_id: str, title: str):
+    conn = get_db()
+    try:
+        conn.execute("UPDATE sessions SET title = ? WHERE id = ?", (title, session_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+async def generate_and_save(session_id: str, first_message: str):
+    """제목 생성 후 저장 (응답 전송 이후 BackgroundTasks에서 실행)"""
+    title = await generate_session_title_async(first_message)
+    await asyncio.to_thread(save_title, session_id, title)
+
+
+def enqueue(session_id: str, first_message: str):
+    """배치 모드: 유휴 시간에 일괄 생성하도록 대기열에 등록"""
+    with _lock:
+        _pending[session_id] = first_message
+
+
+def note_activity():
+    """채팅 요청 시각 기록 (유휴 판단용)"""
+    global _last_activity
+    _last_activity = time.monotonic()
+
+
+def flush_pending() -> int:
+    """대기 중인 제목을 최대 TITLE_BATCH_MAX_SIZE개까지 한 번의 호출로 생성. 처리 건수 반환."""
+    with _lock:
+        batch = list(_pending.items())[:config.TITLE_BATCH_MAX_SIZE]
+        for session_id, _ in batch:
+            del _pending[session_id]
+    if not batch:
+        return 0
+
+    titles = generate_session_titles_batch([message for _, message in batch])
+    for (session_id, _), title in zip(batch, titles):
+        save_title(session_id, title)
+    return len(batch)
+
+
+def _run():
+    while not _stop_event.wait(config.TITLE_BATCH_INTERVAL_SECONDS):
+        with _lock:
+            pending_count = len(_pending)
+        idle = time.monotonic() - _last_activity >= config.TITLE_BATCH_IDLE_SECONDS
+        if pending_count and (idle or pending_count >= config.TITLE_BATCH_MAX_SIZE):
+            try:
+                flush_pending()
+            except Exception as e:
+                print(f"⚠️ 세션 제목 배치 처리 실패: {e}")
+
+
+def start_batch_worker():
+    """배치 모드 워커 스레드 시작 (TITLE_BATCH_ENABLED일 때만)"""
+    global _worker
+    if not config.TITLE_BATCH_ENABLED or _worker is not None:
+        return
+    _stop_event.clear()
+    _worker = threading.Thread(target=_run, name="session-title-batch", daemon=True)
+    _worker.start()
+
+
+def stop_batch_worker():
+    """워커 종료 후 남은 대기열을 처리"""
+    global _worker
+    if _worker is None:
+        return
+    _stop_event.set()
+    _worker.join()
+    _worker = None
+    while flush_pending():
+        pass
@@ -2,37 +2,83 @@
 File Search Store 관리 모듈
 원본 사규 Store와 교정 데이터 Store의 CRUD 및 상태 관리
 """
+import threading
 import time
-from google import genai
 from google.genai import types
 import config
+from core.gemini_client import get_client
 
 
-def _get_client() -> genai.Client:
-    """Gemini API 클라이언트 생성"""
-    return genai.Client(api_key=config.GEMINI_API_KEY)
+# display_name → (Store name, 만료 시각) 해석 캐시
+_store_cache: dict[str, tuple[str, float]] = {}
+_cache_lock = threading.Lock()
+# display_name별 조회 락 (동시 캐시 미스를 한 번의 조회로 합침)
+_lookup_locks: dict[str, threading.Lock] = {}
+
+
+def _cached_store(display_name: str) -> str | None:
+    """만료되지 않은 캐시 항목이 있으면 Store name 반환"""
+    with _cache_lock:
+        entry = _store_cache.get(display_name)
+    if entry and entry[1] > time.monotonic():
+        return entry[0]
+    return None
+
+
+def _lookup_lock(display_name: str) -> threading.Lock:
+    with _cache_lock:
+        return _lookup_locks.setdefault(display_name, threading.Lock())
+
+
+def invalidate_store_cache(display_name: str | None = None):
+    """Store 이름 캐시 무효화 (display_name 미지정 시 전체)"""
+    with _cache_lock:
+        if display_name is None:
+            _store_cache.clear()
+        else:
+            _store_cache.pop(display_name, None)
 
 
 def get_or_create_store(display_name: str) -> str:
     """
     display_name으로 기존 Store를 찾거나 없으면 새로 생성.
     Store의 name(리소스 ID)을 반환한다.
+    결과는 STORE_CACHE_TTL_SECONDS 동안 캐시되며, 동시 요청은 한 번의 조회를 공유한다.
     """
-    client = _get_client()
+    cached = _cached_store(display_name)
+    if cached:
+        return cached
 
-    # 기존 Store 검색
-    for store in client.file_search_stores.list():
-        if store.display_name == display_name:
-            return store.name
+    with _lookup_lock(display_name):
+        # 락 대기 중 다른 요청이 이미 조회를 끝냈을 수 있음
+        cached = _cached_store(display_name)
+        if cached:
+            return cached
+
+        client = get_client()
+        store_name = None
+
+        # 기존 Store 검색
+        for store in client.file_search_stores.list():
+            if store.display_name == display_name:
+                store_name = store.name
+                break
 
-    # 새 Store 생성
-    store = client.file_search_stores.create(config={"display_name": display_name})
-    return store.name
+        # 새 Store 생성
+        if store_name is None:
+            store = client.file_search_stores.create(config={"display_name": display_name})
+            store_name = store.name
+
+        with _cache_lock:
+            _store_cache[display_name] = (
+                store_name, time.monotonic() + config.STORE_CACHE_TTL_SECONDS,
+            )
+        return store_name
 
 
 def list_stores() -> list[dict]:
     """모든 File Search Store 목록 반환"""
-    client = _get_client()
+    client = get_client()
     stores = []
     for store in client.file_search_stores.list():
         stores.append({
@@ -44,7 +90,7 @@ def list_stores() -> list[dict]:
 
 def get_store_documents(store_name: str) -> list[dict]:
     """특정 Store의 문서 목록 반환"""
-    client = _get_client()
+    client = get_client()
     docs = []
     for doc in client.file_search_stores.documents.list(parent=store_name):
         docs.append({
@@ -56,11 +102,17 @@ def get_store_documents(store_name: str) -> list[dict]:
 
 def delete_document(document_name: str):
     """Store에서 특정 문서 삭제"""
-    client = _get_client()
+    client = get_client()
     client.file_search_stores.documents.delete(name=document_name)
 
 
 def delete_store(store_name: str, force: bool = True):
     """Store 삭제 (force=True면 문서 포함)"""
-    client = _get_client()
+    client = get_client()
     client.file_search_stores.delete(name=store_name, config={"force": force})
+
+    # 삭제된 Store를 가리키는 캐시 항목 제거
+    with _cache_lock:
+        for display_name, (name, _) in list(_store_cache.items()):
+            if name == store_name:
+                del _store_cache[display_name]
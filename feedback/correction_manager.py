@@ -6,6 +6,7 @@ import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 from server.database import get_db
+from core.correction_index import index_correction
 import config
 
 
@@ -83,8 +84,18 @@ def approve_correction(correction_id: str, reviewed_by: str, store_doc_name: str
             WHERE id = ? AND status = 'pending'""",
             (reviewed_by, now, store_doc_name, correction_id),
         )
+        approved = conn.total_changes > 0
+
+        # 로컬 교정 인덱스에 반영 (질의 시 교정 Store 포함 여부 판단용)
+        if approved:
+            row = conn.execute(
+                "SELECT original_question, extracted_fact FROM corrections WHERE id = ?",
+                (correction_id,),
+            ).fetchone()
+            index_correction(conn, correction_id, row["original_question"], row["extracted_fact"])
+
         conn.commit()
-        return conn.total_changes > 0
+        return approved
     finally:
         conn.close()
 
@@ -3,9 +3,10 @@
 사용자의 오류 지적 메시지를 Gemini로 분석하여 구조화된 교정 데이터를 추출
 """
 import json
-from google import genai
 from google.genai import types
 import config
+from core.gemini_client import get_client
+from core import rate_limiter, resilience
 
 # 피드백 분석용 프롬프트
 ANALYSIS_PROMPT = """사용자가 AI의 답변이 틀렸다고 지적하는 대화를 분석해주세요.
@@ -27,10 +28,6 @@ ANALYSIS_PROMPT = """사용자가 AI의 답변이 틀렸다고 지적하는 대
 """
 
 
-def _get_client() -> genai.Client:
-    return genai.Client(api_key=config.GEMINI_API_KEY)
-
-
 def analyze_feedback(
     original_question: str,
     ai_answer: str,
@@ -49,7 +46,7 @@ def analyze_feedback(
             "confidence": float,
         }
     """
-    client = _get_client()
+    client = get_client()
 
     prompt = ANALYSIS_PROMPT.format(
         ai_answer=ai_answer,
@@ -58,30 +55,71 @@ def analyze_feedback(
     )
 
     try:
-        response = client.models.generate_content(
-            model=config.GEMINI_MODEL,
-            contents=prompt,
+        response = resilience.call(
+            lambda timeout: client.models.generate_content(
+                model=config.GEMINI_MODEL,
+                contents=prompt,
+                config=types.GenerateContentConfig(http_options=resilience.http_options(timeout)),
+            ),
+            rate_limiter.FEEDBACK,
         )
+        return _parse_analysis(response.text)
+
+    except (json.JSONDecodeError, Exception):
+        # 분석 실패 시 원본 데이터로 폴백
+        return _fallback_analysis(original_question, ai_answer, user_feedback)
+
+
+async def analyze_feedback_async(
+    original_question: str,
+    ai_answer: str,
+    user_feedback: str,
+) -> dict | None:
+    """analyze_feedback()의 asyncio 버전 (client.aio 사용)"""
+    client = get_client()
 
-        text = response.text.strip()
-        # JSON 블록 추출 (마크다운 코드블록 감싸진 경우 처리)
-        if "```json" in text:
-            text = text.split("```json")[1].split("```")[0].strip()
-        elif "```" in text:
-            text = text.split("```")[1].split("```")[0].strip()
+    prompt = ANALYSIS_PROMPT.format(
+        ai_answer=ai_answer,
+        user_feedback=user_feedback,
+        original_question=original_question,
+    )
 
-        result = json.loads(text)
-        return result
+    try:
+        response = await resilience.acall(
+            lambda timeout: client.aio.models.generate_content(
+                model=config.GEMINI_MODEL,
+                contents=prompt,
+                config=types.GenerateContentConfig(http_options=resilience.http_options(timeout)),
+            ),
+            rate_limiter.FEEDBACK,
+        )
+        return _parse_analysis(response.text)
 
     except (json.JSONDecodeError, Exception) as e:
-        # 분석 실패 시 원본 데이터로 폴백
-        return {
-            "original_question": original_question,
-            "ai_wrong_answer": ai_answer[:200],
-            "user_correction": user_feedback,
-            "extracted_fact": user_feedback,
-            "confidence": 0.5,
-        }
+        return _fallback_analysis(original_question, ai_answer, user_feedback)
+
+
+def _parse_analysis(text: str) -> dict:
+    """모델 응답 텍스트에서 분석 결과 JSON 추출"""
+    text = text.strip()
+    # JSON 블록 추출 (마크다운 코드블록 감싸진 경우 처리)
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0].strip()
+    elif "```" in text:
+        text = text.split("```")[1].split("```")[0].strip()
+
+    return json.loads(text)
+
+
+def _fallback_analysis(original_question: str, ai_answer: str, user_feedback: str) -> dict:
+    """분석 실패 시 원본 데이터 기반 결과"""
+    return {
+        "original_question": original_question,
+        "ai_wrong_answer": ai_answer[:200],
+        "user_correction": user_feedback,
+        "extracted_fact": user_feedback,
+        "confidence": 0.5,
+    }
 
 
 def generate_correction_text(analysis: dict) -> str:
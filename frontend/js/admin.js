@@ -395,6 +395,143 @@ function formatFileSize(bytes) {
 }
 
 
+// ── 재개 가능한 분할 업로드 ──────────────────────────────
+const RESUMABLE_PARALLEL = 4;       // 동시에 보내는 청크 수
+const RESUMABLE_MAX_RETRIES = 5;    // 청크별 재시도 횟수 (네트워크 오류/5xx)
+
+function selectionKey(files, storeType, versionGroup) {
+    // 같은 선택(파일명·크기·수정 시각)이면 같은 키 → 새로고침 후 다시 선택해도 이어서 전송
+    const text = [storeType, versionGroup, ...files.map(f => `${f.name}|${f.size}|${f.lastModified}`)].join('\n');
+    let h = 0;
+    for (let i = 0; i < text.length; i++) h = (h * 31 + text.charCodeAt(i)) | 0;
+    return `resumable:${files.length}:${h}`;
+}
+
+function missingChunks(size, received, chunkSize) {
+    // 수신 구간 [[start, end), ...] 사이의 빈 곳을 청크 크기로 나눔
+    const chunks = [];
+    let pos = 0;
+    for (const [start, end] of [...received, [size, size]]) {
+        while (pos < start) {
+            const next = Math.min(pos + chunkSize, start);
+            chunks.push([pos, next]);
+            pos = next;
+        }
+        pos = Math.max(pos, end);
+    }
+    return chunks;
+}
+
+async function putChunk(uploadId, index, file, start, end) {
+    for (let attempt = 0; ; attempt++) {
+        let error;
+        try {
+            const res = await fetch(`${API}/admin/resumable/${uploadId}/files/${index}?offset=${start}`, {
+                method: 'PUT',
+                headers: { 'Authorization': `Bearer ${state.token}`, 'Content-Type': 'application/octet-stream' },
+                body: file.slice(start, end),
+            });
+            if (res.ok) return;
+            if (res.status === 401) { logout(); throw new Error('로그인이 만료되었습니다'); }
+            const data = await res.json().catch(() => ({}));
+            error = new Error(data.detail || `청크 전송 실패 (${res.status})`);
+            if (res.status < 500) throw error;  // 요청 자체가 잘못됨 → 재시도하지 않음
+        } catch (err) {
+            if (err !== error && !(err instanceof TypeError)) throw err;
+            error = err;  // TypeError: 네트워크 끊김
+        }
+        if (attempt >= RESUMABLE_MAX_RETRIES) throw error;
+        await new Promise(resolve => setTimeout(resolve, Math.min(30000, 1000 * 2 ** attempt)));
+    }
+}
+
+async function uploadResumable(files, storeType, versionGroup) {
+    const infoEl = $('#selectedFilesInfo');
+    const key = selectionKey(files, storeType, versionGroup);
+
+    // 같은 선택의 이전 업로드가 있으면 받은 구간부터 이어서 전송
+    let upload = null;
+    const savedId = localStorage.getItem(key);
+    if (savedId) {
+        upload = await api('GET', `/admin/resumable/${savedId}`).catch(() => null);
+    }
+    const resumed = !!upload;
+    if (!upload) {
+        upload = await api('POST', '/admin/resumable', {
+            files: files.map(f => ({ name: f.name, size: f.size })),
+            store_type: storeType,
+            version_group: versionGroup,
+        });
+        if (!upload) return null;
+        localStorage.setItem(key, upload.upload_id);
+    }
+
+    if (!upload.job_id) {
+        const queue = [];
+        for (const f of upload.files) {
+            if (f.error || f.complete) continue;
+            for (const [start, end] of missingChunks(f.size, f.received, upload.chunk_size)) {
+                queue.push([f.index, start, end]);
+            }
+        }
+
+        let sent = upload.received_bytes;
+        const render = () => {
+            const percent = upload.total_bytes ? Math.floor(sent / upload.total_bytes * 100) : 100;
+            infoEl.innerHTML = `<span style="color:var(--warning)">⏳ 파일 전송 중 ${formatFileSize(sent)} / ${formatFileSize(upload.total_bytes)} (${percent}%)</span>` +
+                (resumed ? `<br><span style="font-size:0.8rem;color:var(--text-muted)">이전 전송을 이어서 보내는 중입니다.</span>` : '');
+        };
+        render();
+
+        // 청크 여러 개를 동시에 전송 (하나라도 최종 실패하면 중단 — 다시 업로드하면 이어서 전송)
+        let failed = false;
+        const worker = async () => {
+            while (queue.length && !failed) {
+                const [index, start, end] = queue.shift();
+                try {
+                    await putChunk(upload.upload_id, index, files[index], start, end);
+                } catch (err) {
+                    failed = true;
+                    throw err;
+                }
+                sent += end - start;
+                render();
+            }
+        };
+        await Promise.all(Array.from({ length: RESUMABLE_PARALLEL }, worker));
+    }
+
+    const job = await api('POST', `/admin/resumable/${upload.upload_id}/finalize`);
+    localStorage.removeItem(key);
+    return job;
+}
+
+const JOB_POLL_INTERVAL_MS = 1000;
+const JOB_STATUS_LABELS = { queued: '대기', uploading: '전송', indexing: '인덱싱', done: '완료', skipped: '스킵', failed: '실패' };
+
+function renderJobProgress(job, startTime) {
+    const elapsed = Math.floor((Date.now() - startTime) / 1000);
+    const min = Math.floor(elapsed / 60);
+    const sec = elapsed % 60;
+    const timeStr = min > 0 ? `${min}분 ${sec}초` : `${sec}초`;
+    const percent = Math.round(job.progress * 100);
+    const counts = Object.entries(job.counts)
+        .map(([status, n]) => `${JOB_STATUS_LABELS[status] || status} ${n}`)
+        .join(' · ');
+    $('#selectedFilesInfo').innerHTML = `<span style="color:var(--warning)">⏳ ${job.finished}/${job.total}개 처리 (${percent}%, ${timeStr} 경과)</span><br><span style="font-size:0.8rem;color:var(--text-muted)">${escapeHtml(counts)} — 페이지를 닫아도 서버에서 계속 진행됩니다.</span>`;
+}
+
+async function waitForJob(jobId) {
+    const startTime = Date.now();
+    while (true) {
+        const job = await api('GET', `/admin/jobs/${jobId}`);
+        if (!job) return null;
+        if (job.status === 'done' || job.status === 'failed') return job;
+        renderJobProgress(job, startTime);
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    }
+}
+
 async function handleUpload() {
     const path = $('#uploadPath').value.trim();
     const storeType = $('#uploadStore').value;
@@ -405,52 +542,34 @@ async function handleUpload() {
         return; 
     }
 
-    const totalFiles = state.selectedFiles.length || '?';
     const infoEl = $('#selectedFilesInfo');
     const uploadBtn = $('#uploadBtn');
     
     // 업로드 시작 UI 업데이트
     uploadBtn.textContent = '⏳ 업로드 중...';
     uploadBtn.disabled = true;
-    
-    // 경과 시간 타이머 시작
-    const startTime = Date.now();
-    const timer = setInterval(() => {
-        const elapsed = Math.floor((Date.now() - startTime) / 1000);
-        const min = Math.floor(elapsed / 60);
-        const sec = elapsed % 60;
-        const timeStr = min > 0 ? `${min}분 ${sec}초` : `${sec}초`;
-        infoEl.innerHTML = `<span style="color:var(--warning)">⏳ ${totalFiles}개 파일 업로드 + AI 인덱싱 진행 중... (${timeStr} 경과)</span><br><span style="font-size:0.8rem;color:var(--text-muted)">파일당 최대 수 분 소요될 수 있습니다. 터미널 로그에서 진행 상황을 확인하세요.</span>`;
-    }, 1000);
+    infoEl.innerHTML = `<span style="color:var(--warning)">⏳ 파일 전송 중...</span>`;
 
     try {
-        let data;
+        let job;
 
+        // 작업 등록 (서버는 job id를 바로 반환하고 백그라운드에서 처리)
         if (state.selectedFiles.length > 0) {
-            const formData = new FormData();
-            for (const f of state.selectedFiles) {
-                formData.append('files', f);
-            }
-            formData.append('store_type', storeType);
-            formData.append('version_group', versionGroup);
-            
-            const res = await fetch(`${API}/admin/upload_client`, {
-                method: 'POST',
-                headers: { 'Authorization': `Bearer ${state.token}` },
-                body: formData
-            });
-            data = await res.json();
-            if (!res.ok) throw new Error(data.detail || '업로드 실패');
+            // 브라우저 선택 파일은 분할 전송 (끊겨도 다시 업로드하면 이어서 전송)
+            job = await uploadResumable(state.selectedFiles, storeType, versionGroup);
         } else {
-            data = await api('POST', '/admin/upload', {
+            job = await api('POST', '/admin/upload', {
                 path,
                 store_type: storeType,
                 version_group: versionGroup,
             });
         }
 
-        if (data) {
-            showToast(data.message, 'success');
+        if (job) job = await waitForJob(job.job_id);
+
+        if (job) {
+            if (job.status === 'failed') throw new Error(job.message);
+            showToast(job.message, 'success');
             // reset files
             state.selectedFiles = [];
             infoEl.textContent = "선택된 파일이 없습니다. (버튼 또는 경로 입력)";
@@ -466,7 +585,6 @@ async function handleUpload() {
         showToast('업로드 실패: ' + err.message, 'error');
         infoEl.innerHTML = `<span style="color:var(--danger)">❌ 업로드 실패: ${escapeHtml(err.message)}</span>`;
     } finally {
-        clearInterval(timer);
         uploadBtn.textContent = '🚀 업로드';
         uploadBtn.disabled = false;
     }
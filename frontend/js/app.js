@@ -38,6 +38,48 @@ async function api(method, path, body = null) {
     return data;
 }
 
+/** SSE 스트리밍 API 호출 헬퍼 — 이벤트마다 onEvent(event, data) 호출. 인증 만료로 스트림을 열지 못하면 false */
+async function apiStream(path, body, onEvent) {
+    const headers = { 'Content-Type': 'application/json' };
+    if (state.token) headers['Authorization'] = `Bearer ${state.token}`;
+
+    const res = await fetch(`${API}${path}`, {
+        method: 'POST', headers, body: JSON.stringify(body),
+    });
+
+    if (!res.ok) {
+        if (res.status === 401) { logout(); return false; }
+        const data = await res.json();
+        throw new Error(data.detail || '요청 실패');
+    }
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // 이벤트는 빈 줄(\n\n)로 구분
+        let sep;
+        while ((sep = buffer.indexOf('\n\n')) !== -1) {
+            const frame = buffer.slice(0, sep);
+            buffer = buffer.slice(sep + 2);
+
+            let event = 'message';
+            let data = '';
+            frame.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            });
+            onEvent(event, data ? JSON.parse(data) : null);
+        }
+    }
+    return true;
+}
+
 /** 토스트 알림 */
 function showToast(message, type = 'info') {
     const container = $('#toastContainer');
@@ -361,24 +403,55 @@ async function sendMessage() {
     // 타이핑 인디케이터 표시
     $('#typingIndicator').classList.add('active');
 
+    // 스트리밍 중인 AI 메시지 버블 (첫 토큰 도착 시 생성)
+    let streamDiv = null;
+    let answer = '';
+    let citations = [];
+    let streamError = null;
+    let completed = false;
+
     try {
-        const data = await api('POST', `/sessions/${state.currentSessionId}/chat`, { message });
+        const opened = await apiStream(`/sessions/${state.currentSessionId}/chat/stream`, { message }, (event, data) => {
+            if (event === 'token') {
+                if (!streamDiv) {
+                    $('#typingIndicator').classList.remove('active');
+                    streamDiv = document.createElement('div');
+                    streamDiv.className = 'message assistant';
+                    streamDiv.innerHTML = '<div class="message-bubble"></div>';
+                    $('#chatMessages').appendChild(streamDiv);
+                }
+                answer += data.text;
+                streamDiv.querySelector('.message-bubble').innerHTML = renderMarkdown(answer);
+                scrollToBottom();
+            } else if (event === 'citations') {
+                citations = data || [];
+            } else if (event === 'done') {
+                answer = data.answer;
+                completed = true;
+            } else if (event === 'error') {
+                streamError = data.detail;
+            }
+        });
         $('#typingIndicator').classList.remove('active');
+        if (streamDiv) streamDiv.remove();
 
-        if (data) {
-            const aiIdx = state.messages.length;
-            state.messages.push({
-                role: 'assistant',
-                content: data.answer,
-                citations: data.citations || [],
-            });
-            appendMessage('assistant', data.answer, data.citations, aiIdx);
+        // 인증 만료 → 이미 로그인 화면으로 전환됨 (빈 답변 버블을 만들지 않음)
+        if (!opened) return;
+        if (streamError) throw new Error(streamError);
+        if (!completed) throw new Error('응답이 중간에 끊겼습니다');
 
-            // 세션 목록 새로고침 (제목 업데이트 반영)
-            await loadSessions();
-        }
+        // 완료된 응답을 출처·피드백 버튼과 함께 최종 렌더링
+        const aiIdx = state.messages.length;
+        state.messages.push({ role: 'assistant', content: answer, citations });
+        appendMessage('assistant', answer, citations, aiIdx);
+
+        // 세션 목록 새로고침 (제목 업데이트 반영)
+        await loadSessions();
+        // 첫 메시지면 AI 제목이 백그라운드에서 생성되므로 잠시 후 한 번 더 갱신
+        if (userIdx === 0) setTimeout(loadSessions, 3000);
     } catch (err) {
         $('#typingIndicator').classList.remove('active');
+        if (streamDiv) streamDiv.remove();
         showToast('응답 생성 실패: ' + err.message, 'error');
     }
 }
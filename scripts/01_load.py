@@ -1,6 +1,314 @@
-# 로우 데이터 로드 스크립트 템플릿
-def load_data():
-    pass
+"""
+폴더 감시 수집 데몬
+
+지정한 디렉토리(하위 폴더 포함)를 감시하다가 새로 생기거나 바뀐 문서만 업로드 작업으로 등록한다.
+  1. 시작 시 한 번: 파일별 mtime/크기를 DB 목록(watch_files)과 비교해 꺼져 있던 동안의 변경을 찾음
+  2. 이후: inotify 이벤트(쓰기 완료·이동·생성)로 변경 감지 (리눅스가 아니거나 실패하면 주기적인 mtime/크기 비교)
+  3. 같은 파일에 쓰기가 몰리면 WATCH_DEBOUNCE_SECONDS 동안 잠잠해지고 크기가 그대로일 때 한 번만 등록
+  4. 준비된 파일을 모아 업로드 작업 하나로 등록 → 관리자 업로드와 같은 경로(해시 중복 확인, 변경 문서 교체,
+     메타데이터·카테고리 등록)로 처리되고 /api/admin/jobs에서 진행 상황을 볼 수 있음
+
+작업은 서버의 업로드 워커가 처리한다. 서버 없이 단독으로 돌릴 때만 --workers로 이 프로세스에서 워커를 띄운다.
+실패한 파일은 목록에서 빼 두어 다음 변경(또는 재시작, 주기 비교) 때 다시 시도한다. 삭제된 파일은 Store에서 지우지 않는다.
+
+사용법:
+  .venv/bin/python scripts/01_load.py /data/규정 /data/지침           # primary Store로 수집
+  WATCH_DIRS=/data/규정 .venv/bin/python scripts/01_load.py --workers  # 서버 없이 단독 실행
+  .venv/bin/python scripts/01_load.py /data/규정 --poll                 # inotify 대신 주기 비교
+"""
+import sys
+import os
+import time
+import ctypes
+import ctypes.util
+import select
+import signal
+import struct
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from core.document_uploader import MIME_MAP
+from server import ingest_jobs
+from server.database import get_db, init_db
+
+# inotify 이벤트 (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class Inotify:
+    """ctypes로 쓰는 리눅스 inotify. 디렉토리마다 watch를 걸어 하위 폴더까지 감시."""
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)  # 리눅스가 아니면 AttributeError
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        self._dirs: dict[int, str] = {}  # watch descriptor → 디렉토리
+
+    def add_tree(self, root: str):
+        for dirpath, _, _ in os.walk(root):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                # ENOSPC: fs.inotify.max_user_watches 초과
+                raise OSError(ctypes.get_errno(), f"inotify watch 등록 실패: {dirpath}")
+            self._dirs[wd] = dirpath
+
+    def read(self, timeout: float) -> list[tuple[str | None, int]]:
+        """timeout(초)까지 이벤트 대기 → [(경로, mask)]. 큐가 넘치면 경로 None (전체 재비교 필요)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        pos = 0
+        while pos < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, pos)
+            name = data[pos + _EVENT_HEADER.size:pos + _EVENT_HEADER.size + length].rstrip(b"\0")
+            pos += _EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                events.append((None, mask))
+            elif mask & IN_IGNORED:
+                self._dirs.pop(wd, None)  # 감시하던 디렉토리가 삭제됨
+            elif wd in self._dirs:
+                events.append((os.path.join(self._dirs[wd], os.fsdecode(name)), mask))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _is_candidate(path: str) -> bool:
+    """업로드 대상 문서인지 (숨김 파일·오피스 임시 파일 제외)"""
+    name = os.path.basename(path)
+    return not name.startswith((".", "~$")) and Path(name).suffix.lower() in MIME_MAP
+
+
+def _stat(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class FolderWatcher:
+    def __init__(self, dirs: list[str], store_type: str, user_id: str, debounce: float, use_inotify: bool):
+        self.dirs = [os.path.abspath(d) for d in dirs]
+        self.store_type = store_type
+        self.user_id = user_id
+        self.debounce = debounce
+        self.pending: dict[str, tuple[float, tuple[int, int]]] = {}  # 경로 → (마지막 변경 감지 시각, 그때의 크기·mtime)
+        self.outstanding: set[str] = set()  # 결과를 아직 확인하지 않은 작업
+        self.stopped = False
+        self.inotify = None
+        if use_inotify:
+            try:
+                self.inotify = Inotify()
+            except (AttributeError, OSError) as e:
+                print(f"⚠️ inotify를 사용할 수 없어 {config.WATCH_SCAN_INTERVAL_SECONDS:.0f}초 주기 비교로 감시합니다: {e}")
+
+        conn = get_db()
+        try:
+            self.manifest = {
+                row["path"]: (row["size"], row["mtime_ns"])
+                for row in conn.execute("SELECT path, size, mtime_ns FROM watch_files")
+            }
+            self.outstanding = {
+                row[0] for row in conn.execute(
+                    """SELECT DISTINCT w.job_id FROM watch_files w JOIN ingest_jobs j ON j.id = w.job_id
+                    WHERE j.status IN ('pending', 'running')"""
+                )
+            }
+        finally:
+            conn.close()
+
+    def _touch(self, path: str):
+        """변경 감지 → 디바운스 시작 (목록과 같은 파일이면 무시)"""
+        stat = _stat(path)
+        if stat is None or not _is_candidate(path):
+            return
+        if self.manifest.get(path) == stat and path not in self.pending:
+            return
+        self.pending[path] = (time.monotonic(), stat)
+
+    def scan(self, root: str | None = None):
+        """mtime/크기 비교로 변경 파일 찾기 (해시 계산 없이 stat만)"""
+        for top in [root] if root else self.dirs:
+            for dirpath, dirnames, filenames in os.walk(top):
+                dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+                for name in filenames:
+                    self._touch(os.path.join(dirpath, name))
+
+    def _on_event(self, path: str | None, mask: int):
+        if path is None:
+            print("⚠️ inotify 이벤트 큐가 넘쳐 전체를 다시 비교합니다")
+            self.scan()
+        elif mask & IN_ISDIR:
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                # 새 폴더: 감시를 걸고, 감시 전에 들어온 파일이 있을 수 있으므로 한 번 비교
+                try:
+                    self.inotify.add_tree(path)
+                except OSError as e:
+                    print(f"⚠️ {e} (이 폴더의 이후 변경은 재시작 때 반영)")
+                self.scan(path)
+        else:
+            self._touch(path)
+
+    def _ready(self) -> list[tuple[str, tuple[int, int]]]:
+        """디바운스 시간 동안 변경이 없고 크기·mtime이 그대로인 파일 (아직 쓰는 중이면 다시 대기)"""
+        now = time.monotonic()
+        ready = []
+        for path, (seen_at, stat) in list(self.pending.items()):
+            if now - seen_at < self.debounce:
+                continue
+            current = _stat(path)
+            if current is None:
+                del self.pending[path]
+            elif current != stat:
+                self.pending[path] = (now, current)
+            else:
+                del self.pending[path]
+                if self.manifest.get(path) != current:
+                    ready.append((path, current))
+        return ready
+
+    def submit_ready(self):
+        ready = self._ready()
+        if not ready:
+            return
+        conn = get_db()
+        try:
+            # 작업 등록과 감시 목록 갱신을 한 트랜잭션으로
+            job_id = ingest_jobs.create_job(
+                conn, "path", self.store_type, "", self.user_id,
+                [(path, Path(path), "queued", None, None) for path, _ in ready],
+            )
+            conn.executemany(
+                """INSERT INTO watch_files (path, size, mtime_ns, job_id) VALUES (?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns,
+                job_id = excluded.job_id, updated_at = CURRENT_TIMESTAMP""",
+                [(path, size, mtime_ns, job_id) for path, (size, mtime_ns) in ready],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        for path, stat in ready:
+            self.manifest[path] = stat
+        self.outstanding.add(job_id)
+        ingest_jobs.wake_workers()
+        print(f"📥 변경 문서 {len(ready)}개 업로드 작업 등록 [{job_id}]")
+
+    def check_jobs(self):
+        """끝난 작업에서 실패한 파일은 목록에서 빼서 다음 변경·비교 때 다시 시도"""
+        if not self.outstanding:
+            return
+        conn = get_db()
+        try:
+            for job_id in list(self.outstanding):
+                job = conn.execute("SELECT status, message FROM ingest_jobs WHERE id = ?", (job_id,)).fetchone()
+                if job and job["status"] in ("pending", "running"):
+                    continue
+                self.outstanding.discard(job_id)
+                failed = [row[0] for row in conn.execute(
+                    """SELECT f.path FROM ingest_job_files f JOIN watch_files w ON w.path = f.path AND w.job_id = f.job_id
+                    WHERE f.job_id = ? AND f.status = 'failed'""",
+                    (job_id,),
+                )]
+                conn.executemany("DELETE FROM watch_files WHERE path = ?", [(p,) for p in failed])
+                conn.commit()
+                for path in failed:
+                    self.manifest.pop(path, None)
+                if job:
+                    print(f"📦 [{job_id}] {job['message']}")
+        finally:
+            conn.close()
+
+    def run(self):
+        for d in self.dirs:
+            if self.inotify:
+                self.inotify.add_tree(d)  # 시작 비교 전에 걸어야 그 사이의 변경을 놓치지 않음
+        self.scan()
+        mode = "inotify" if self.inotify else f"{config.WATCH_SCAN_INTERVAL_SECONDS:.0f}초 주기 비교"
+        print(f"👀 폴더 감시 시작 ({mode}, 디바운스 {self.debounce:.0f}초): {', '.join(self.dirs)}")
+        if self.pending:
+            print(f"🔎 꺼져 있던 동안 바뀐 문서 {len(self.pending)}개")
+
+        next_scan = time.monotonic() + config.WATCH_SCAN_INTERVAL_SECONDS
+        while not self.stopped:
+            # 디바운스 대기 중인 파일이 있으면 짧게, 없으면 길게 대기
+            timeout = 1.0 if self.pending else 5.0
+            if self.inotify:
+                for path, mask in self.inotify.read(timeout):
+                    self._on_event(path, mask)
+            else:
+                time.sleep(timeout)
+                if time.monotonic() >= next_scan:
+                    self.scan()
+                    next_scan = time.monotonic() + config.WATCH_SCAN_INTERVAL_SECONDS
+            self.submit_ready()
+            self.check_jobs()
+
+        if self.inotify:
+            self.inotify.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="폴더 감시 수집 데몬 (새로 생기거나 바뀐 문서만 업로드)")
+    parser.add_argument("dirs", nargs="*", help="감시할 디렉토리 (생략 시 WATCH_DIRS)")
+    parser.add_argument("--store-type", default="primary", choices=["primary", "correction"])
+    parser.add_argument("--user", default="admin", help="작업 등록자(업로드한 사람)로 기록할 계정")
+    parser.add_argument("--debounce", type=float, default=config.WATCH_DEBOUNCE_SECONDS,
+                        help="마지막 쓰기 후 업로드까지 기다릴 시간(초)")
+    parser.add_argument("--poll", action="store_true", help="inotify 대신 주기적인 mtime/크기 비교 사용")
+    parser.add_argument("--workers", action="store_true",
+                        help="이 프로세스에서 업로드 워커 실행 (서버를 띄우지 않을 때만)")
+    args = parser.parse_args()
+
+    dirs = args.dirs or config.WATCH_DIRS
+    missing = [d for d in dirs if not os.path.isdir(d)]
+    if not dirs or missing:
+        parser.error(f"감시할 디렉토리가 없습니다: {', '.join(missing) or '(WATCH_DIRS 비어 있음)'}")
+
+    init_db()
+    conn = get_db()
+    try:
+        user = conn.execute("SELECT id FROM users WHERE username = ?", (args.user,)).fetchone()
+    finally:
+        conn.close()
+    if not user:
+        parser.error(f"계정을 찾을 수 없습니다: {args.user}")
+
+    watcher = FolderWatcher(dirs, args.store_type, user["id"], args.debounce, use_inotify=not args.poll)
+
+    def stop(signum, frame):
+        watcher.stopped = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    if args.workers and not ingest_jobs.start_workers():
+        parser.error("다른 프로세스(서버)가 이 DB의 업로드 워커를 실행 중입니다. --workers 없이 실행하세요")
+    try:
+        watcher.run()
+    finally:
+        if args.workers:
+            ingest_jobs.stop_workers()
+    print("👋 폴더 감시 종료 (진행 중인 작업은 다음 실행 때 이어서 처리)")
+
 
 if __name__ == "__main__":
-    load_data()
+    main()
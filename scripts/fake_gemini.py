@@ -0,0 +1,367 @@
+"""
+로컬 가짜 Gemini API 서버 (File Search 부하 테스트용)
+
+이 프로젝트가 사용하는 엔드포인트만 흉내 낸다:
+  - models.generate_content / generate_content_stream
+  - file_search_stores.list / create / get / delete, documents.list / delete
+  - file_search_stores.upload_to_file_search_store (resumable 업로드)
+  - operations.get (인덱싱 완료는 --index-seconds 뒤)
+
+지연과 에러(503, 429 + retryDelay)를 주입할 수 있어 실제 할당량 없이 처리량을 측정할 수 있다.
+상태는 메모리에만 보관한다.
+
+사용법:
+  .venv/bin/python scripts/fake_gemini.py --port 8090 --latency-ms 800 --error-rate 0.02
+  GEMINI_BASE_URL=http://127.0.0.1:8090 GEMINI_API_KEY=fake uvicorn server.app:app --port 8000
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import uuid
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import uvicorn
+
+API = "/v1beta"
+
+app = FastAPI(title="Fake Gemini File Search")
+
+# 실행 옵션 (main()에서 덮어씀)
+settings = {
+    "latency_ms": 800.0,       # generate_content 평균 지연
+    "jitter_ms": 200.0,        # 지연 표준편차
+    "api_latency_ms": 30.0,    # Store/문서/operation 조회 지연
+    "error_rate": 0.0,         # 503 UNAVAILABLE 비율
+    "rate_limit_rate": 0.0,    # 429 RESOURCE_EXHAUSTED 비율
+    "retry_delay_seconds": 1,  # 429 응답의 retryDelay
+    "index_seconds": 2.0,      # 업로드 후 인덱싱 완료까지 시간
+    "stream_chunks": 8,        # 스트리밍 응답 청크 수
+}
+
+_lock = threading.Lock()
+_stores: dict[str, dict] = {}       # name → {"name", "displayName", "createTime"}
+_documents: dict[str, dict] = {}    # name → {"name", "displayName", "mimeType", "sizeBytes"}
+_uploads: dict[str, dict] = {}      # 업로드 세션 id → {"store", "displayName", "mimeType", "size"}
+_operations: dict[str, dict] = {}   # name → {"document", "done_at"}
+_stats = {"generate": 0, "stream": 0, "uploads": 0, "errors": 0, "rate_limited": 0}
+
+
+def _count(name: str):
+    with _lock:
+        _stats[name] += 1
+
+
+def _error(code: int, status: str, message: str, details: list | None = None) -> JSONResponse:
+    body = {"error": {"code": code, "message": message, "status": status}}
+    if details:
+        body["error"]["details"] = details
+    return JSONResponse(body, status_code=code)
+
+
+def _injected_error() -> JSONResponse | None:
+    """설정된 비율에 따라 429 또는 503 에러 응답"""
+    roll = random.random()
+    if roll < settings["rate_limit_rate"]:
+        _count("rate_limited")
+        return _error(429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (fake).", [{
+            "@type": "type.googleapis.com/google.rpc.RetryInfo",
+            "retryDelay": f"{settings['retry_delay_seconds']}s",
+        }])
+    if roll < settings["rate_limit_rate"] + settings["error_rate"]:
+        _count("errors")
+        return _error(503, "UNAVAILABLE", "The model is overloaded (fake).")
+    return None
+
+
+async def _delay(mean_ms: float, jitter_ms: float = 0.0):
+    seconds = max(0.0, random.gauss(mean_ms, jitter_ms)) / 1000
+    if seconds:
+        await asyncio.sleep(seconds)
+
+
+def _last_user_text(body: dict) -> str:
+    contents = body.get("contents") or []
+    if isinstance(contents, dict):
+        contents = [contents]
+    for content in reversed(contents):
+        if isinstance(content, str):
+            return content
+        if content.get("role", "user") == "user":
+            return " ".join(p.get("text", "") for p in content.get("parts", []))
+    return ""
+
+
+def _answer_text(body: dict) -> str:
+    question = _last_user_text(body)
+    config_text = json.dumps(body.get("generationConfig", {}))
+    if "application/json" in config_text and "카테고리" in question:
+        # 카테고리 일괄 분류: 번호별 카테고리 (일부 항목은 일부러 누락 → 재요청 경로 확인용)
+        numbers = re.findall(r"^(\d+)\. ", question, re.MULTILINE)
+        categories = ["인사", "재무", "복무", "기획", "보안", "시스템", "기타"]
+        return json.dumps({n: random.choice(categories) for n in numbers if random.random() > 0.1}, ensure_ascii=False)
+    if "application/json" in config_text:
+        # 세션 제목 일괄 생성 등 JSON 응답을 기대하는 호출
+        return json.dumps({str(i): f"제목 {i}" for i in range(1, 51)}, ensure_ascii=False)
+    if "카테고리" in question:
+        return random.choice(["인사", "재무", "복무", "기획", "보안", "시스템", "기타"])
+    if "제목" in question:
+        return "가짜 제목"
+    return f"[가짜 응답] '{question[:40]}'에 대한 규정 안내입니다. 관련 조항은 제3조를 참고하세요."
+
+
+def _grounding(body: dict) -> dict:
+    with _lock:
+        docs = list(_documents.values())[:3]
+    chunks = [
+        {"retrievedContext": {"title": d["displayName"], "uri": "", "text": f"{d['displayName']} 본문 발췌"}}
+        for d in docs
+    ]
+    return {"groundingChunks": chunks} if chunks else {}
+
+
+def _candidate(text: str, body: dict, finish: bool = True) -> dict:
+    candidate = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+    if finish:
+        candidate["finishReason"] = "STOP"
+        grounding = _grounding(body)
+        if grounding:
+            candidate["groundingMetadata"] = grounding
+    return candidate
+
+
+def _usage(text: str) -> dict:
+    return {"promptTokenCount": 100, "candidatesTokenCount": len(text) // 2, "totalTokenCount": 100 + len(text) // 2}
+
+
+# ── models ─────────────────────────────────────────────
+
+@app.post(API + "/models/{model}:generateContent")
+async def generate_content(model: str, request: Request):
+    body = await request.json()
+    await _delay(settings["latency_ms"], settings["jitter_ms"])
+    error = _injected_error()
+    if error:
+        return error
+    _count("generate")
+    text = _answer_text(body)
+    return {"candidates": [_candidate(text, body)], "usageMetadata": _usage(text), "modelVersion": model}
+
+
+@app.post(API + "/models/{model}:streamGenerateContent")
+async def stream_generate_content(model: str, request: Request):
+    body = await request.json()
+    # 첫 토큰까지 지연의 절반, 나머지는 청크 사이에 분배
+    await _delay(settings["latency_ms"] / 2, settings["jitter_ms"])
+    error = _injected_error()
+    if error:
+        return error
+    _count("stream")
+    text = _answer_text(body)
+    n = max(1, settings["stream_chunks"])
+    size = max(1, -(-len(text) // n))
+    pieces = [text[i:i + size] for i in range(0, len(text), size)]
+
+    async def events():
+        for i, piece in enumerate(pieces):
+            last = i == len(pieces) - 1
+            chunk = {"candidates": [_candidate(piece, body, finish=last)], "modelVersion": model}
+            if last:
+                chunk["usageMetadata"] = _usage(text)
+            yield f"data: {json.dumps(chunk, ensure_ascii=False)}\r\n\r\n"
+            if not last:
+                await asyncio.sleep(settings["latency_ms"] / 2 / n / 1000)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+# ── fileSearchStores ───────────────────────────────────
+
+@app.get(API + "/fileSearchStores")
+async def list_stores():
+    await _delay(settings["api_latency_ms"])
+    with _lock:
+        return {"fileSearchStores": list(_stores.values())}
+
+
+@app.post(API + "/fileSearchStores")
+async def create_store(request: Request):
+    body = await request.json() if await request.body() else {}
+    await _delay(settings["api_latency_ms"])
+    name = f"fileSearchStores/fake-{uuid.uuid4().hex[:12]}"
+    store = {"name": name, "displayName": body.get("displayName", ""), "createTime": _now()}
+    with _lock:
+        _stores[name] = store
+    return store
+
+
+@app.get(API + "/fileSearchStores/{store_id}")
+async def get_store(store_id: str):
+    await _delay(settings["api_latency_ms"])
+    with _lock:
+        store = _stores.get(f"fileSearchStores/{store_id}")
+    if not store:
+        return _error(404, "NOT_FOUND", f"Store {store_id} not found")
+    return store
+
+
+@app.delete(API + "/fileSearchStores/{store_id}")
+async def delete_store(store_id: str):
+    await _delay(settings["api_latency_ms"])
+    name = f"fileSearchStores/{store_id}"
+    with _lock:
+        _stores.pop(name, None)
+        for doc_name in [d for d in _documents if d.startswith(name + "/")]:
+            del _documents[doc_name]
+    return {}
+
+
+@app.get(API + "/fileSearchStores/{store_id}/documents")
+async def list_documents(store_id: str):
+    await _delay(settings["api_latency_ms"])
+    prefix = f"fileSearchStores/{store_id}/documents/"
+    with _lock:
+        return {"documents": [d for n, d in _documents.items() if n.startswith(prefix)]}
+
+
+@app.delete(API + "/fileSearchStores/{store_id}/documents/{doc_id}")
+async def delete_document(store_id: str, doc_id: str):
+    await _delay(settings["api_latency_ms"])
+    with _lock:
+        _documents.pop(f"fileSearchStores/{store_id}/documents/{doc_id}", None)
+    return {}
+
+
+# ── 업로드 / operations ────────────────────────────────
+
+@app.post("/upload" + API + "/fileSearchStores/{store_id}:uploadToFileSearchStore")
+async def start_upload(store_id: str, request: Request):
+    """resumable 업로드 시작: X-Goog-Upload-URL 헤더로 세션 URL 반환"""
+    body = await request.json() if await request.body() else {}
+    await _delay(settings["api_latency_ms"])
+    error = _injected_error()
+    if error:
+        return error
+    if f"fileSearchStores/{store_id}" not in _stores:
+        return _error(404, "NOT_FOUND", f"Store {store_id} not found")
+    upload_id = uuid.uuid4().hex
+    with _lock:
+        _uploads[upload_id] = {
+            "store": f"fileSearchStores/{store_id}",
+            "displayName": body.get("displayName", ""),
+            "mimeType": body.get("mimeType", request.headers.get("X-Goog-Upload-Header-Content-Type", "")),
+            "size": 0,
+        }
+    upload_url = f"{request.base_url}upload/sessions/{upload_id}"
+    return Response(headers={"X-Goog-Upload-URL": upload_url, "X-Goog-Upload-Status": "active"})
+
+
+@app.post("/upload/sessions/{upload_id}")
+async def upload_chunk(upload_id: str, request: Request):
+    """청크 수신. finalize면 문서와 인덱싱 operation 생성."""
+    data = await request.body()
+    command = request.headers.get("X-Goog-Upload-Command", "")
+    with _lock:
+        upload = _uploads.get(upload_id)
+        if upload:
+            upload["size"] += len(data)
+    if not upload:
+        return _error(404, "NOT_FOUND", "Upload session not found")
+    if "finalize" not in command:
+        return Response(headers={"X-Goog-Upload-Status": "active"})
+
+    _count("uploads")
+    doc_name = f"{upload['store']}/documents/{upload_id[:16]}"
+    op_name = f"{upload['store']}/upload/operations/{upload_id[:16]}"
+    with _lock:
+        _uploads.pop(upload_id, None)
+        _operations[op_name] = {
+            "document": {
+                "name": doc_name,
+                "displayName": upload["displayName"],
+                "mimeType": upload["mimeType"],
+                "sizeBytes": str(upload["size"]),
+            },
+            "done_at": time.monotonic() + settings["index_seconds"],
+        }
+    return JSONResponse(_operation(op_name), headers={"X-Goog-Upload-Status": "final"})
+
+
+def _operation(op_name: str) -> dict | None:
+    """operation 상태. 인덱싱 시간이 지나면 문서를 Store에 등록하고 done 처리."""
+    with _lock:
+        op = _operations.get(op_name)
+        if not op:
+            return None
+        if time.monotonic() < op["done_at"]:
+            return {"name": op_name, "done": False}
+        _documents.setdefault(op["document"]["name"], op["document"])
+    return {
+        "name": op_name,
+        "done": True,
+        "response": {
+            "@type": "type.googleapis.com/google.ai.generativelanguage.v1main.UploadToFileSearchStoreResponse",
+            "documentName": op["document"]["name"],
+        },
+    }
+
+
+@app.get(API + "/fileSearchStores/{store_id}/upload/operations/{op_id}")
+async def get_operation(store_id: str, op_id: str):
+    await _delay(settings["api_latency_ms"])
+    op = _operation(f"fileSearchStores/{store_id}/upload/operations/{op_id}")
+    if op is None:
+        return _error(404, "NOT_FOUND", f"Operation {op_id} not found")
+    return op
+
+
+@app.get("/fake/stats")
+def fake_stats():
+    """가짜 서버 호출 통계"""
+    with _lock:
+        return {**_stats, "stores": len(_stores), "documents": len(_documents), "pending_operations": sum(
+            1 for op in _operations.values() if time.monotonic() < op["done_at"]
+        ), "settings": settings}
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 가짜 Gemini File Search 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=settings["latency_ms"], help="생성 호출 평균 지연(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=settings["jitter_ms"], help="생성 호출 지연 표준편차(ms)")
+    parser.add_argument("--api-latency-ms", type=float, default=settings["api_latency_ms"], help="Store/문서/operation 조회 지연(ms)")
+    parser.add_argument("--error-rate", type=float, default=settings["error_rate"], help="503 응답 비율 (0~1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=settings["rate_limit_rate"], help="429 응답 비율 (0~1)")
+    parser.add_argument("--retry-delay", type=int, default=settings["retry_delay_seconds"], help="429 응답의 retryDelay(초)")
+    parser.add_argument("--index-seconds", type=float, default=settings["index_seconds"], help="업로드 후 인덱싱 완료까지 시간(초)")
+    args = parser.parse_args()
+
+    settings.update({
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "api_latency_ms": args.api_latency_ms,
+        "error_rate": args.error_rate,
+        "rate_limit_rate": args.rate_limit_rate,
+        "retry_delay_seconds": args.retry_delay,
+        "index_seconds": args.index_seconds,
+    })
+    print(f"🧪 가짜 Gemini 서버: http://{args.host}:{args.port} — {settings}")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
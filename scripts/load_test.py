@@ -0,0 +1,212 @@
+"""
+엔드 투 엔드 부하 테스트 스크립트
+
+목표 RPS로 요청을 일정 간격(open-loop)으로 보내고, 엔드포인트별 p50/p95/p99 지연과 에러를 집계한다.
+실제 할당량을 쓰지 않으려면 scripts/fake_gemini.py를 띄우고 서버를 GEMINI_BASE_URL로 연결해 실행한다.
+
+시나리오 (가중치는 --mix로 조정):
+  chat         POST /api/sessions/{id}/chat
+  feedback     POST /api/feedback
+  upload       POST /api/admin/upload_client (생성한 작은 .txt 파일)
+  upload_path  POST /api/admin/upload (서버와 같은 머신일 때만 — 로컬 임시 파일 경로 전달)
+  ※ 업로드는 작업 등록까지의 지연만 측정된다 (처리 완료는 GET /api/admin/jobs/{id})
+
+사용법:
+  .venv/bin/python scripts/fake_gemini.py --latency-ms 800 &
+  GEMINI_BASE_URL=http://127.0.0.1:8090 GEMINI_API_KEY=fake uvicorn server.app:app --port 8000 &
+  .venv/bin/python scripts/load_test.py --rps 20 --duration 60
+  .venv/bin/python scripts/load_test.py --rps 5 --mix chat=0.7,feedback=0.2,upload=0.1
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from pathlib import Path
+import httpx
+
+QUESTIONS = [
+    "연차휴가는 며칠인가요?",
+    "출장비 정산 기한은 언제까지인가요?",
+    "재택근무 신청 절차를 알려주세요.",
+    "보안 교육은 연 몇 회 받아야 하나요?",
+    "경조사 휴가 일수는 어떻게 되나요?",
+    "초과근무 수당 계산 방법은?",
+]
+
+
+def percentile(samples: list[float], p: float) -> float:
+    """nearest-rank 백분위수"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    return {k: v for k, v in mix.items() if v > 0}
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.client = httpx.AsyncClient(
+            base_url=args.base_url,
+            timeout=args.timeout,
+            limits=httpx.Limits(max_connections=args.max_in_flight),
+        )
+        self.headers = {}
+        self.sessions: list[str] = []
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, Counter] = defaultdict(Counter)
+        self.stage_totals: dict[str, list[float]] = defaultdict(list)
+        self.dropped = 0
+        self.upload_dir = Path(tempfile.mkdtemp(prefix="loadtest_"))
+
+    async def setup(self):
+        """로그인 → 세션 생성 → 세션마다 한 번 채팅 (피드백 대상 메시지 확보)"""
+        r = await self.client.post("/api/auth/login", json={
+            "username": self.args.username, "password": self.args.password,
+        })
+        r.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {r.json()['token']}"}
+
+        for _ in range(self.args.sessions):
+            r = await self.client.post("/api/sessions", headers=self.headers)
+            r.raise_for_status()
+            self.sessions.append(r.json()["session_id"])
+
+        await asyncio.gather(*(
+            self.client.post(f"/api/sessions/{sid}/chat", headers=self.headers,
+                             json={"message": random.choice(QUESTIONS)})
+            for sid in self.sessions
+        ))
+
+    def _record(self, name: str, start: float, response: httpx.Response | None, error: str | None = None):
+        elapsed = time.perf_counter() - start
+        if response is not None and response.status_code < 400:
+            self.latencies[name].append(elapsed)
+            for entry in response.headers.get("Server-Timing", "").split(","):
+                stage, _, dur = entry.strip().partition(";dur=")
+                if dur:
+                    self.stage_totals[stage].append(float(dur))
+        else:
+            self.errors[name][error or str(response.status_code)] += 1
+
+    async def chat(self):
+        sid = random.choice(self.sessions)
+        return await self.client.post(
+            f"/api/sessions/{sid}/chat", headers=self.headers,
+            json={"message": f"{random.choice(QUESTIONS)} ({random.randint(1, self.args.distinct_questions)})"},
+        )
+
+    async def feedback(self):
+        return await self.client.post("/api/feedback", headers=self.headers, json={
+            "session_id": random.choice(self.sessions),
+            "message_index": 1,
+            "user_feedback": "답변이 최신 규정과 다릅니다. 2026년 개정으로 16일입니다.",
+        })
+
+    async def upload(self):
+        name = f"부하테스트_{uuid.uuid4().hex[:8]}.txt"
+        content = f"부하 테스트 문서 {name}\n".encode("utf-8") * 50
+        return await self.client.post(
+            "/api/admin/upload_client", headers=self.headers,
+            files=[("files", (name, content, "text/plain"))],
+            data={"store_type": "primary"},
+        )
+
+    async def upload_path(self):
+        path = self.upload_dir / f"loadtest_{uuid.uuid4().hex[:8]}.txt"
+        path.write_text(f"부하 테스트 문서 {path.name}\n" * 50, encoding="utf-8")
+        return await self.client.post("/api/admin/upload", headers=self.headers, json={
+            "path": str(path), "store_type": "primary",
+        })
+
+    async def _one(self, name: str, semaphore: asyncio.Semaphore):
+        start = time.perf_counter()
+        try:
+            response = await getattr(self, name)()
+            self._record(name, start, response)
+        except httpx.HTTPError as e:
+            self._record(name, start, None, type(e).__name__)
+        finally:
+            semaphore.release()
+
+    async def run(self):
+        mix = parse_mix(self.args.mix)
+        names, weights = list(mix), list(mix.values())
+        semaphore = asyncio.Semaphore(self.args.max_in_flight)
+        interval = 1 / self.args.rps
+        tasks = []
+
+        started = time.perf_counter()
+        next_at = started
+        while next_at - started < self.args.duration:
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            next_at += interval
+            # 동시 처리 한도를 넘으면 대기하지 않고 드롭 (open-loop 유지)
+            if semaphore.locked():
+                self.dropped += 1
+                continue
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(self._one(random.choices(names, weights)[0], semaphore)))
+
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - started
+
+    def report(self, elapsed: float):
+        total_ok = sum(len(v) for v in self.latencies.values())
+        total_err = sum(sum(c.values()) for c in self.errors.values())
+        print(f"\n📊 {elapsed:.1f}s 동안 {total_ok + total_err}건 "
+              f"(목표 {self.args.rps} RPS, 실제 {(total_ok + total_err) / elapsed:.1f} RPS, 드롭 {self.dropped}건)")
+        print(f"{'endpoint':<12} {'ok':>6} {'err':>5} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9}  errors")
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            samples = self.latencies[name]
+            errors = self.errors[name]
+            print(f"{name:<12} {len(samples):>6} {sum(errors.values()):>5} "
+                  f"{percentile(samples, 50) * 1000:>9.0f} {percentile(samples, 95) * 1000:>9.0f} "
+                  f"{percentile(samples, 99) * 1000:>9.0f}  {dict(errors) or ''}")
+
+        if self.stage_totals:
+            print("\n⏱️ Server-Timing 단계별 p50/p95 (ms)")
+            for stage, durs in sorted(self.stage_totals.items()):
+                print(f"  {stage:<16} {percentile(durs, 50):>8.1f} {percentile(durs, 95):>8.1f}  (n={len(durs)})")
+
+    async def close(self):
+        await self.client.aclose()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="RAG 서버 엔드 투 엔드 부하 테스트")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rps", type=float, default=10, help="목표 초당 요청 수")
+    parser.add_argument("--duration", type=float, default=30, help="측정 시간(초)")
+    parser.add_argument("--mix", default="chat=0.85,feedback=0.1,upload=0.05",
+                        help="시나리오 가중치 (chat, feedback, upload, upload_path)")
+    parser.add_argument("--sessions", type=int, default=20, help="미리 만들어 둘 채팅 세션 수")
+    parser.add_argument("--distinct-questions", type=int, default=50,
+                        help="질문 변형 수 (작을수록 답변 캐시/요청 병합 적중률이 높아짐)")
+    parser.add_argument("--max-in-flight", type=int, default=200, help="동시 진행 요청 최대 수")
+    parser.add_argument("--timeout", type=float, default=120, help="요청 타임아웃(초)")
+    parser.add_argument("--username", default="admin", help="업로드 시나리오는 관리자 계정 필요")
+    parser.add_argument("--password", default="admin123")
+    args = parser.parse_args()
+
+    test = LoadTest(args)
+    try:
+        await test.setup()
+        elapsed = await test.run()
+        test.report(elapsed)
+    finally:
+        await test.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
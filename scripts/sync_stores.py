@@ -21,15 +21,11 @@ import argparse
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import config
-from google import genai
+from core.gemini_client import get_client
 import sqlite3
 from pathlib import Path
 
 
-def get_client():
-    return genai.Client(api_key=config.GEMINI_API_KEY)
-
-
 def get_db():
     conn = sqlite3.connect(str(config.DB_PATH))
     conn.row_factory = sqlite3.Row
@@ -2,13 +2,19 @@
 FastAPI 애플리케이션 엔트리포인트
 서버 시작, 정적 파일 서빙, DB 초기화
 """
+import asyncio
+import time
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from server.database import init_db
 from server.routes import router
+from server import ingest_jobs, resumable_uploads
+from core.gemini_client import close_client
+from core import metrics, session_titles
+from core.correction_index import init_index
 import config
 
 # FastAPI 앱 생성
@@ -27,6 +33,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """API 응답에 단계별 소요 시간을 Server-Timing 헤더로 첨부"""
+    if not config.METRICS_ENABLED or not request.url.path.startswith("/api/"):
+        return await call_next(request)
+    timings = metrics.begin_request()
+    start = time.perf_counter()
+    response = await call_next(request)
+    # 스트리밍 응답은 헤더 전송 시점까지 측정된 단계만 포함
+    response.headers["Server-Timing"] = metrics.server_timing(timings, time.perf_counter() - start)
+    return response
+
+
 # API 라우트 등록
 app.include_router(router)
 
@@ -44,6 +64,12 @@ def serve_index():
     return FileResponse(FRONTEND_DIR / "index.html")
 
 
+@app.get("/metrics")
+def serve_metrics():
+    """단계별 지연 히스토그램 (Prometheus 텍스트 형식)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/admin")
 def serve_admin():
     """관리자 대시보드"""
@@ -54,11 +80,25 @@ def serve_admin():
 def startup():
     """서버 시작 시 DB 초기화"""
     init_db()
+    init_index()
+    session_titles.start_batch_worker()
+    if not ingest_jobs.start_workers():
+        print("⚠️ 다른 프로세스(폴더 감시 데몬 --workers)가 업로드 워커를 실행 중입니다. 이 서버는 작업 등록만 합니다")
+    resumable_uploads.expire_stale()
     print("✅ 데이터베이스 초기화 완료")
     print(f"🌐 서버: http://localhost:{config.PORT}")
     print(f"🔑 기본 계정: admin/admin123 (관리자), user/user123 (일반)")
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """서버 종료 시 세션 제목 배치 워커·업로드 작업 워커 정리 + 공유 Gemini 클라이언트 연결 풀 정리"""
+    # 남은 제목 flush(Gemini 호출 + SQLite 쓰기)는 이벤트 루프 밖에서
+    await asyncio.to_thread(session_titles.stop_batch_worker)
+    ingest_jobs.stop_workers()
+    await close_client()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("server.app:app", host=config.HOST, port=config.PORT, reload=True)
@@ -0,0 +1,102 @@
+"""
+Citation 저장소
+동일한 규정 청크를 내용 해시 기준으로 한 번만 저장하고, 메시지는 해시로 참조
+"""
+import hashlib
+import json
+import sqlite3
+
+
+def chunk_hash(citation: dict) -> str:
+    """citation(title, uri, text) 내용 기반 해시"""
+    raw = json.dumps(
+        [citation.get("title", ""), citation.get("uri", ""), citation.get("text", "")],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def save_citations(conn: sqlite3.Connection, message_id: int, citations: list[dict]):
+    """메시지의 citation 목록을 청크 테이블(중복 제거) + 참조 테이블로 저장"""
+    for position, citation in enumerate(citations or []):
+        digest = chunk_hash(citation)
+        conn.execute(
+            "INSERT OR IGNORE INTO citation_chunks (hash, title, uri, text) VALUES (?, ?, ?, ?)",
+            (digest, citation.get("title", ""), citation.get("uri", ""), citation.get("text")),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO message_citations (message_id, position, chunk_hash) VALUES (?, ?, ?)",
+            (message_id, position, digest),
+        )
+
+
+def load_citations(
+    conn: sqlite3.Connection,
+    message_ids: list[int],
+    with_text: bool = False,
+) -> dict[int, list[dict]]:
+    """
+    메시지별 citation 목록 조회.
+    with_text=False면 청크 본문 없이 id/title/uri만 반환 (본문은 get_chunk로 개별 조회).
+    """
+    if not message_ids:
+        return {}
+    placeholders = ",".join("?" * len(message_ids))
+    text_col = ", c.text" if with_text else ""
+    rows = conn.execute(
+        f"""SELECT mc.message_id, c.hash, c.title, c.uri{text_col}
+        FROM message_citations mc JOIN citation_chunks c ON mc.chunk_hash = c.hash
+        WHERE mc.message_id IN ({placeholders})
+        ORDER BY mc.message_id, mc.position""",
+        message_ids,
+    ).fetchall()
+
+    result: dict[int, list[dict]] = {}
+    for r in rows:
+        citation = {"id": r["hash"], "title": r["title"], "uri": r["uri"]}
+        if with_text:
+            citation["text"] = r["text"]
+        result.setdefault(r["message_id"], []).append(citation)
+    return result
+
+
+def get_chunk(conn: sqlite3.Connection, digest: str) -> dict | None:
+    row = conn.execute(
+        "SELECT hash AS id, title, uri, text FROM citation_chunks WHERE hash = ?", (digest,)
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def delete_orphan_chunks(conn: sqlite3.Connection) -> int:
+    """어떤 메시지에서도 참조하지 않는 청크 삭제"""
+    cur = conn.execute(
+        "DELETE FROM citation_chunks WHERE hash NOT IN (SELECT chunk_hash FROM message_citations)"
+    )
+    return cur.rowcount
+
+
+def migrate_legacy_citations(conn: sqlite3.Connection) -> int:
+    """
+    messages.citations(JSON 문자열)에 남아 있는 기존 데이터를 청크 테이블로 이전.
+    이전한 행은 citations를 NULL로 비우므로 여러 번 실행해도 안전하다.
+    JSON이 아니거나 목록이 아닌 값(null, 문자열, 객체)과 dict가 아닌 항목은 건너뛰고 건수만 기록한다.
+    """
+    rows = conn.execute(
+        "SELECT id, citations FROM messages WHERE citations IS NOT NULL"
+    ).fetchall()
+    skipped_rows = skipped_items = 0
+    for r in rows:
+        try:
+            citations = json.loads(r["citations"])
+        except json.JSONDecodeError:
+            citations = None
+        if isinstance(citations, list):
+            valid = [c for c in citations if isinstance(c, dict)]
+            skipped_items += len(citations) - len(valid)
+            save_citations(conn, r["id"], valid)
+        else:
+            skipped_rows += 1
+        conn.execute("UPDATE messages SET citations = NULL WHERE id = ?", (r["id"],))
+    if skipped_rows or skipped_items:
+        print(f"⚠️ citation 이전: 형식이 잘못된 메시지 {skipped_rows}건, 항목 {skipped_items}개 건너뜀")
+    return len(rows)
@@ -6,6 +6,7 @@ import sqlite3
 from pathlib import Path
 import bcrypt
 import config
+from server.citations import migrate_legacy_citations
 
 
 def hash_password(password: str) -> str:
@@ -44,6 +45,27 @@ CREATE TABLE IF NOT EXISTS messages (
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
+CREATE TABLE IF NOT EXISTS citation_chunks (
+    hash TEXT PRIMARY KEY,
+    title TEXT,
+    uri TEXT,
+    text TEXT
+);
+
+CREATE TABLE IF NOT EXISTS message_citations (
+    message_id INTEGER NOT NULL REFERENCES messages(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    chunk_hash TEXT NOT NULL REFERENCES citation_chunks(hash),
+    PRIMARY KEY (message_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS session_summaries (
+    session_id TEXT PRIMARY KEY REFERENCES sessions(id) ON DELETE CASCADE,
+    summary TEXT NOT NULL,
+    covered_message_id INTEGER NOT NULL,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
 CREATE TABLE IF NOT EXISTS corrections (
     id TEXT PRIMARY KEY,
     session_id TEXT REFERENCES sessions(id),
@@ -75,9 +97,93 @@ CREATE TABLE IF NOT EXISTS documents (
     doc_modified_at DATETIME,
     file_size INTEGER,
     category TEXT,
+    content_hash TEXT,
+    store_doc_name TEXT,
     uploaded_by TEXT REFERENCES users(id),
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
+
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    id TEXT PRIMARY KEY,
+    source TEXT NOT NULL CHECK(source IN ('path', 'client')),
+    store_type TEXT DEFAULT 'primary' CHECK(store_type IN ('primary', 'correction')),
+    version_group TEXT DEFAULT '',
+    status TEXT DEFAULT 'pending' CHECK(status IN ('pending', 'running', 'done', 'failed')),
+    total INTEGER DEFAULT 0,
+    message TEXT,
+    staging_dir TEXT,
+    receiving INTEGER DEFAULT 0,
+    created_by TEXT REFERENCES users(id),
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    started_at DATETIME,
+    finished_at DATETIME
+);
+
+CREATE TABLE IF NOT EXISTS ingest_job_files (
+    job_id TEXT NOT NULL REFERENCES ingest_jobs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    file_name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    status TEXT DEFAULT 'queued' CHECK(status IN ('queued', 'uploading', 'indexing', 'done', 'skipped', 'failed')),
+    operation_name TEXT,
+    error TEXT,
+    content_hash TEXT,
+    file_size INTEGER,
+    meta TEXT,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS resumable_uploads (
+    id TEXT PRIMARY KEY,
+    store_type TEXT DEFAULT 'primary' CHECK(store_type IN ('primary', 'correction')),
+    version_group TEXT DEFAULT '',
+    total_bytes INTEGER NOT NULL,
+    job_id TEXT REFERENCES ingest_jobs(id),
+    created_by TEXT REFERENCES users(id),
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS resumable_files (
+    upload_id TEXT NOT NULL REFERENCES resumable_uploads(id) ON DELETE CASCADE,
+    file_index INTEGER NOT NULL,
+    file_name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    error TEXT,
+    PRIMARY KEY (upload_id, file_index)
+);
+
+CREATE TABLE IF NOT EXISTS resumable_chunks (
+    upload_id TEXT NOT NULL REFERENCES resumable_uploads(id) ON DELETE CASCADE,
+    file_index INTEGER NOT NULL,
+    start_offset INTEGER NOT NULL,
+    end_offset INTEGER NOT NULL,
+    PRIMARY KEY (upload_id, file_index, start_offset)
+);
+
+CREATE TABLE IF NOT EXISTS watch_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    job_id TEXT,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# 기존 DB에 추가해야 하는 컬럼 (테이블, 컬럼, 타입)
+ADDED_COLUMNS = [
+    ("documents", "content_hash", "TEXT"),    # 파일 내용 SHA-256 (업로드 전 중복/변경 판단)
+    ("documents", "store_doc_name", "TEXT"),  # Store 문서 리소스 이름 (교체 시 이전 문서 삭제)
+    ("ingest_jobs", "receiving", "INTEGER DEFAULT 0"),  # 브라우저 업로드 본문 수신 중 여부
+    ("ingest_job_files", "content_hash", "TEXT"),       # 스테이징하며 계산한 SHA-256
+    ("ingest_job_files", "file_size", "INTEGER"),
+    ("ingest_job_files", "meta", "TEXT"),               # 추출한 메타데이터 JSON (원본 없이 재개용)
+]
+
+INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_documents_hash ON documents(store_type, content_hash);
+CREATE INDEX IF NOT EXISTS idx_ingest_jobs_status ON ingest_jobs(status, created_at);
 """
 
 # 기본 시드 계정
@@ -96,11 +202,21 @@ def get_db() -> sqlite3.Connection:
     return conn
 
 
+def _add_missing_columns(conn: sqlite3.Connection):
+    """CREATE TABLE IF NOT EXISTS로는 생기지 않는 신규 컬럼을 기존 테이블에 추가"""
+    for table, column, col_type in ADDED_COLUMNS:
+        existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+
+
 def init_db():
     """테이블 생성 + 시드 데이터 삽입 (최초 1회)."""
     conn = get_db()
     try:
         conn.executescript(SCHEMA_SQL)
+        _add_missing_columns(conn)
+        conn.executescript(INDEX_SQL)
 
         # 시드 사용자 삽입 (이미 있으면 무시)
         for uid, username, password, role in SEED_USERS:
@@ -112,6 +228,11 @@ def init_db():
             except sqlite3.IntegrityError:
                 pass  # 이미 존재하는 계정은 건너뜀
 
+        # 기존 messages.citations JSON → citation_chunks 이전 (이전할 행이 없으면 no-op)
+        migrated = migrate_legacy_citations(conn)
+        if migrated:
+            print(f"📎 기존 메시지 {migrated}건의 citation을 청크 테이블로 이전")
+
         conn.commit()
     finally:
         conn.close()
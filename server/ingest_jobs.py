@@ -0,0 +1,903 @@
+"""
+문서 수집(ingest) 작업 큐
+업로드 요청은 작업만 등록하고 즉시 job id를 반환. 워커 스레드가 SQLite에 기록된 작업을 꺼내
+해시 비교 → 업로드 → 인덱싱 대기 → 메타데이터 등록을 파일 단위로 진행하고 상태를 기록한다.
+새 문서의 카테고리는 작업의 업로드가 끝난 뒤 한 번에 일괄 분류한다.
+브라우저 업로드는 요청 본문을 받는 대로 파일 단위로 스테이징하며, 다 받은 파일부터 바로 처리한다.
+전송이 끝난 파일은 operation 이름을 저장해 두므로, 서버가 재시작되면 다시 보내지 않고 인덱싱 확인부터 이어간다.
+"""
+import fcntl
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+import olefile
+from python_multipart.multipart import MultipartParser, parse_options_header
+from google.genai import types
+from core import rate_limiter, resilience
+from core.document_uploader import MIME_MAP, file_sha256, upload_files
+from core.gemini_client import get_client
+from core.store_manager import get_or_create_store, get_store_documents
+from core.store_manager import delete_document as delete_store_document
+from server.database import get_db
+import config
+
+# 더 이상 진행하지 않는 파일 상태
+FINAL_FILE_STATUSES = ("done", "skipped", "failed")
+# 업로드 대상 Store 종류 (documents/ingest_jobs의 CHECK 제약과 같음)
+STORE_TYPES = ("primary", "correction")
+
+_wake = threading.Condition()
+_claim_lock = threading.Lock()
+_stop_event = threading.Event()
+_workers: list[threading.Thread] = []
+# 업로드 워커 실행권: DB 옆 잠금 파일의 배타 잠금 (DB 경로, 열린 파일). 프로세스가 끝나면 OS가 해제한다.
+_worker_lock: tuple[Path, object] | None = None
+
+
+def _extract_metadata_and_group(filename: str, file_path: Path | None = None) -> dict:
+    """
+    파일명과 파일 속성/내부 메타데이터에서 정보를 추출.
+    file_path를 주면 파일 속성은 그 경로(예: 스테이징 사본)에서, 그룹/날짜는 원본 파일명에서 추출.
+    반환: {
+        "version_group": str,
+        "version_date": str,
+        "doc_created_at": datetime,
+        "doc_modified_at": datetime,
+        "file_size": int
+    }
+    """
+    file_path = file_path or Path(filename)
+    stem = Path(filename).stem
+    
+    meta = {
+        "version_group": stem,
+        "version_date": "",
+        "doc_created_at": None,
+        "doc_modified_at": None,
+        "file_size": 0
+    }
+
+    # 1. 파일명에서 version_group 추출 (숫자와 구분자 제거)
+    group = re.sub(r'[-_.]?\d{4}[-_.]?\d{2}[-_.]?\d{2}[-_.]?', '', stem).strip('_.- ')
+    if group:
+        meta["version_group"] = group
+    
+    # 파일이 로컬에 실제로 존재하는지 확인
+    if not file_path.exists():
+        return meta
+        
+    # 2. 파일 크기 및 기본 OS 시간 추출 (Fallback)
+    stat = os.stat(file_path)
+    meta["file_size"] = stat.st_size
+    meta["doc_modified_at"] = datetime.fromtimestamp(stat.st_mtime)
+    meta["doc_created_at"] = datetime.fromtimestamp(stat.st_ctime)
+    
+    # OS 시간 중 최신 날짜를 기본 version_date 후보로 설정
+    best_dt = max(meta["doc_modified_at"], meta["doc_created_at"])
+
+    # 3. HWP 파일인 경우 OLE 내부 메타데이터 추출 우선 적용
+    if file_path.suffix.lower() == ".hwp" and olefile.isOleFile(file_path):
+        try:
+            with olefile.OleFileIO(file_path) as ole:
+                # \x05는 SummaryInformation 스트림의 시작 문자
+                if ole.exists("\x05HwpSummaryInformation"):
+                    props = ole.getproperties("\x05HwpSummaryInformation")
+                    
+                    # 속성 ID 12 (Create Time)
+                    if 12 in props and isinstance(props[12], datetime):
+                        meta["doc_created_at"] = props[12]
+                        best_dt = props[12]
+                        
+                    # 속성 ID 13 (Last Save Time)
+                    if 13 in props and isinstance(props[13], datetime):
+                        meta["doc_modified_at"] = props[13]
+                        if props[13] > best_dt:
+                            best_dt = props[13]
+        except Exception as e:
+            print(f"HWP 메타데이터 추출 실패 ({filename}): {e}")
+            
+    # 최종 결정된 날짜로 version_date 생성 (YYYYMMDD)
+    meta["version_date"] = best_dt.strftime("%Y%m%d")
+    
+    # 파일명 자체에 명시적 날짜 패턴이 있다면 그것을 version_date로 우선 시도 고려(기존 동작 유지성격)
+    m = re.search(r'(\d{4})[-_.]?(\d{2})[-_.]?(\d{2})', stem)
+    if m:
+        meta["version_date"] = f"{m.group(1)}{m.group(2)}{m.group(3)}"
+
+    return meta
+
+CATEGORIES = ['인사', '재무', '복무', '기획', '보안', '시스템', '기타']
+
+CATEGORY_BATCH_PROMPT = """다음 각 파일명을 보고 [{categories}] 중 가장 적절한 카테고리 하나로 분류해.
+파일 번호를 키로, 카테고리를 값으로 하는 JSON 객체만 출력해. 다른 설명은 하지 마.
+
+{files}
+"""
+
+
+def _classify_batch(stems: list[str]) -> dict[int, str]:
+    """
+    파일명 묶음을 한 번의 호출로 분류 → {묶음 내 위치: 카테고리}.
+    응답은 번호별 CATEGORIES enum으로 제한하고, 빠졌거나 목록에 없는 값은 결과에서 제외 (재시도 대상).
+    """
+    client = get_client()
+    files = "\n".join(f'{i}. "{stem}"' for i, stem in enumerate(stems, 1))
+    schema = types.Schema(
+        type=types.Type.OBJECT,
+        properties={str(i): types.Schema(type=types.Type.STRING, enum=CATEGORIES) for i in range(1, len(stems) + 1)},
+    )
+    # 채팅 등 상위 레인이 대기 중이면 뒤로 밀림. 429 시 retryDelay 동안 전체 호출이 멈춘다.
+    response = resilience.call(
+        lambda timeout: client.models.generate_content(
+            model=config.GEMINI_MODEL,
+            contents=CATEGORY_BATCH_PROMPT.format(categories=", ".join(CATEGORIES), files=files),
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=schema,
+                http_options=resilience.http_options(timeout),
+            ),
+        ),
+        rate_limiter.CATEGORY,
+    )
+    data = json.loads(response.text)
+    if not isinstance(data, dict):
+        return {}
+    return {i - 1: data[str(i)] for i in range(1, len(stems) + 1) if data.get(str(i)) in CATEGORIES}
+
+
+def _predict_categories(filenames: list[str]) -> list[str]:
+    """
+    파일명 기반 카테고리 일괄 분류 (CATEGORY_BATCH_SIZE개씩 한 번의 호출).
+    응답에서 빠졌거나 잘못된 항목만 절반 크기 묶음으로 다시 요청하고, 한 개짜리 묶음까지 실패하면 '기타'.
+    호출 자체가 실패한 묶음은 나눠 보내도 같으므로 그 묶음만 '기타', 업스트림 장애면 남은 분류를 중단하고 '기타'.
+    """
+    stems = [Path(f).stem for f in filenames]
+    categories: list[str | None] = [None] * len(filenames)
+    pending = list(range(len(filenames)))
+    size = max(1, config.CATEGORY_BATCH_SIZE)
+    while pending:
+        misses = []
+        for start in range(0, len(pending), size):
+            batch = pending[start:start + size]
+            try:
+                found = _classify_batch([stems[i] for i in batch])
+            except resilience.UpstreamUnavailable as e:
+                print(f"카테고리 분류 중단 (남은 {len(pending) - start}개 '기타'): {e}")
+                return [c or '기타' for c in categories]
+            except Exception as e:
+                print(f"카테고리 분류 실패 ({len(batch)}개 '기타'): {e}")
+                continue
+            for pos, i in enumerate(batch):
+                if pos in found:
+                    categories[i] = found[pos]
+                else:
+                    misses.append(i)
+        if size == 1:
+            break
+        if misses:
+            print(f"🏷️ 카테고리 누락 {len(misses)}건 → {max(1, size // 2)}개씩 재요청")
+        pending, size = misses, max(1, size // 2)
+    return [c or '기타' for c in categories]
+
+
+def _classify_documents(conn, job_id: str, store_type: str):
+    """
+    작업으로 새로 등록된 문서 중 카테고리가 없는 것을 업로드가 끝난 뒤 한 번에 분류
+    (분류 전에 재시작됐던 작업의 문서도 포함)
+    """
+    docs = conn.execute(
+        """SELECT DISTINCT d.id, d.file_name FROM ingest_job_files f
+        JOIN documents d ON d.store_type = ? AND d.content_hash = f.content_hash
+        WHERE f.job_id = ? AND f.status = 'done' AND d.category IS NULL""",
+        (store_type, job_id),
+    ).fetchall()
+    if not docs:
+        return
+    categories = _predict_categories([d["file_name"] for d in docs])
+    conn.executemany(
+        "UPDATE documents SET category = ? WHERE id = ?",
+        [(category, d["id"]) for category, d in zip(categories, docs)],
+    )
+    conn.commit()
+    print(f"🏷️ 카테고리 분류 {len(docs)}건 완료")
+
+
+def _file_meta(file_name: str, path: Path) -> dict:
+    """_extract_metadata_and_group 결과를 작업 행에 저장할 수 있는 형태로 변환 (날짜는 ISO 문자열)"""
+    meta = _extract_metadata_and_group(file_name, path)
+    for key in ("doc_created_at", "doc_modified_at"):
+        meta[key] = meta[key].isoformat() if meta[key] else None
+    return meta
+
+
+def _plan_upload(conn, file_name: str, content_hash: str, store_type: str, batch_hashes: set) -> dict:
+    """
+    업로드 전에 내용 해시(SHA-256)로 처리 방식 결정.
+    skip: 같은 내용이 이미 있음 / replace: 같은 이름의 내용이 바뀜 / new: 신규 문서
+    해시 도입 전 문서(content_hash 없음)는 내용을 비교할 수 없으므로 replace로 다시 올리고 해시를 채운다.
+    """
+    if content_hash in batch_hashes:
+        return {"action": "skip", "reason": "중복 스킵 (같은 요청에 동일 내용)"}
+
+    same = conn.execute(
+        "SELECT file_name FROM documents WHERE content_hash = ? AND store_type = ?",
+        (content_hash, store_type),
+    ).fetchone()
+    if same:
+        return {"action": "skip", "reason": f"중복 스킵 (동일 내용: {same['file_name']})"}
+
+    existing = conn.execute(
+        "SELECT * FROM documents WHERE file_name = ? AND store_type = ?",
+        (file_name, store_type),
+    ).fetchone()
+    batch_hashes.add(content_hash)
+    return {"action": "replace" if existing else "new", "hash": content_hash, "existing": existing}
+
+
+def _delete_replaced_document(existing, store_name: str, new_document_name: str | None):
+    """내용이 바뀐 문서의 이전 Store 문서 삭제 (새 문서 인덱싱 완료 후 호출)"""
+    old_name = existing["store_doc_name"]
+    if not old_name:
+        # 문서 이름을 기록하기 전에 업로드된 문서 → display_name으로 찾음
+        for doc in get_store_documents(existing["store_name"] or store_name):
+            if doc["display_name"] == existing["display_name"] and doc["name"] != new_document_name:
+                old_name = doc["name"]
+                break
+    if old_name and old_name != new_document_name:
+        try:
+            delete_store_document(old_name)
+        except Exception as e:
+            print(f"⚠️ 이전 Store 문서 삭제 실패 [{existing['file_name']}]: {e}")
+
+
+def _save_document(
+    conn, plan: dict, file_name: str, meta: dict, version_group: str,
+    store_name: str, store_type: str, document_name: str | None, uploaded_by: str,
+):
+    """업로드 성공한 문서의 메타데이터 등록 (replace면 기존 행 갱신, new면 신규 행 추가)"""
+    created_at = meta["doc_created_at"]
+    modified_at = meta["doc_modified_at"]
+
+    if plan["action"] == "replace":
+        existing = plan["existing"]
+        _delete_replaced_document(existing, store_name, document_name)
+        conn.execute(
+            """UPDATE documents SET version_date = ?, store_name = ?, doc_created_at = ?,
+               doc_modified_at = ?, file_size = ?, content_hash = ?, store_doc_name = ?, uploaded_by = ?
+               WHERE id = ?""",
+            (meta["version_date"], store_name, created_at, modified_at, meta["file_size"],
+             plan["hash"], document_name, uploaded_by, existing["id"]),
+        )
+        print(f"🔁 내용 변경 교체 [{file_name}]")
+        return
+
+    # 카테고리는 작업의 업로드가 모두 끝난 뒤 일괄 분류 (_classify_documents)
+    doc_id = f"doc_{uuid.uuid4().hex[:8]}"
+
+    # 같은 version_group의 기존 문서를 is_latest=0으로 갱신
+    conn.execute(
+        "UPDATE documents SET is_latest = 0 WHERE version_group = ? AND store_type = ?",
+        (version_group, store_type),
+    )
+
+    # 새 문서 메타데이터 등록 (확장된 컬럼 포함)
+    conn.execute(
+        """INSERT INTO documents
+        (id, file_name, display_name, version_group, version_date,
+         is_latest, store_name, store_type, 
+         doc_created_at, doc_modified_at, file_size,
+         content_hash, store_doc_name, uploaded_by)
+        VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (doc_id, file_name, file_name, version_group, meta["version_date"],
+         store_name, store_type, created_at, modified_at, meta["file_size"],
+         plan["hash"], document_name, uploaded_by),
+    )
+
+
+# ── 스테이징 공간 ──────────────────────────────────────
+# 받는 중인 파일(partial)과 업로드를 기다리는 파일(staged)의 바이트.
+# 스테이징 사본은 전송이 끝나는 즉시 지우므로, 폴더 전체 크기가 아니라 INGEST_STAGING_MAX_MB 안에서 순환한다.
+
+_staging_cond = threading.Condition()
+_staging = {"partial": 0, "staged": 0, "peak": 0, "waits": 0}
+# 업로드 대기 중인 스테이징 사본: 경로 → (작업 id, 바이트) (반납은 경로당 한 번)
+_staged_files: dict[str, tuple[str, int]] = {}
+_staged_jobs: dict[str, int] = {}  # 작업 id → 업로드 대기 바이트
+
+
+def _reserve_staging(job_id: str, size: int):
+    """
+    받은 데이터를 쓰기 전에 공간 확보. 한도를 넘으면 이 작업의 대기 중인 파일이 전송돼 반납될 때까지 기다림
+    (요청 본문을 읽지 않으므로 클라이언트 전송도 함께 느려진다). 이 작업에 반납될 파일이 없으면 한도를 넘어도 진행.
+    다른 작업의 파일은 기다리지 않는다: 워커가 모두 수신 중인 작업에 묶여 있으면 아직 맡지 않은 작업의 파일은
+    반납되지 않으므로, 그 파일을 기다리면 서로 기다리며 멈춘다.
+    """
+    limit = config.INGEST_STAGING_MAX_MB * 1024 * 1024
+
+    def must_wait() -> bool:
+        # 워커가 다른 프로세스에 있으면 반납 통지를 받을 수 없으므로 기다리지 않음
+        return (
+            _staging["partial"] + _staging["staged"] + size > limit
+            and _staged_jobs.get(job_id, 0) > 0
+            and bool(_workers)
+        )
+
+    with _staging_cond:
+        if must_wait():
+            _staging["waits"] += 1
+            while must_wait():
+                _staging_cond.wait()
+        _staging["partial"] += size
+        _staging["peak"] = max(_staging["peak"], _staging["partial"] + _staging["staged"])
+
+
+def _add_staged(job_id: str, path: str, size: int):
+    _staged_files[path] = (job_id, size)
+    _staged_jobs[job_id] = _staged_jobs.get(job_id, 0) + size
+    _staging["staged"] += size
+
+
+def _mark_staged(job_id: str, path: Path, size: int):
+    """다 받은 파일: 받는 중 → 업로드 대기로 이동"""
+    with _staging_cond:
+        _staging["partial"] -= size
+        _add_staged(job_id, str(path), size)
+
+
+def _release_partial(size: int):
+    with _staging_cond:
+        _staging["partial"] -= size
+        _staging_cond.notify_all()
+
+
+def staging_stats() -> dict:
+    """스테이징 공간 사용량 (받는 중/업로드 대기 바이트, 최대 동시 사용량, 공간 부족 대기 횟수)"""
+    with _staging_cond:
+        return {**_staging, "staged_files": len(_staged_files), "limit": config.INGEST_STAGING_MAX_MB * 1024 * 1024}
+
+
+def _discard_staged(path: str):
+    """브라우저 업로드의 스테이징 사본 삭제 + 공간 반납 (이미 반납했으면 무시)"""
+    with _staging_cond:
+        entry = _staged_files.pop(path, None)
+        if entry is None:
+            return
+        job_id, size = entry
+        _staged_jobs[job_id] -= size
+        if not _staged_jobs[job_id]:
+            del _staged_jobs[job_id]
+        _staging["staged"] -= size
+        _staging_cond.notify_all()
+    Path(path).unlink(missing_ok=True)
+
+
+# ── 작업 등록 ──────────────────────────────────────────
+
+def wake_workers():
+    """새 작업/파일이 등록됐음을 워커에 알림"""
+    with _wake:
+        _wake.notify_all()
+
+
+def create_job(conn, source: str, store_type: str, version_group: str, user_id: str,
+               files: list[tuple], staging_dir: Path | None = None) -> str:
+    """
+    작업 + 파일 행 등록 (커밋은 호출자가 — 다른 변경과 한 트랜잭션으로 묶을 수 있음).
+    files: [(파일명, 경로, 상태, 에러, 크기)]
+    """
+    job_id = f"job_{uuid.uuid4().hex[:12]}"
+    conn.execute(
+        """INSERT INTO ingest_jobs (id, source, store_type, version_group, total, staging_dir, created_by)
+        VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        (job_id, source, store_type, version_group, len(files),
+         str(staging_dir) if staging_dir else None, user_id),
+    )
+    conn.executemany(
+        """INSERT INTO ingest_job_files (job_id, position, file_name, path, status, error, file_size)
+        VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        [(job_id, pos, name, str(path), status, error, size)
+         for pos, (name, path, status, error, size) in enumerate(files)],
+    )
+    return job_id
+
+
+def submit_path_job(path: Path, store_type: str, version_group: str, user_id: str) -> str:
+    """서버 경로(파일 또는 디렉토리)의 업로드 작업 등록. 유효하지 않은 경로면 ValueError."""
+    if path.is_dir():
+        paths = [f for f in sorted(path.iterdir()) if f.is_file() and f.suffix.lower() in MIME_MAP]
+    elif path.is_file():
+        paths = [path]
+    else:
+        raise ValueError("유효하지 않은 경로입니다")
+
+    conn = get_db()
+    try:
+        job_id = create_job(conn, "path", store_type, version_group, user_id,
+                            [(str(p), p, "queued", None, None) for p in paths])
+        conn.commit()
+    finally:
+        conn.close()
+    wake_workers()
+    return job_id
+
+
+class ClientIntake:
+    """
+    브라우저 multipart 업로드를 받는 대로 파일 단위로 스테이징 (요청 본문 전체를 모아 두지 않음).
+    파일 하나를 다 받으면 해시와 함께 작업에 추가하고 워커를 깨운다 → 나머지 파일을 받는 동안 업로드가 진행된다.
+    store_type/version_group 필드는 파일보다 먼저 와야 한다.
+    feed/finish/close는 블로킹 함수 (스테이징 공간이 차면 대기)이므로 스레드풀에서 호출한다.
+    """
+
+    def __init__(self, content_type: str, user_id: str):
+        _, params = parse_options_header(content_type)
+        if b"boundary" not in params:
+            raise ValueError("multipart/form-data 요청이 아닙니다")
+        self.user_id = user_id
+        self.fields = {"store_type": "primary", "version_group": ""}
+        self.job_id: str | None = None
+        self.staging_dir: Path | None = None
+        self._position = 0
+        self._parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+        self._on_part_begin()
+
+    # ── multipart 콜백 ──
+    def _on_part_begin(self):
+        self._headers: dict[bytes, bytes] = {}
+        self._header_name = b""
+        self._header_value = b""
+        self._field: str | None = None
+        self._field_data = bytearray()
+        self._file = None  # 받는 중인 파일 객체 (거부된 파일이면 None → 데이터 버림)
+        self._file_name = ""
+        self._file_path: Path | None = None
+        self._file_hash = None
+        self._file_size = 0
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_name.lower()] = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if b"filename" in options:
+            self._begin_file(options[b"filename"].decode("utf-8", errors="replace"))
+        else:
+            self._field = options.get(b"name", b"").decode("utf-8", errors="replace")
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._file is not None:
+            chunk = data[start:end]
+            _reserve_staging(self.job_id, len(chunk))
+            self._file.write(chunk)
+            self._file_hash.update(chunk)
+            self._file_size += len(chunk)
+        elif self._field is not None:
+            self._field_data += data[start:end]
+
+    def _on_part_end(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            _mark_staged(self.job_id, self._file_path, self._file_size)
+            self._add_file(self._file_name, self._file_path, "queued", None,
+                           self._file_hash.hexdigest(), self._file_size)
+        elif self._field in self.fields:
+            if self.job_id is not None:
+                raise ValueError(f"{self._field} 필드는 파일보다 먼저 보내야 합니다")
+            value = self._field_data.decode("utf-8")
+            if self._field == "store_type" and value not in STORE_TYPES:
+                raise ValueError(f"store_type은 {' 또는 '.join(STORE_TYPES)}이어야 합니다")
+            self.fields[self._field] = value
+
+    # ── 작업/파일 등록 ──
+    def _create_job(self):
+        self.job_id = f"job_{uuid.uuid4().hex[:12]}"
+        self.staging_dir = config.INGEST_STAGING_DIR / self.job_id
+        conn = get_db()
+        try:
+            # receiving=1: 파일을 계속 받는 중 → 워커는 남은 파일이 없어도 작업을 끝내지 않고 기다림
+            conn.execute(
+                """INSERT INTO ingest_jobs (id, source, store_type, version_group, staging_dir, receiving, created_by)
+                VALUES (?, 'client', ?, ?, ?, 1, ?)""",
+                (self.job_id, self.fields["store_type"], self.fields["version_group"],
+                 str(self.staging_dir), self.user_id),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _begin_file(self, filename: str):
+        if self.job_id is None:
+            self._create_job()
+        self._file_name = filename
+        # 서브 디렉토리 구조 유지 (스테이징 밖으로 나가는 경로는 거부)
+        target = (self.staging_dir / filename).resolve()
+        if not target.is_relative_to(self.staging_dir.resolve()):
+            self._add_file(filename, target, "failed", "잘못된 파일 경로")
+            return
+        # 지원 파일 확인 (소문자로 확장자 검사)
+        if target.suffix.lower() not in MIME_MAP:
+            self._add_file(filename, target, "failed", "지원하지 않는 확장자")
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        self._file_path = target
+        self._file_hash = hashlib.sha256()
+        self._file = open(target, "wb")
+
+    def _add_file(self, file_name: str, path: Path, status: str, error: str | None,
+                  content_hash: str | None = None, file_size: int | None = None):
+        """파일 행 추가 + 작업 총 개수 갱신 (파일 단위 커밋 후 워커 깨움)"""
+        conn = get_db()
+        try:
+            conn.execute(
+                """INSERT INTO ingest_job_files (job_id, position, file_name, path, status, error, content_hash, file_size)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (self.job_id, self._position, file_name, str(path), status, error, content_hash, file_size),
+            )
+            conn.execute("UPDATE ingest_jobs SET total = total + 1 WHERE id = ?", (self.job_id,))
+            conn.commit()
+            job = conn.execute("SELECT * FROM ingest_jobs WHERE id = ?", (self.job_id,)).fetchone()
+        finally:
+            conn.close()
+        self._position += 1
+        if job["status"] == "failed":
+            # 워커가 작업을 실패 처리함 → 방금 받은 사본도 정리하고 수신 중단
+            _discard_staged(str(path))
+            raise ValueError(job["message"] or "업로드 작업이 실패했습니다")
+        wake_workers()
+
+    # ── 공개 메서드 ──
+    def feed(self, chunk: bytes):
+        """요청 본문 조각 처리"""
+        self._parser.write(chunk)
+
+    def finish(self) -> str:
+        """본문을 다 받은 뒤 호출. 작업 id 반환 (파일이 없으면 ValueError)."""
+        self._parser.finalize()
+        if self.job_id is None:
+            raise ValueError("업로드할 파일이 없습니다")
+        return self.job_id
+
+    def close(self):
+        """받는 중이던 파일 정리 + 수신 종료 표시 (성공/실패와 무관하게 항상 호출)"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._file_path.unlink(missing_ok=True)
+            _release_partial(self._file_size)
+        if self.job_id is not None:
+            conn = get_db()
+            try:
+                conn.execute("UPDATE ingest_jobs SET receiving = 0 WHERE id = ?", (self.job_id,))
+                conn.commit()
+            finally:
+                conn.close()
+            wake_workers()
+
+
+# ── 진행 상황 조회 ─────────────────────────────────────
+
+def _job_summary(conn, job) -> dict:
+    counts = {row["status"]: row["cnt"] for row in conn.execute(
+        "SELECT status, count(*) AS cnt FROM ingest_job_files WHERE job_id = ? GROUP BY status", (job["id"],)
+    )}
+    finished = sum(counts.get(s, 0) for s in FINAL_FILE_STATUSES)
+    return {
+        "job_id": job["id"],
+        "source": job["source"],
+        "store_type": job["store_type"],
+        "status": job["status"],
+        "receiving": bool(job["receiving"]),
+        "message": job["message"],
+        "total": job["total"],
+        "finished": finished,
+        "progress": round(finished / job["total"], 3) if job["total"] else 1.0,
+        "counts": counts,
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+    }
+
+
+def get_job(job_id: str) -> dict | None:
+    """작업 요약 + 파일별 상태"""
+    conn = get_db()
+    try:
+        job = conn.execute("SELECT * FROM ingest_jobs WHERE id = ?", (job_id,)).fetchone()
+        if not job:
+            return None
+        files = conn.execute(
+            "SELECT file_name, status, error, updated_at FROM ingest_job_files WHERE job_id = ? ORDER BY position",
+            (job_id,),
+        ).fetchall()
+        return {**_job_summary(conn, job), "files": [dict(f) for f in files]}
+    finally:
+        conn.close()
+
+
+def list_jobs(limit: int = 20) -> list[dict]:
+    """최근 작업 요약 목록"""
+    conn = get_db()
+    try:
+        jobs = conn.execute("SELECT * FROM ingest_jobs ORDER BY created_at DESC, rowid DESC LIMIT ?", (limit,)).fetchall()
+        return [_job_summary(conn, job) for job in jobs]
+    finally:
+        conn.close()
+
+
+# ── 워커 ───────────────────────────────────────────────
+
+def _set_file(conn, job_id: str, position: int, status: str, error: str | None = None, operation_name: str | None = None):
+    conn.execute(
+        """UPDATE ingest_job_files SET status = ?, error = ?, operation_name = COALESCE(?, operation_name),
+           updated_at = CURRENT_TIMESTAMP WHERE job_id = ? AND position = ?""",
+        (status, error, operation_name, job_id, position),
+    )
+    conn.commit()
+
+
+def _claim_job():
+    """가장 오래된 대기 작업을 running으로 바꾸고 반환 (없으면 None)"""
+    with _claim_lock:
+        conn = get_db()
+        try:
+            job = conn.execute(
+                "SELECT * FROM ingest_jobs WHERE status = 'pending' ORDER BY created_at, rowid LIMIT 1"
+            ).fetchone()
+            if job:
+                # 다른 프로세스(폴더 감시 데몬 --workers)의 워커가 먼저 가져갔으면 건너뜀
+                claimed = conn.execute(
+                    """UPDATE ingest_jobs SET status = 'running', started_at = COALESCE(started_at, CURRENT_TIMESTAMP)
+                    WHERE id = ? AND status = 'pending'""",
+                    (job["id"],),
+                ).rowcount
+                conn.commit()
+                if not claimed:
+                    return None
+            return job
+        finally:
+            conn.close()
+
+
+def _file_facts(conn, row) -> tuple[str, int, dict]:
+    """파일의 내용 해시·크기·메타데이터. 처음 한 번 계산해 작업 행에 저장 → 재시작 후에는 파일 없이도 재개 가능."""
+    if row["content_hash"] and row["meta"]:
+        return row["content_hash"], row["file_size"], json.loads(row["meta"])
+    path = Path(row["path"])
+    content_hash = row["content_hash"] or file_sha256(path)
+    meta = _file_meta(row["file_name"], path)
+    file_size = row["file_size"] if row["file_size"] is not None else meta["file_size"]
+    conn.execute(
+        "UPDATE ingest_job_files SET content_hash = ?, file_size = ?, meta = ? WHERE job_id = ? AND position = ?",
+        (content_hash, file_size, json.dumps(meta, ensure_ascii=False), row["job_id"], row["position"]),
+    )
+    conn.commit()
+    return content_hash, file_size, meta
+
+
+def _run_job(conn, job):
+    """
+    작업 하나를 끝까지 진행. 이미 끝난 파일은 건너뛰고, 전송을 마친 파일은 operation 확인부터 재개.
+    브라우저 업로드는 본문을 받는 동안 도착한 파일을 바로 업로드 대상에 추가한다.
+    """
+    display_name = (
+        config.PRIMARY_STORE_DISPLAY_NAME if job["store_type"] == "primary"
+        else config.CORRECTION_STORE_DISPLAY_NAME
+    )
+    store_name = get_or_create_store(display_name)
+    job_id = job["id"]
+
+    staged = {}   # 경로 → (파일 행, 처리 계획, 메타데이터)
+    resume = {}   # 경로 → 재시작 전에 받은 operation 이름
+    seen = set()  # 이미 가져온 파일 위치
+    batch_hashes = set()
+
+    def next_paths(idle: bool) -> list[str] | None:
+        """새로 도착한 파일을 해시로 중복/변경/신규 판단한 뒤 업로드할 경로 반환 (더 올 파일이 없으면 None)"""
+        # 수신 여부를 먼저 읽어야 마지막 파일을 놓치지 않음
+        receiving = conn.execute("SELECT receiving FROM ingest_jobs WHERE id = ?", (job_id,)).fetchone()[0]
+        rows = [row for row in conn.execute(
+            f"""SELECT * FROM ingest_job_files WHERE job_id = ? AND status NOT IN ({",".join("?" * len(FINAL_FILE_STATUSES))})
+            ORDER BY position""",
+            (job_id, *FINAL_FILE_STATUSES),
+        ).fetchall() if row["position"] not in seen]
+        if not rows:
+            if not receiving:
+                return None
+            if idle:
+                with _wake:
+                    _wake.wait(timeout=1)
+            return []
+
+        paths = []
+        for row in rows:
+            seen.add(row["position"])
+            try:
+                content_hash, _, meta = _file_facts(conn, row)
+            except OSError as e:
+                _set_file(conn, job_id, row["position"], "failed", f"파일을 읽을 수 없습니다: {e}")
+                _discard_staged(row["path"])
+                continue
+            plan = _plan_upload(conn, row["file_name"], content_hash, job["store_type"], batch_hashes)
+            if plan["action"] == "skip":
+                print(f"⏭️ {plan['reason']} [{row['file_name']}]")
+                _set_file(conn, job_id, row["position"], "skipped", plan["reason"])
+                _discard_staged(row["path"])
+                continue
+            staged[row["path"]] = (row, plan, meta)
+            if row["status"] == "indexing" and row["operation_name"]:
+                resume[row["path"]] = row["operation_name"]
+            else:
+                _set_file(conn, job_id, row["position"], "uploading")
+            paths.append(row["path"])
+        return paths
+
+    def on_sent(path: str, operation_name: str):
+        # operation 이름을 먼저 기록 → 인덱싱 대기 중 재시작돼도 재전송하지 않음. 스테이징 사본은 바로 반납.
+        _set_file(conn, job_id, staged[path][0]["position"], "indexing", operation_name=operation_name)
+        _discard_staged(path)
+
+    def on_result(res: dict):
+        # 파일 하나가 끝날 때마다 메타데이터 등록 + 상태 기록 (파일 단위 커밋)
+        row, plan, meta = staged[res["file"]]
+        _discard_staged(row["path"])
+        if not res["success"]:
+            print(f"⚠️ 업로드 실패 [{row['file_name']}]: {res.get('error', '알 수 없는 오류')}")
+            _set_file(conn, job_id, row["position"], "failed", res["error"])
+            return
+        # 사용자가 version_group을 명시했으면 그것을 사용
+        version_group = job["version_group"].strip() or meta["version_group"]
+        _save_document(
+            conn, plan, row["file_name"], meta, version_group,
+            store_name, job["store_type"], res["document_name"], job["created_by"],
+        )
+        _set_file(conn, job_id, row["position"], "done")
+
+    # 필요한 파일만 동시 업로드 (인덱싱 대기는 공용 폴러가 함께 확인)
+    upload_files([], store_name, on_result=on_result, on_sent=on_sent, resume=resume, more=next_paths)
+    # 새 문서 카테고리는 파일마다가 아니라 한 번에 일괄 분류
+    _classify_documents(conn, job_id, job["store_type"])
+
+    job = conn.execute("SELECT * FROM ingest_jobs WHERE id = ?", (job_id,)).fetchone()
+    counts = {r["status"]: r["cnt"] for r in conn.execute(
+        "SELECT status, count(*) AS cnt FROM ingest_job_files WHERE job_id = ? GROUP BY status", (job_id,)
+    )}
+    success_count = counts.get("done", 0) + counts.get("skipped", 0)
+    msg = f"{success_count}/{job['total']}개 파일 업로드 완료"
+    if counts.get("skipped"):
+        msg += f" (중복 스킵 {counts['skipped']}건)"
+    if counts.get("failed"):
+        failed = conn.execute(
+            "SELECT file_name, error FROM ingest_job_files WHERE job_id = ? AND status = 'failed' ORDER BY position LIMIT 3",
+            (job_id,),
+        ).fetchall()
+        msg += f" (실패 {counts['failed']}건: {'; '.join(f'{r[0]}: {r[1]}' for r in failed)})"
+    return msg
+
+
+def _finish_job(conn, job, status: str, message: str):
+    conn.execute(
+        "UPDATE ingest_jobs SET status = ?, message = ?, finished_at = CURRENT_TIMESTAMP WHERE id = ?",
+        (status, message, job["id"]),
+    )
+    conn.commit()
+    if job["staging_dir"]:
+        # 실패로 끝난 작업에 남은 스테이징 사본의 공간 반납 후 디렉토리 삭제
+        for row in conn.execute("SELECT path FROM ingest_job_files WHERE job_id = ?", (job["id"],)).fetchall():
+            _discard_staged(row["path"])
+        shutil.rmtree(job["staging_dir"], ignore_errors=True)
+
+
+def _worker():
+    while not _stop_event.is_set():
+        job = _claim_job()
+        if job is None:
+            with _wake:
+                _wake.wait(timeout=5)
+            continue
+
+        conn = get_db()
+        try:
+            message = _run_job(conn, job)
+            _finish_job(conn, job, "done", message)
+            print(f"📦 업로드 작업 완료 [{job['id']}]: {message}")
+        except Exception as e:
+            print(f"⚠️ 업로드 작업 실패 [{job['id']}]: {e}")
+            _finish_job(conn, job, "failed", f"작업 실패: {e}")
+        finally:
+            conn.close()
+
+
+def _acquire_worker_lock() -> bool:
+    """
+    이 DB의 업로드 워커 실행권 확보 (이미 가졌으면 True, 다른 프로세스가 가졌으면 False).
+    한 DB의 워커는 한 프로세스에서만 돌아야 진행 중 작업 재개·스테이징 공간 반납이 맞는다.
+    """
+    global _worker_lock
+    lock_path = Path(f"{config.DB_PATH}.workers.lock")
+    if _worker_lock and _worker_lock[0] == lock_path:
+        return True
+    lock_file = open(lock_path, "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return False
+    if _worker_lock:
+        _worker_lock[1].close()
+    _worker_lock = (lock_path, lock_file)
+    return True
+
+
+def start_workers() -> bool:
+    """
+    워커 스레드 시작. 이전 프로세스에서 진행 중이던 작업은 대기 상태로 되돌려 이어서 처리
+    (인덱싱 중이던 파일은 저장된 operation 이름으로 확인만 재개).
+    다른 프로세스가 이미 이 DB의 워커를 돌리고 있으면 작업을 건드리지 않고 False 반환
+    (그 프로세스의 진행 중 작업을 대기로 되돌리면 두 번 처리된다).
+    """
+    if _workers:
+        return True
+    if not _acquire_worker_lock():
+        return False
+    conn = get_db()
+    try:
+        resumed = conn.execute("UPDATE ingest_jobs SET status = 'pending' WHERE status = 'running'").rowcount
+        # 수신 중이던 요청은 재시작으로 끊겼으므로 받은 파일까지만 처리
+        conn.execute("UPDATE ingest_jobs SET receiving = 0 WHERE receiving = 1")
+        conn.commit()
+        staged = conn.execute(
+            """SELECT f.job_id, f.path, f.file_size FROM ingest_job_files f JOIN ingest_jobs j ON j.id = f.job_id
+            WHERE j.source = 'client' AND f.status IN ('queued', 'uploading')"""
+        ).fetchall()
+    finally:
+        conn.close()
+    if resumed:
+        print(f"🔁 중단된 업로드 작업 {resumed}건 재개")
+
+    with _staging_cond:
+        _staged_files.clear()
+        _staged_jobs.clear()
+        _staging["staged"] = 0
+        for row in staged:
+            if Path(row["path"]).exists():
+                _add_staged(row["job_id"], row["path"], row["file_size"] or 0)
+
+    _stop_event.clear()
+    for i in range(max(1, config.INGEST_WORKERS)):
+        worker = threading.Thread(target=_worker, name=f"ingest-worker-{i}", daemon=True)
+        worker.start()
+        _workers.append(worker)
+    return True
+
+
+def stop_workers():
+    """
+    새 작업을 꺼내지 않도록 종료 신호만 보냄 (진행 중인 작업은 다음 시작 때 재개).
+    워커 실행권은 프로세스가 끝날 때 풀린다 — 남은 작업이 아직 돌고 있는 동안 다른 프로세스가 재개하지 않도록.
+    """
+    _stop_event.set()
+    wake_workers()
+    _workers.clear()
@@ -0,0 +1,257 @@
+"""
+재개 가능한 분할 업로드 (느린 회선의 대용량 폴더 업로드용)
+1) 업로드 생성: 파일 목록(이름, 크기) 등록 → upload_id, 권장 청크 크기
+2) 청크 전송: 파일별 offset 위치에 기록 (순서 무관, 병렬 가능, 같은 구간 재전송 가능)
+3) 수신 구간 조회: 끊긴 뒤 다시 접속하면 빠진 구간만 이어서 전송
+4) 완료: 모든 파일이 다 채워졌으면 업로드 작업(ingest_jobs)으로 등록
+
+청크는 디스크에 쓰고 fsync한 뒤에만 수신 구간으로 기록하므로, 서버가 중간에 죽어도 기록된 구간은 온전하다.
+완료 처리는 작업·파일 행을 한 트랜잭션으로 등록하므로 반쯤 등록된 작업이 생기지 않는다.
+"""
+import os
+import shutil
+import uuid
+from pathlib import Path
+from core.document_uploader import MIME_MAP
+from server import ingest_jobs
+from server.database import get_db
+import config
+
+
+def _upload_dir(upload_id: str) -> Path:
+    return config.RESUMABLE_DIR / upload_id
+
+
+def _file_path(upload_id: str, file_index: int, file_name: str) -> Path:
+    """파일별 기록 위치. 업로드 시 display_name이 되므로 원본 파일명(기본 이름)을 유지."""
+    return _upload_dir(upload_id) / str(file_index) / Path(file_name).name
+
+
+def _merge_ranges(chunks) -> list[list[int]]:
+    """수신 청크 [start, end)들을 겹치거나 맞닿은 구간끼리 병합"""
+    merged: list[list[int]] = []
+    for start, end in sorted((c["start_offset"], c["end_offset"]) for c in chunks):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def max_chunk_bytes() -> int:
+    """청크 1개의 최대 크기 (권장 청크 크기의 2배)"""
+    return config.RESUMABLE_CHUNK_MB * 1024 * 1024 * 2
+
+
+def _is_complete(ranges: list[list[int]], size: int) -> bool:
+    return size == 0 or (len(ranges) == 1 and ranges[0][0] == 0 and ranges[0][1] >= size)
+
+
+def _expire_stale(conn):
+    """완료되지 않은 채 RESUMABLE_EXPIRE_HOURS 동안 갱신이 없는 업로드 정리"""
+    stale = conn.execute(
+        "SELECT id FROM resumable_uploads WHERE job_id IS NULL AND updated_at < datetime('now', ?)",
+        (f"-{config.RESUMABLE_EXPIRE_HOURS} hours",),
+    ).fetchall()
+    for row in stale:
+        conn.execute("DELETE FROM resumable_chunks WHERE upload_id = ?", (row["id"],))
+        conn.execute("DELETE FROM resumable_uploads WHERE id = ?", (row["id"],))
+        shutil.rmtree(_upload_dir(row["id"]), ignore_errors=True)
+    if stale:
+        conn.commit()
+        print(f"🧹 만료된 분할 업로드 {len(stale)}건 정리")
+
+
+def expire_stale():
+    """만료된 분할 업로드 정리 (서버 시작 시 호출 — 새 업로드가 들어오지 않아도 디스크를 비움)"""
+    conn = get_db()
+    try:
+        _expire_stale(conn)
+    finally:
+        conn.close()
+
+
+def create_upload(files: list[dict], store_type: str, version_group: str, user_id: str) -> dict:
+    """
+    분할 업로드 생성. files: [{"name": str, "size": int}]
+    지원하지 않는 확장자는 전송 대상에서 빼고, 완료 시 실패 항목으로 작업에 남긴다.
+    """
+    if not files:
+        raise ValueError("업로드할 파일이 없습니다")
+    if store_type not in ingest_jobs.STORE_TYPES:
+        raise ValueError(f"store_type은 {' 또는 '.join(ingest_jobs.STORE_TYPES)}이어야 합니다")
+    upload_id = f"up_{uuid.uuid4().hex[:16]}"
+    rows = []
+    for index, f in enumerate(files):
+        name, size = f["name"], int(f["size"])
+        if size < 0:
+            raise ValueError(f"잘못된 파일 크기: {name}")
+        error = None if Path(name).suffix.lower() in MIME_MAP else "지원하지 않는 확장자"
+        rows.append((upload_id, index, name, 0 if error else size, error))
+
+    total_bytes = sum(r[3] for r in rows)
+    conn = get_db()
+    try:
+        _expire_stale(conn)
+        in_use = conn.execute(
+            """SELECT COALESCE(SUM(total_bytes), 0) FROM resumable_uploads u
+            WHERE job_id IS NULL OR EXISTS (SELECT 1 FROM ingest_jobs j WHERE j.id = u.job_id AND j.status IN ('pending', 'running'))"""
+        ).fetchone()[0]
+        if in_use + total_bytes > config.RESUMABLE_MAX_MB * 1024 * 1024:
+            raise ValueError("분할 업로드 저장 공간이 부족합니다. 진행 중인 업로드가 끝난 뒤 다시 시도하세요")
+
+        conn.execute(
+            """INSERT INTO resumable_uploads (id, store_type, version_group, total_bytes, created_by)
+            VALUES (?, ?, ?, ?, ?)""",
+            (upload_id, store_type, version_group, total_bytes, user_id),
+        )
+        conn.executemany(
+            "INSERT INTO resumable_files (upload_id, file_index, file_name, size, error) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return get_upload(upload_id)
+
+
+def get_upload(upload_id: str) -> dict | None:
+    """파일별 수신 구간 [[start, end), ...]과 완료 여부"""
+    conn = get_db()
+    try:
+        upload = conn.execute("SELECT * FROM resumable_uploads WHERE id = ?", (upload_id,)).fetchone()
+        if not upload:
+            return None
+        files = conn.execute(
+            "SELECT * FROM resumable_files WHERE upload_id = ? ORDER BY file_index", (upload_id,)
+        ).fetchall()
+        chunks = conn.execute(
+            "SELECT file_index, start_offset, end_offset FROM resumable_chunks WHERE upload_id = ?", (upload_id,)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    by_file: dict[int, list] = {}
+    for c in chunks:
+        by_file.setdefault(c["file_index"], []).append(c)
+
+    result_files = []
+    received_bytes = 0
+    for f in files:
+        ranges = _merge_ranges(by_file.get(f["file_index"], []))
+        received_bytes += sum(end - start for start, end in ranges)
+        result_files.append({
+            "index": f["file_index"],
+            "name": f["file_name"],
+            "size": f["size"],
+            "error": f["error"],
+            "received": ranges,
+            "complete": f["error"] is None and _is_complete(ranges, f["size"]),
+        })
+    return {
+        "upload_id": upload_id,
+        "job_id": upload["job_id"],
+        "chunk_size": config.RESUMABLE_CHUNK_MB * 1024 * 1024,
+        "total_bytes": upload["total_bytes"],
+        "received_bytes": received_bytes,
+        "files": result_files,
+    }
+
+
+def write_chunk(upload_id: str, file_index: int, offset: int, data: bytes) -> list[list[int]]:
+    """
+    파일의 offset 위치에 청크 기록 → fsync 후 수신 구간으로 등록. 해당 파일의 수신 구간 반환.
+    없는 업로드/파일이면 LookupError, 범위를 벗어나거나 이미 완료된 업로드면 ValueError.
+    """
+    conn = get_db()
+    try:
+        upload = conn.execute("SELECT job_id FROM resumable_uploads WHERE id = ?", (upload_id,)).fetchone()
+        f = conn.execute(
+            "SELECT * FROM resumable_files WHERE upload_id = ? AND file_index = ?", (upload_id, file_index)
+        ).fetchone()
+        if not upload or not f:
+            raise LookupError("업로드를 찾을 수 없습니다")
+        if upload["job_id"]:
+            raise ValueError("이미 완료된 업로드입니다")
+        if f["error"]:
+            raise ValueError(f"전송 대상이 아닌 파일입니다: {f['error']}")
+        if offset < 0 or offset + len(data) > f["size"]:
+            raise ValueError(f"청크 범위가 파일 크기를 벗어납니다 (offset={offset}, size={f['size']})")
+        if len(data) > max_chunk_bytes():
+            raise ValueError("청크가 너무 큽니다")
+
+        path = _file_path(upload_id, file_index, f["file_name"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 같은 파일의 다른 구간이 동시에 들어와도 서로 다른 위치에 쓰므로 안전 (pwrite)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            written = 0
+            while written < len(data):
+                written += os.pwrite(fd, data[written:], offset + written)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        # 데이터가 디스크에 남은 뒤에만 수신 구간으로 기록 (중간에 죽으면 클라이언트가 그 구간을 다시 보냄)
+        conn.execute(
+            """INSERT INTO resumable_chunks (upload_id, file_index, start_offset, end_offset) VALUES (?, ?, ?, ?)
+            ON CONFLICT(upload_id, file_index, start_offset) DO UPDATE SET end_offset = MAX(end_offset, excluded.end_offset)""",
+            (upload_id, file_index, offset, offset + len(data)),
+        )
+        conn.execute("UPDATE resumable_uploads SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (upload_id,))
+        conn.commit()
+        chunks = conn.execute(
+            "SELECT start_offset, end_offset FROM resumable_chunks WHERE upload_id = ? AND file_index = ?",
+            (upload_id, file_index),
+        ).fetchall()
+    finally:
+        conn.close()
+    return _merge_ranges(chunks)
+
+
+def finalize(upload_id: str) -> str:
+    """
+    모든 파일이 다 채워졌으면 업로드 작업으로 등록하고 job id 반환 (이미 완료된 업로드면 기존 job id).
+    빠진 구간이 있으면 ValueError.
+    """
+    upload = get_upload(upload_id)
+    if upload is None:
+        raise LookupError("업로드를 찾을 수 없습니다")
+    if upload["job_id"]:
+        return upload["job_id"]
+
+    missing = [f["name"] for f in upload["files"] if f["error"] is None and not f["complete"]]
+    if missing:
+        raise ValueError(f"아직 다 받지 못한 파일 {len(missing)}개: {', '.join(missing[:3])}")
+
+    rows = []
+    for f in upload["files"]:
+        path = _file_path(upload_id, f["index"], f["name"])
+        if f["error"] is None and f["size"] == 0:
+            # 청크가 없는 빈 파일
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+        rows.append((f["name"], path, "failed" if f["error"] else "queued", f["error"], f["size"]))
+
+    conn = get_db()
+    try:
+        info = conn.execute(
+            "SELECT store_type, version_group, created_by FROM resumable_uploads WHERE id = ?", (upload_id,)
+        ).fetchone()
+        # 작업·파일 행 등록과 업로드 완료 표시를 한 트랜잭션으로 처리
+        job_id = ingest_jobs.create_job(
+            conn, "client", info["store_type"], info["version_group"], info["created_by"], rows, _upload_dir(upload_id),
+        )
+        claimed = conn.execute(
+            "UPDATE resumable_uploads SET job_id = ? WHERE id = ? AND job_id IS NULL", (job_id, upload_id)
+        ).rowcount
+        if not claimed:
+            # 동시에 들어온 다른 완료 요청이 먼저 등록함
+            conn.rollback()
+            return conn.execute("SELECT job_id FROM resumable_uploads WHERE id = ?", (upload_id,)).fetchone()[0]
+        conn.execute("DELETE FROM resumable_chunks WHERE upload_id = ?", (upload_id,))
+        conn.commit()
+    finally:
+        conn.close()
+    ingest_jobs.wake_workers()
+    return job_id
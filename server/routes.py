@@ -5,24 +5,26 @@ FastAPI API 라우트
 import json
 import uuid
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import List
-import shutil
-import tempfile
-import os
-import olefile
-import re
+from typing import List, Literal
 from pathlib import Path
 from server.auth import (
     authenticate_user, create_access_token,
     get_current_user, require_admin,
 )
 from server.database import get_db
-from core.query_engine import query, generate_session_title
-from core.store_manager import get_or_create_store, list_stores, get_store_documents
-from core.document_uploader import upload_file as upload_doc, upload_directory
-from feedback.feedback_analyzer import analyze_feedback, generate_correction_text
+from server import ingest_jobs, resumable_uploads
+from server.citations import save_citations, load_citations, get_chunk, delete_orphan_chunks
+from core import answer_cache, metrics, rate_limiter, request_coalescer, resilience
+from core.history_manager import load_history, load_history_async, refresh_summary
+from core.query_engine import query_async, query_stream, fallback_title
+from core import session_titles
+from core.store_manager import list_stores, get_store_documents
+from core.document_uploader import polling_stats, transfer_stats
+from feedback.feedback_analyzer import analyze_feedback_async, generate_correction_text
 from feedback.correction_manager import (
     create_correction, list_corrections, get_stats,
 )
@@ -51,9 +53,18 @@ class RejectRequest(BaseModel):
 
 class UploadRequest(BaseModel):
     path: str  # 파일 또는 디렉토리 경로
-    store_type: str = "primary"  # "primary" 또는 "correction"
+    store_type: Literal["primary", "correction"] = "primary"
     version_group: str = ""  # 기존 문서 그룹명 (신규 버전 연결 시)
 
+class ResumableFile(BaseModel):
+    name: str
+    size: int
+
+class ResumableCreateRequest(BaseModel):
+    files: List[ResumableFile]
+    store_type: Literal["primary", "correction"] = "primary"
+    version_group: str = ""
+
 
 # ── 인증 API ───────────────────────────────────────────
 
@@ -101,8 +112,12 @@ def create_session(current_user: dict = Depends(get_current_user)):
 
 
 @router.get("/sessions/{session_id}")
-def get_session(session_id: str, current_user: dict = Depends(get_current_user)):
-    """특정 세션의 메시지 전체 로드"""
+def get_session(
+    session_id: str,
+    citation_text: bool = False,
+    current_user: dict = Depends(get_current_user),
+):
+    """특정 세션의 메시지 전체 로드 (citation 본문은 citation_text=true일 때만 포함)"""
     conn = get_db()
     try:
         # 세션 소유권 확인
@@ -114,14 +129,20 @@ def get_session(session_id: str, current_user: dict = Depends(get_current_user))
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
 
         messages = conn.execute(
-            "SELECT role, content, citations, created_at FROM messages WHERE session_id = ? ORDER BY created_at",
+            "SELECT id, role, content, created_at FROM messages WHERE session_id = ? ORDER BY id",
             (session_id,),
         ).fetchall()
+        citations = load_citations(conn, [m["id"] for m in messages], with_text=citation_text)
 
         return {
             "session": dict(session),
             "messages": [
-                {**dict(m), "citations": json.loads(m["citations"]) if m["citations"] else []}
+                {
+                    "role": m["role"],
+                    "content": m["content"],
+                    "citations": citations.get(m["id"], []),
+                    "created_at": m["created_at"],
+                }
                 for m in messages
             ],
         }
@@ -129,6 +150,19 @@ def get_session(session_id: str, current_user: dict = Depends(get_current_user))
         conn.close()
 
 
+@router.get("/citations/{chunk_id}")
+def get_citation(chunk_id: str, current_user: dict = Depends(get_current_user)):
+    """citation 청크 본문 조회"""
+    conn = get_db()
+    try:
+        chunk = get_chunk(conn, chunk_id)
+        if not chunk:
+            raise HTTPException(status_code=404, detail="출처 정보를 찾을 수 없습니다")
+        return chunk
+    finally:
+        conn.close()
+
+
 @router.delete("/sessions/{session_id}")
 def delete_session(session_id: str, current_user: dict = Depends(get_current_user)):
     """세션 삭제"""
@@ -138,6 +172,8 @@ def delete_session(session_id: str, current_user: dict = Depends(get_current_use
             "DELETE FROM sessions WHERE id = ? AND user_id = ?",
             (session_id, current_user["user_id"]),
         )
+        # 더 이상 참조되지 않는 citation 청크 정리
+        delete_orphan_chunks(conn)
         conn.commit()
         return {"message": "세션이 삭제되었습니다"}
     finally:
@@ -146,48 +182,40 @@ def delete_session(session_id: str, current_user: dict = Depends(get_current_use
 
 # ── 채팅 API ───────────────────────────────────────────
 
-@router.post("/sessions/{session_id}/chat")
-def chat(session_id: str, req: ChatRequest, current_user: dict = Depends(get_current_user)):
-    """메시지 전송 + AI 응답"""
+def _require_session(session_id: str, user_id: str):
+    """세션 소유권 확인 (없으면 404)"""
     conn = get_db()
     try:
-        # 세션 소유권 확인
         session = conn.execute(
             "SELECT * FROM sessions WHERE id = ? AND user_id = ?",
-            (session_id, current_user["user_id"]),
+            (session_id, user_id),
         ).fetchone()
-        if not session:
-            raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
+    finally:
+        conn.close()
+    if not session:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
+    return session
 
-        # 대화 히스토리 로드
-        history_rows = conn.execute(
-            "SELECT role, content FROM messages WHERE session_id = ? ORDER BY created_at",
-            (session_id,),
-        ).fetchall()
-        history = [{"role": r["role"], "content": r["content"]} for r in history_rows]
 
-        # 사용자 메시지 저장
+def _save_turn(session_id: str, message: str, result: dict, first_turn: bool):
+    """사용자 메시지 + AI 응답 + 출처를 한 트랜잭션으로 저장 (첫 메시지면 축약 제목도 저장)"""
+    conn = get_db()
+    try:
         conn.execute(
             "INSERT INTO messages (session_id, role, content) VALUES (?, 'user', ?)",
-            (session_id, req.message),
+            (session_id, message),
         )
-
-        # RAG 질의 수행
-        result = query(message=req.message, history=history)
-
-        # AI 응답 저장
-        citations_json = json.dumps(result["citations"], ensure_ascii=False) if result["citations"] else None
-        conn.execute(
-            "INSERT INTO messages (session_id, role, content, citations) VALUES (?, 'assistant', ?, ?)",
-            (session_id, result["answer"], citations_json),
+        cur = conn.execute(
+            "INSERT INTO messages (session_id, role, content) VALUES (?, 'assistant', ?)",
+            (session_id, result["answer"]),
         )
+        save_citations(conn, cur.lastrowid, result["citations"])
 
-        # 첫 메시지면 세션 제목 자동 생성
-        if not history:
-            title = generate_session_title(req.message)
+        # 첫 메시지면 축약 제목을 먼저 저장 (AI 제목은 응답 전송 후 생성)
+        if first_turn:
             conn.execute(
                 "UPDATE sessions SET title = ? WHERE id = ?",
-                (title, session_id),
+                (fallback_title(message), session_id),
             )
 
         # 세션 updated_at 갱신
@@ -195,75 +223,183 @@ def chat(session_id: str, req: ChatRequest, current_user: dict = Depends(get_cur
             "UPDATE sessions SET updated_at = ? WHERE id = ?",
             (datetime.now(timezone.utc).isoformat(), session_id),
         )
-
         conn.commit()
+    finally:
+        conn.close()
 
-        return {
+
+@router.post("/sessions/{session_id}/chat")
+async def chat(
+    session_id: str,
+    req: ChatRequest,
+    background_tasks: BackgroundTasks,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    메시지 전송 + AI 응답 (Gemini 호출은 await — 워커 스레드를 점유하지 않음).
+    SQLite 조회·저장은 스레드풀에서 실행해 busy timeout 대기가 이벤트 루프를 막지 않게 한다.
+    """
+    await run_in_threadpool(_require_session, session_id, current_user["user_id"])
+
+    # 대화 히스토리 로드 (최근 N턴 원문 + 이전 대화 요약)
+    with metrics.stage(metrics.DB_LOAD_HISTORY):
+        history = await load_history_async(session_id)
+
+    # RAG 질의 수행
+    # (await 동안 쓰기 트랜잭션을 잡지 않도록 DB 저장은 응답 수신 후 한 번에 수행)
+    session_titles.note_activity()
+    try:
+        result = await query_async(message=req.message, history=history)
+    except resilience.UpstreamUnavailable as e:
+        # 재시도/데드라인 소진 또는 서킷 open → 잠시 후 재시도하도록 503 반환
+        raise HTTPException(status_code=503, detail=f"AI 응답 서버가 일시적으로 응답하지 않습니다: {e}")
+
+    with metrics.stage(metrics.DB_PERSIST):
+        await run_in_threadpool(_save_turn, session_id, req.message, result, not history)
+
+    if not history:
+        if config.TITLE_BATCH_ENABLED:
+            session_titles.enqueue(session_id, req.message)
+        else:
+            background_tasks.add_task(session_titles.generate_and_save, session_id, req.message)
+    # 원문 창에서 밀려난 대화의 요약 갱신은 응답 전송 후에 (채팅 응답 경로에서 Gemini 호출 제외)
+    background_tasks.add_task(refresh_summary, session_id)
+
+    return {
+        "answer": result["answer"],
+        "citations": result["citations"],
+        "model": result["model"],
+        "fast_path": result["fast_path"],
+    }
+
+
+def _sse(event: str, data) -> str:
+    """Server-Sent Events 프레임 직렬화"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/sessions/{session_id}/chat/stream")
+def chat_stream(session_id: str, req: ChatRequest, current_user: dict = Depends(get_current_user)):
+    """메시지 전송 + AI 응답 스트리밍 (SSE: token → citations → done)"""
+    _require_session(session_id, current_user["user_id"])
+
+    # 대화 히스토리 로드 (최근 N턴 원문 + 이전 대화 요약)
+    with metrics.stage(metrics.DB_LOAD_HISTORY):
+        history = load_history(session_id)
+    session_titles.note_activity()
+
+    persisted = []
+
+    def event_stream():
+        try:
+            for event in query_stream(message=req.message, history=history):
+                if event["type"] == "token":
+                    yield _sse("token", {"text": event["text"]})
+                elif event["type"] == "citations":
+                    yield _sse("citations", event["citations"])
+                elif event["type"] == "done":
+                    result = event
+        except Exception as e:
+            print(f"⚠️ 스트리밍 응답 실패 [{session_id}]: {e}")
+            yield _sse("error", {"detail": "응답 생성 중 오류가 발생했습니다"})
+            return
+
+        # 스트림 종료 후 사용자 메시지 + AI 응답을 한 번에 저장
+        # (StreamingResponse는 청크마다 스레드가 바뀔 수 있으므로 이 단계 안에서 연결을 열고 닫음)
+        with metrics.stage(metrics.DB_PERSIST):
+            _save_turn(session_id, req.message, result, not history)
+
+        persisted.append(True)
+        if not history and config.TITLE_BATCH_ENABLED:
+            session_titles.enqueue(session_id, req.message)
+
+        yield _sse("done", {
             "answer": result["answer"],
-            "citations": result["citations"],
             "model": result["model"],
-        }
-    finally:
-        conn.close()
+            "fast_path": result["fast_path"],
+        })
+
+    async def title_after_stream():
+        # 스트림이 정상 저장된 경우에만 AI 제목 생성
+        if persisted:
+            await session_titles.generate_and_save(session_id, req.message)
+
+    # 스트림 종료 후: 대화 요약 갱신 (+ 첫 메시지면 AI 제목 생성)
+    background = BackgroundTasks()
+    background.add_task(refresh_summary, session_id)
+    if not history and not config.TITLE_BATCH_ENABLED:
+        background.add_task(title_after_stream)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=background,
+    )
 
 
 # ── 피드백 API ─────────────────────────────────────────
 
-@router.post("/feedback")
-def submit_feedback(req: FeedbackRequest, current_user: dict = Depends(get_current_user)):
-    """사용자 피드백 제출 → Gemini 분석 → pending 상태로 저장"""
+def _session_messages(session_id: str) -> list:
     conn = get_db()
     try:
-        # 세션에서 원본 Q&A 추출
-        messages = conn.execute(
-            "SELECT role, content FROM messages WHERE session_id = ? ORDER BY created_at",
-            (req.session_id,),
+        return conn.execute(
+            "SELECT role, content FROM messages WHERE session_id = ? ORDER BY id",
+            (session_id,),
         ).fetchall()
+    finally:
+        conn.close()
 
-        if req.message_index >= len(messages):
-            raise HTTPException(status_code=400, detail="유효하지 않은 메시지 인덱스입니다")
-
-        # 피드백 대상 AI 메시지와 그 직전 사용자 메시지 찾기
-        ai_msg = messages[req.message_index]
-        # 직전 사용자 메시지 찾기
-        original_question = ""
-        for i in range(req.message_index - 1, -1, -1):
-            if messages[i]["role"] == "user":
-                original_question = messages[i]["content"]
-                break
-
-        # Gemini로 피드백 분석
-        analysis = analyze_feedback(
-            original_question=original_question,
-            ai_answer=ai_msg["content"],
-            user_feedback=req.user_feedback,
-        )
 
-        if not analysis:
-            raise HTTPException(status_code=500, detail="피드백 분석에 실패했습니다")
-
-        # 교정 텍스트 생성
-        correction_text = generate_correction_text(analysis)
-
-        # DB에 pending 상태로 저장
-        correction_id = create_correction(
-            session_id=req.session_id,
-            submitted_by=current_user["user_id"],
-            original_question=analysis["original_question"],
-            ai_wrong_answer=analysis["ai_wrong_answer"],
-            user_correction=analysis["user_correction"],
-            extracted_fact=analysis["extracted_fact"],
-            confidence=analysis.get("confidence", 0.5),
-            correction_text=correction_text,
-        )
+@router.post("/feedback")
+async def submit_feedback(req: FeedbackRequest, current_user: dict = Depends(get_current_user)):
+    """사용자 피드백 제출 → Gemini 분석 → pending 상태로 저장 (DB 조회·저장은 스레드풀에서)"""
+    # 세션에서 원본 Q&A 추출
+    messages = await run_in_threadpool(_session_messages, req.session_id)
+
+    if req.message_index >= len(messages):
+        raise HTTPException(status_code=400, detail="유효하지 않은 메시지 인덱스입니다")
+
+    # 피드백 대상 AI 메시지와 그 직전 사용자 메시지 찾기
+    ai_msg = messages[req.message_index]
+    # 직전 사용자 메시지 찾기
+    original_question = ""
+    for i in range(req.message_index - 1, -1, -1):
+        if messages[i]["role"] == "user":
+            original_question = messages[i]["content"]
+            break
+
+    # Gemini로 피드백 분석
+    analysis = await analyze_feedback_async(
+        original_question=original_question,
+        ai_answer=ai_msg["content"],
+        user_feedback=req.user_feedback,
+    )
 
-        return {
-            "correction_id": correction_id,
-            "message": "피드백이 접수되었습니다. 관리자 검토 후 지식 베이스에 반영됩니다.",
-            "analysis": analysis,
-        }
-    finally:
-        conn.close()
+    if not analysis:
+        raise HTTPException(status_code=500, detail="피드백 분석에 실패했습니다")
+
+    # 교정 텍스트 생성
+    correction_text = generate_correction_text(analysis)
+
+    # DB에 pending 상태로 저장
+    correction_id = await run_in_threadpool(
+        create_correction,
+        session_id=req.session_id,
+        submitted_by=current_user["user_id"],
+        original_question=analysis["original_question"],
+        ai_wrong_answer=analysis["ai_wrong_answer"],
+        user_correction=analysis["user_correction"],
+        extracted_fact=analysis["extracted_fact"],
+        confidence=analysis.get("confidence", 0.5),
+        correction_text=correction_text,
+    )
+
+    return {
+        "correction_id": correction_id,
+        "message": "피드백이 접수되었습니다. 관리자 검토 후 지식 베이스에 반영됩니다.",
+        "analysis": analysis,
+    }
 
 
 # ── 관리 API (admin only) ─────────────────────────────
@@ -294,6 +430,43 @@ def admin_reject(correction_id: str, req: RejectRequest, admin: dict = Depends(r
     return result
 
 
+@router.get("/admin/answer_cache")
+def admin_answer_cache_stats(admin: dict = Depends(require_admin)):
+    """답변 캐시 통계 (항목 수, 히트/미스)"""
+    return answer_cache.stats()
+
+
+@router.delete("/admin/answer_cache")
+def admin_purge_answer_cache(admin: dict = Depends(require_admin)):
+    """답변 캐시 전체 비우기"""
+    purged = answer_cache.purge()
+    return {"message": f"답변 캐시 {purged}건을 비웠습니다", "purged": purged}
+
+
+@router.get("/admin/coalescing")
+def admin_coalescing_stats(admin: dict = Depends(require_admin)):
+    """동일 질문 요청 병합 통계 (leader 호출 수, 병합된 요청 수, 대기 타임아웃)"""
+    return request_coalescer.stats()
+
+
+@router.get("/admin/rate_limiter")
+def admin_rate_limiter_stats(admin: dict = Depends(require_admin)):
+    """Gemini 호출 Rate Limiter 현황 (레인별 대기열 길이, 배분 수, 대기 시간)"""
+    return rate_limiter.stats()
+
+
+@router.get("/admin/resilience")
+def admin_resilience_stats(admin: dict = Depends(require_admin)):
+    """Gemini 호출 재시도/데드라인/hedging 통계와 서킷 브레이커 상태"""
+    return resilience.stats()
+
+
+@router.get("/admin/upload_stats")
+def admin_upload_stats(admin: dict = Depends(require_admin)):
+    """업로드 통계: 전송 방식별 횟수·임시 공간 사용량 + 인덱싱 폴러(MIME·크기별 학습된 예상 시간) + 브라우저 업로드 스테이징 공간"""
+    return {"transfer": transfer_stats(), "polling": polling_stats(), "staging": ingest_jobs.staging_stats()}
+
+
 @router.get("/admin/stores")
 def admin_stores(admin: dict = Depends(require_admin)):
     """File Search Store 현황"""
@@ -375,316 +548,108 @@ def admin_store_files(
     }
 
 
-def _extract_metadata_and_group(filename: str) -> dict:
-    """
-    파일명과 파일 속성/내부 메타데이터에서 정보를 추출.
-    반환: {
-        "version_group": str,
-        "version_date": str,
-        "doc_created_at": datetime,
-        "doc_modified_at": datetime,
-        "file_size": int
-    }
-    """
-    file_path = Path(filename)
-    stem = file_path.stem
-    
-    meta = {
-        "version_group": stem,
-        "version_date": "",
-        "doc_created_at": None,
-        "doc_modified_at": None,
-        "file_size": 0
-    }
-
-    # 1. 파일명에서 version_group 추출 (숫자와 구분자 제거)
-    group = re.sub(r'[-_.]?\d{4}[-_.]?\d{2}[-_.]?\d{2}[-_.]?', '', stem).strip('_.- ')
-    if group:
-        meta["version_group"] = group
-    
-    # 파일이 로컬에 실제로 존재하는지 확인
-    if not file_path.exists():
-        return meta
-        
-    # 2. 파일 크기 및 기본 OS 시간 추출 (Fallback)
-    stat = os.stat(file_path)
-    meta["file_size"] = stat.st_size
-    meta["doc_modified_at"] = datetime.fromtimestamp(stat.st_mtime)
-    meta["doc_created_at"] = datetime.fromtimestamp(stat.st_ctime)
-    
-    # OS 시간 중 최신 날짜를 기본 version_date 후보로 설정
-    best_dt = max(meta["doc_modified_at"], meta["doc_created_at"])
+@router.post("/admin/upload")
+def admin_upload(req: UploadRequest, admin: dict = Depends(require_admin)):
+    """서버 경로의 문서 업로드 작업 등록 (원본 또는 교정 Store). 진행 상황은 /admin/jobs/{job_id}로 조회."""
+    try:
+        job_id = ingest_jobs.submit_path_job(Path(req.path), req.store_type, req.version_group, admin["user_id"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ingest_jobs.get_job(job_id)
 
-    # 3. HWP 파일인 경우 OLE 내부 메타데이터 추출 우선 적용
-    if file_path.suffix.lower() == ".hwp" and olefile.isOleFile(file_path):
-        try:
-            with olefile.OleFileIO(file_path) as ole:
-                # \x05는 SummaryInformation 스트림의 시작 문자
-                if ole.exists("\x05HwpSummaryInformation"):
-                    props = ole.getproperties("\x05HwpSummaryInformation")
-                    
-                    # 속성 ID 12 (Create Time)
-                    if 12 in props and isinstance(props[12], datetime):
-                        meta["doc_created_at"] = props[12]
-                        best_dt = props[12]
-                        
-                    # 속성 ID 13 (Last Save Time)
-                    if 13 in props and isinstance(props[13], datetime):
-                        meta["doc_modified_at"] = props[13]
-                        if props[13] > best_dt:
-                            best_dt = props[13]
-        except Exception as e:
-            print(f"HWP 메타데이터 추출 실패 ({filename}): {e}")
-            
-    # 최종 결정된 날짜로 version_date 생성 (YYYYMMDD)
-    meta["version_date"] = best_dt.strftime("%Y%m%d")
-    
-    # 파일명 자체에 명시적 날짜 패턴이 있다면 그것을 version_date로 우선 시도 고려(기존 동작 유지성격)
-    m = re.search(r'(\d{4})[-_.]?(\d{2})[-_.]?(\d{2})', stem)
-    if m:
-        meta["version_date"] = f"{m.group(1)}{m.group(2)}{m.group(3)}"
 
-    return meta
+@router.post("/admin/upload_client")
+async def admin_upload_client(request: Request, admin: dict = Depends(require_admin)):
+    """
+    클라이언트 브라우저에서 폴더/파일 선택으로 업로드 작업 등록 (multipart: store_type, version_group 필드 뒤에 files).
+    본문을 받는 대로 파일 단위로 스테이징하고, 다 받은 파일부터 백그라운드에서 업로드한다.
+    """
+    try:
+        intake = ingest_jobs.ClientIntake(request.headers.get("content-type", ""), admin["user_id"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        async for chunk in request.stream():
+            await run_in_threadpool(intake.feed, chunk)
+        job_id = await run_in_threadpool(intake.finish)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        await run_in_threadpool(intake.close)
+    return await run_in_threadpool(ingest_jobs.get_job, job_id)
 
-# 카테고리 분류 Rate Limit 대응을 위한 딜레이 상수 (초)
-CATEGORY_PREDICT_DELAY = 3  # 분당 20회 제한 준수용
-CATEGORY_MAX_RETRIES = 3    # 429 에러 시 최대 재시도 횟수
 
-def _predict_category(filename: str) -> str:
-    """Gemini를 사용하여 파일명 기반 카테고리 1개 추출 (Rate Limit 자동 재시도)"""
-    import time as _time
-    from google import genai
-    
-    # Rate Limit 준수를 위한 딜레이
-    _time.sleep(CATEGORY_PREDICT_DELAY)
-    
-    for attempt in range(CATEGORY_MAX_RETRIES):
-        try:
-            client = genai.Client(api_key=config.GEMINI_API_KEY)
-            stem = Path(filename).stem
-            prompt = f"다음 파일명을 보고 [인사, 재무, 복무, 기획, 보안, 시스템, 기타] 중 하나의 카테고리로 가장 적절한 단어 1개만 반환해. 부가 설명 절대 금지.\n파일명: {stem}"
-            response = client.models.generate_content(
-                model=config.GEMINI_MODEL,
-                contents=prompt
-            )
-            cat = response.text.strip().replace("'", "").replace('"', '').replace('\n', '')
-            valid_categories = ['인사', '재무', '복무', '기획', '보안', '시스템', '기타']
-            
-            for valid in valid_categories:
-                if valid in cat:
-                    return valid
-            return '기타'
-        except Exception as e:
-            err_str = str(e)
-            # 429 Rate Limit → 대기 후 재시도
-            if '429' in err_str or 'RESOURCE_EXHAUSTED' in err_str:
-                wait_sec = 60  # 기본 대기
-                # API 응답에서 retryDelay 추출 시도
-                import re as _re
-                m = _re.search(r'retryDelay.*?(\d+)', err_str)
-                if m:
-                    wait_sec = int(m.group(1)) + 5
-                print(f"⏳ Rate Limit 도달 ({filename}) — {wait_sec}초 대기 후 재시도 ({attempt+1}/{CATEGORY_MAX_RETRIES})")
-                _time.sleep(wait_sec)
-                continue
-            # 그 외 에러는 포기
-            print(f"카테고리 분류 실패 ({filename}): {e}")
-            return '기타'
-    
-    print(f"카테고리 분류 포기 ({filename}): Rate Limit 재시도 횟수 초과")
-    return '기타'
+@router.post("/admin/resumable")
+def admin_create_resumable(req: ResumableCreateRequest, admin: dict = Depends(require_admin)):
+    """재개 가능한 분할 업로드 생성 → upload_id, 권장 청크 크기, 파일별 수신 구간"""
+    try:
+        return resumable_uploads.create_upload(
+            [{"name": f.name, "size": f.size} for f in req.files], req.store_type, req.version_group, admin["user_id"],
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/admin/upload")
-def admin_upload(req: UploadRequest, admin: dict = Depends(require_admin)):
-    """문서 업로드 (원본 또는 교정 Store) + 문서 메타데이터 등록"""
-    import re
+@router.get("/admin/resumable/{upload_id}")
+def admin_get_resumable(upload_id: str, admin: dict = Depends(require_admin)):
+    """파일별 수신 구간 조회 (끊긴 뒤 빠진 구간만 이어서 보내기 위함)"""
+    upload = resumable_uploads.get_upload(upload_id)
+    if not upload:
+        raise HTTPException(status_code=404, detail="업로드를 찾을 수 없습니다")
+    return upload
 
-    display_name = (
-        config.PRIMARY_STORE_DISPLAY_NAME if req.store_type == "primary"
-        else config.CORRECTION_STORE_DISPLAY_NAME
-    )
-    store_name = get_or_create_store(display_name)
 
-    from pathlib import Path
-    path = Path(req.path)
+@router.put("/admin/resumable/{upload_id}/files/{file_index}")
+async def admin_put_resumable_chunk(
+    upload_id: str, file_index: int, offset: int, request: Request, admin: dict = Depends(require_admin),
+):
+    """청크 전송: 요청 본문(바이트)을 파일의 offset 위치에 기록. 디스크 기록 후 해당 파일의 수신 구간 반환."""
+    # 본문을 메모리에 모으기 전에 크기 제한 확인 (Content-Length가 없거나 틀려도 받는 도중 제한)
+    limit = resumable_uploads.max_chunk_bytes()
+    length = request.headers.get("content-length")
+    if length is not None and (not length.isdigit() or int(length) > limit):
+        raise HTTPException(status_code=413, detail="청크가 너무 큽니다")
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise HTTPException(status_code=413, detail="청크가 너무 큽니다")
+    data = bytes(body)
+    try:
+        received = await run_in_threadpool(resumable_uploads.write_chunk, upload_id, file_index, offset, data)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"index": file_index, "received": received}
 
-    if path.is_dir():
-        results = upload_directory(path, store_name)
-    elif path.is_file():
-        results = [upload_doc(path, store_name)]
-    else:
-        raise HTTPException(status_code=400, detail="유효하지 않은 경로입니다")
 
-    conn = get_db()
+@router.post("/admin/resumable/{upload_id}/finalize")
+def admin_finalize_resumable(upload_id: str, admin: dict = Depends(require_admin)):
+    """모든 파일을 다 받았으면 업로드 작업으로 등록 (다시 호출해도 같은 작업 반환)"""
     try:
-        for r in results:
-            if not r["success"]:
-                continue
-            fname = r["file"]
-            
-            # 중복 방지: 같은 파일명이 이미 DB에 있으면 스킵
-            existing = conn.execute(
-                "SELECT id FROM documents WHERE file_name = ? AND store_type = ?",
-                (fname, req.store_type)
-            ).fetchone()
-            if existing:
-                print(f"⏭️ 중복 스킵 [{fname}]: 이미 DB에 존재")
-                continue
-                
-            meta = _extract_metadata_and_group(fname)
-            
-            # 사용자가 version_group을 명시했으면 그것을 사용
-            version_group = req.version_group.strip() if req.version_group.strip() else meta["version_group"]
-            version_date = meta["version_date"]
-            doc_id = f"doc_{uuid.uuid4().hex[:8]}"
-
-            # AI 카테고리 자동 유추 (실패해도 업로드는 계속 진행)
-            try:
-                category = _predict_category(fname)
-            except Exception:
-                category = None
-
-            # 같은 version_group의 기존 문서를 is_latest=0으로 갱신
-            conn.execute(
-                "UPDATE documents SET is_latest = 0 WHERE version_group = ? AND store_type = ?",
-                (version_group, req.store_type),
-            )
+        job_id = resumable_uploads.finalize(upload_id)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return ingest_jobs.get_job(job_id)
 
-            # 새 문서 메타데이터 등록 (확장된 컬럼 포함)
-            conn.execute(
-                """INSERT INTO documents
-                (id, file_name, display_name, version_group, version_date,
-                 is_latest, store_name, store_type, 
-                 doc_created_at, doc_modified_at, file_size, category,
-                 uploaded_by)
-                VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?)""",
-                (doc_id, fname, fname, version_group, version_date,
-                 store_name, req.store_type, 
-                 meta["doc_created_at"].isoformat() if meta["doc_created_at"] else None,
-                 meta["doc_modified_at"].isoformat() if meta["doc_modified_at"] else None,
-                 meta["file_size"],
-                 category,
-                 admin["user_id"]),
-            )
-        conn.commit()
-    finally:
-        conn.close()
 
-    success_count = sum(1 for r in results if r["success"])
-    return {
-        "message": f"{success_count}/{len(results)}개 파일 업로드 완료",
-        "results": results,
-    }
+@router.get("/admin/jobs")
+def admin_list_jobs(limit: int = 20, admin: dict = Depends(require_admin)):
+    """최근 업로드 작업 목록"""
+    return {"jobs": ingest_jobs.list_jobs(limit)}
 
 
-@router.post("/admin/upload_client")
-def admin_upload_client(
-    files: List[UploadFile] = File(...),
-    store_type: str = Form("primary"),
-    version_group: str = Form(""),
-    admin: dict = Depends(require_admin)
-):
-    """클라이언트 브라우저에서 폴더/파일 선택으로 업로드 처리"""
-    from core.document_uploader import MIME_MAP
-    
-    display_name = (
-        config.PRIMARY_STORE_DISPLAY_NAME if store_type == "primary"
-        else config.CORRECTION_STORE_DISPLAY_NAME
-    )
-    store_name = get_or_create_store(display_name)
-    
-    conn = get_db()
-    results = []
-    
-    with tempfile.TemporaryDirectory() as temp_dir:
-        for f in files:
-            temp_path = Path(temp_dir) / f.filename
-            # 서브 디렉토리 구조 유지
-            temp_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(temp_path, "wb") as buffer:
-                shutil.copyfileobj(f.file, buffer)
-            
-            # 지원 파일 확인 (소문자로 확장자 검사)
-            if temp_path.suffix.lower() not in MIME_MAP:
-                results.append({"success": False, "file": f.filename, "error": "지원하지 않는 확장자"})
-                continue
-            
-            # 중복 방지: 같은 파일명이 이미 DB에 있으면 스킵
-            existing = conn.execute(
-                "SELECT id FROM documents WHERE file_name = ? AND store_type = ?",
-                (f.filename, store_type)
-            ).fetchone()
-            if existing:
-                print(f"⏭️ 중복 스킵 [{f.filename}]: 이미 DB에 존재")
-                results.append({"success": True, "file": f.filename, "error": "중복 스킵"})
-                continue
-                
-            # File search API 업로드
-            res = upload_doc(temp_path, store_name)
-            # 파일 경로를 원본 파일명으로 변경하여 결괏값을 맞춤
-            res["file"] = f.filename 
-            results.append(res)
-            
-            # 업로드 실패 시 서버 로그 출력
-            if not res["success"]:
-                print(f"⚠️ 업로드 실패 [{f.filename}]: {res.get('error', '알 수 없는 오류')}")            
-            if res["success"]:
-                # DB 메타데이터 추출 및 등록 (임시 파일 경로에서 통계 정보 추출)
-                meta = _extract_metadata_and_group(str(temp_path))
-                
-                # 파일명 기반으로 다시 그룹명 추출 (임시 경로 이름이 아닌 원본 파일명 기준)
-                meta["version_group"] = Path(f.filename).stem
-                group = re.sub(r'[-_.]?\d{4}[-_.]?\d{2}[-_.]?\d{2}[-_.]?', '', meta["version_group"]).strip('_.- ')
-                if group:
-                    meta["version_group"] = group
-                    
-                v_group = version_group.strip() if version_group.strip() else meta["version_group"]
-                v_date = meta["version_date"]
-                doc_id = f"doc_{uuid.uuid4().hex[:8]}"
-
-                # AI 카테고리 자동 유추 (실패해도 업로드는 계속 진행)
-                try:
-                    category = _predict_category(f.filename)
-                except Exception:
-                    category = None
-
-                conn.execute(
-                    "UPDATE documents SET is_latest = 0 WHERE version_group = ? AND store_type = ?",
-                    (v_group, store_type),
-                )
-
-                conn.execute(
-                    """INSERT INTO documents
-                    (id, file_name, display_name, version_group, version_date,
-                     is_latest, store_name, store_type, 
-                     doc_created_at, doc_modified_at, file_size, category,
-                     uploaded_by)
-                    VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?)""",
-                    (doc_id, f.filename, f.filename, v_group, v_date,
-                     store_name, store_type, 
-                     meta["doc_created_at"].isoformat() if meta["doc_created_at"] else None,
-                     meta["doc_modified_at"].isoformat() if meta["doc_modified_at"] else None,
-                     meta["file_size"],
-                     category,
-                     admin["user_id"]),
-                )
-        conn.commit()
-            
-    success_count = sum(1 for r in results if r["success"])
-    fail_count = len(results) - success_count
-    
-    # 실패한 파일 목록 구성
-    fail_details = [f"{r['file']}: {r.get('error', '?')}" for r in results if not r["success"]]
-    msg = f"{success_count}/{len(results)}개 파일 전송 완료"
-    if fail_details:
-        msg += f" (실패 {fail_count}건: {'; '.join(fail_details[:3])})"
-    
-    return {
-        "message": msg,
-        "results": results,
-    }
+@router.get("/admin/jobs/{job_id}")
+def admin_get_job(job_id: str, admin: dict = Depends(require_admin)):
+    """업로드 작업 진행 상황 (파일별 상태: queued/uploading/indexing/done/skipped/failed)"""
+    job = ingest_jobs.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return job
+
 
 # ── 문서 관리 API (admin only) ─────────────────────────
 
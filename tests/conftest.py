@@ -0,0 +1,37 @@
+"""
+공용 테스트 픽스처
+Gemini는 호출하지 않는다 (필요한 곳은 monkeypatch로 응답을 대신함). DB는 테스트마다 임시 파일을 쓴다.
+"""
+import pytest
+import config
+from server.database import init_db
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """임시 SQLite DB (스키마 + 시드 계정)와 데이터 디렉토리"""
+    monkeypatch.setattr(config, "DB_PATH", tmp_path / "app.db")
+    monkeypatch.setattr(config, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(config, "INGEST_STAGING_DIR", tmp_path / "ingest_staging")
+    monkeypatch.setattr(config, "RESUMABLE_DIR", tmp_path / "resumable")
+    init_db()
+    return tmp_path / "app.db"
+
+
+@pytest.fixture
+def admin_client(db):
+    """관리자 토큰이 붙은 API 클라이언트 (startup 이벤트·업로드 워커는 실행하지 않음)"""
+    from fastapi.testclient import TestClient
+    from server.app import app
+
+    client = TestClient(app)
+    token = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"}).json()["token"]
+    client.headers["Authorization"] = f"Bearer {token}"
+    return client
+
+
+class FakeResponse:
+    """generate_content 응답 대용 (text만 사용)"""
+
+    def __init__(self, text: str):
+        self.text = text
@@ -0,0 +1,52 @@
+"""카테고리 일괄 분류: 누락 항목만 재요청, 실패한 묶음은 '기타'"""
+import pytest
+import config
+from core import resilience
+from server import ingest_jobs
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    """_classify_batch가 받은 파일명 묶음 기록 (묶음 크기 4)"""
+    monkeypatch.setattr(config, "CATEGORY_BATCH_SIZE", 4)
+    return []
+
+
+def _fake(monkeypatch, calls, respond):
+    def classify(stems):
+        calls.append(stems)
+        return respond(stems)
+    monkeypatch.setattr(ingest_jobs, "_classify_batch", classify)
+
+
+def test_only_omitted_items_are_requested_again(monkeypatch, batches):
+    # 묶음의 마지막 항목은 응답에서 빠뜨림 (한 개짜리 묶음은 정상 응답)
+    _fake(monkeypatch, batches, lambda stems: {
+        pos: "인사" for pos in range(len(stems) if len(stems) == 1 else len(stems) - 1)
+    })
+
+    result = ingest_jobs._predict_categories([f"규정{i}.hwp" for i in range(8)])
+    assert result == ["인사"] * 8
+    assert batches[2:] == [["규정3", "규정7"], ["규정7"]]
+
+
+def test_failed_batch_falls_back_without_splitting(monkeypatch, batches):
+    def respond(stems):
+        if "규정0" in stems:
+            raise ValueError("잘못된 JSON 응답")
+        return {pos: "재무" for pos in range(len(stems))}
+    _fake(monkeypatch, batches, respond)
+
+    result = ingest_jobs._predict_categories([f"규정{i}.hwp" for i in range(8)])
+    assert result == ["기타"] * 4 + ["재무"] * 4
+    assert len(batches) == 2
+
+
+def test_upstream_outage_stops_classification(monkeypatch, batches):
+    def respond(stems):
+        raise resilience.CircuitOpenError("서킷 open")
+    _fake(monkeypatch, batches, respond)
+
+    result = ingest_jobs._predict_categories([f"규정{i}.hwp" for i in range(12)])
+    assert result == ["기타"] * 12
+    assert len(batches) == 1
@@ -0,0 +1,32 @@
+"""기존 messages.citations JSON 이전: 잘못된 형식은 건너뛰고 시작을 막지 않음"""
+import json
+from server.citations import load_citations, migrate_legacy_citations
+from server.database import get_db
+
+
+def _add_message(conn, citations: str) -> int:
+    cur = conn.execute(
+        "INSERT INTO messages (session_id, role, content, citations) VALUES ('s1', 'assistant', '답변', ?)",
+        (citations,),
+    )
+    return cur.lastrowid
+
+
+def test_migration_skips_malformed_legacy_citations(db, capsys):
+    conn = get_db()
+    try:
+        user_id = conn.execute("SELECT id FROM users WHERE username = 'admin'").fetchone()["id"]
+        conn.execute("INSERT INTO sessions (id, user_id) VALUES ('s1', ?)", (user_id,))
+        good = _add_message(conn, json.dumps([{"title": "규정.txt", "uri": "", "text": "본문"}, "깨진 항목", 3]))
+        bad = [_add_message(conn, value) for value in ("null", '"문자열"', '{"title": "규정.txt"}', "{깨진 JSON")]
+
+        assert migrate_legacy_citations(conn) == 5
+        conn.commit()
+
+        citations = load_citations(conn, [good, *bad])
+        assert [c["title"] for c in citations[good]] == ["규정.txt"]
+        assert not any(m in citations for m in bad)
+        assert conn.execute("SELECT count(*) FROM messages WHERE citations IS NOT NULL").fetchone()[0] == 0
+    finally:
+        conn.close()
+    assert "메시지 4건, 항목 2개 건너뜀" in capsys.readouterr().out
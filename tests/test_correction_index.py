@@ -0,0 +1,47 @@
+"""교정 인덱스 게이팅: 인덱스 밖의 교정 Store 문서가 있으면 항상 교정 Store를 검색"""
+import pytest
+import config
+from core import correction_index
+from server.database import get_db
+
+
+@pytest.fixture
+def index(db, monkeypatch):
+    monkeypatch.setattr(config, "CORRECTION_INDEX_ENABLED", True)
+    correction_index.init_index()
+    if not correction_index._available:
+        pytest.skip("FTS5 미지원 SQLite")
+    conn = get_db()
+    conn.execute(
+        """INSERT INTO corrections (id, submitted_by, status, original_question, extracted_fact)
+        VALUES ('corr_1', 'admin_001', 'approved', '연차 휴가는 며칠인가요', '연차 휴가는 15일이다')"""
+    )
+    correction_index.index_correction(conn, "corr_1", "연차 휴가는 며칠인가요", "연차 휴가는 15일이다")
+    conn.commit()
+    conn.close()
+
+
+def _add_correction_document(file_name: str):
+    conn = get_db()
+    conn.execute(
+        """INSERT INTO documents (id, file_name, display_name, version_group, store_name, store_type)
+        VALUES (?, ?, ?, ?, 'fileSearchStores/c', 'correction')""",
+        (f"doc_{file_name}", file_name, file_name, file_name),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_gating_uses_index(index):
+    assert correction_index.has_likely_match("연차 휴가 일수")
+    assert not correction_index.has_likely_match("출장비 정산 방법")
+
+
+def test_approved_correction_file_keeps_gating(index):
+    _add_correction_document("corr_1.txt")
+    assert not correction_index.has_likely_match("출장비 정산 방법")
+
+
+def test_uploaded_correction_document_disables_gating(index):
+    _add_correction_document("출장비_정정공지.pdf")
+    assert correction_index.has_likely_match("출장비 정산 방법")
@@ -0,0 +1,70 @@
+"""인덱싱 폴러: 일시적 조회 오류 재시도"""
+from types import SimpleNamespace
+import httpx
+import pytest
+from core import document_uploader
+
+
+class FakeOperations:
+    """operations.get: 미리 정한 순서대로 예외를 던지거나 operation 반환"""
+
+    def __init__(self):
+        self.outcomes = []
+        self.calls = 0
+
+    def get(self, operation):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def poller(monkeypatch):
+    monkeypatch.setattr(document_uploader, "POLL_INITIAL_INTERVAL", 0.01)
+    monkeypatch.setattr(document_uploader, "POLL_MAX_INTERVAL", 0.02)
+    operations = FakeOperations()
+    monkeypatch.setattr(document_uploader, "get_client", lambda: SimpleNamespace(operations=operations))
+    return document_uploader._IndexPoller(), operations
+
+
+def _track(poller):
+    return poller.track(SimpleNamespace(done=False), "text/plain", 1024)
+
+
+def test_transient_errors_are_retried(poller):
+    poller, operations = poller
+    done = SimpleNamespace(done=True)
+    operations.outcomes = [httpx.ConnectError("reset"), httpx.ReadTimeout("timeout"), done]
+
+    assert _track(poller).result(5) is done
+    assert operations.calls == 3
+    assert poller.stats()["poll_errors"] == 2
+
+
+def test_repeated_errors_fail_the_file(poller):
+    poller, operations = poller
+    operations.outcomes = [httpx.ConnectError("reset")] * document_uploader.POLL_MAX_ERRORS
+
+    with pytest.raises(httpx.ConnectError):
+        _track(poller).result(5)
+    assert operations.calls == document_uploader.POLL_MAX_ERRORS
+
+
+def test_error_count_resets_after_successful_poll(poller):
+    poller, operations = poller
+    pending = SimpleNamespace(done=False)
+    errors = [httpx.ConnectError("reset")] * (document_uploader.POLL_MAX_ERRORS - 1)
+    operations.outcomes = errors + [pending] + errors + [SimpleNamespace(done=True)]
+
+    assert _track(poller).result(5).done
+
+
+def test_non_retryable_error_fails_immediately(poller):
+    poller, operations = poller
+    operations.outcomes = [ValueError("404 NOT_FOUND")]
+
+    with pytest.raises(ValueError):
+        _track(poller).result(5)
+    assert operations.calls == 1
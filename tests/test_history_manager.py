@@ -0,0 +1,86 @@
+"""대화 히스토리: 요약은 응답 경로 밖에서, 임계치 이상일 때만 갱신"""
+import pytest
+import config
+from core import history_manager, query_engine, rate_limiter
+from server.database import get_db
+from tests.conftest import FakeResponse
+
+
+@pytest.fixture
+def session(db, monkeypatch):
+    """메시지 창을 최근 2개로 줄인 세션 하나"""
+    monkeypatch.setattr(config, "HISTORY_MAX_TURNS", 1)
+    conn = get_db()
+    try:
+        user_id = conn.execute("SELECT id FROM users WHERE username = 'admin'").fetchone()["id"]
+        conn.execute("INSERT INTO sessions (id, user_id) VALUES ('s1', ?)", (user_id,))
+        conn.commit()
+    finally:
+        conn.close()
+    return "s1"
+
+
+def _add_turn(session_id: str, question: str, answer: str):
+    conn = get_db()
+    try:
+        conn.executemany(
+            "INSERT INTO messages (session_id, role, content) VALUES (?, ?, ?)",
+            [(session_id, "user", question), (session_id, "assistant", answer)],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def summarize(monkeypatch):
+    """요약 호출을 가로채 lane을 기록"""
+    lanes = []
+
+    def fake_call(fn, lane):
+        lanes.append(lane)
+        return FakeResponse("연차 문의 요약")
+
+    monkeypatch.setattr(history_manager, "get_client", lambda: None)
+    monkeypatch.setattr(history_manager.resilience, "call", fake_call)
+    return lanes
+
+
+def test_load_history_never_calls_gemini(session, summarize, monkeypatch):
+    monkeypatch.setattr(config, "HISTORY_SUMMARY_MIN_CHARS", 1)
+    _add_turn(session, "연차는 며칠?", "15일입니다")
+    _add_turn(session, "반차도 되나요?", "됩니다")
+
+    history = history_manager.load_history(session)
+
+    assert summarize == []
+    assert [m["content"] for m in history] == ["반차도 되나요?", "됩니다"]
+
+
+def test_refresh_summary_waits_for_threshold(session, summarize, monkeypatch):
+    monkeypatch.setattr(config, "HISTORY_SUMMARY_MIN_CHARS", 100)
+    _add_turn(session, "연차는 며칠?", "15일입니다")
+    _add_turn(session, "반차도 되나요?", "됩니다")
+
+    history_manager.refresh_summary(session)
+    assert summarize == []
+
+    _add_turn(session, "가" * 100, "나")
+    _add_turn(session, "병가는?", "진단서가 필요합니다")
+    history_manager.refresh_summary(session)
+    assert summarize == [rate_limiter.SUMMARY]
+
+    history = history_manager.load_history(session)
+    assert history[0] == {"role": "system", "content": "[이전 대화 요약]\n연차 문의 요약"}
+    assert [m["role"] for m in history[1:]] == ["user", "assistant"]
+
+
+def test_summary_goes_to_system_instruction_not_contents():
+    history = [
+        {"role": "system", "content": "[이전 대화 요약]\n연차 문의"},
+        {"role": "user", "content": "반차도 되나요?"},
+        {"role": "assistant", "content": "됩니다"},
+    ]
+    contents = query_engine._build_conversation_contents(history, "병가는?")
+    assert [c.role for c in contents] == ["user", "assistant", "user"]
+    assert query_engine._system_instruction(history).endswith("[이전 대화 요약]\n연차 문의")
@@ -0,0 +1,139 @@
+"""HWP 본문 텍스트 추출: 레코드 파서와 최소 HWP(OLE) 파일"""
+import struct
+import zlib
+import pytest
+from core import hwp_text
+
+PARA_HEADER = 0x10 + 50
+PARA_TEXT = hwp_text._HWPTAG_PARA_TEXT
+
+
+def _record(tag: int, payload: bytes) -> bytes:
+    size = len(payload)
+    if size >= 0xFFF:
+        return struct.pack("<II", tag | (0xFFF << 20), size) + payload
+    return struct.pack("<I", tag | (size << 20)) + payload
+
+
+def _wide_control(code: int) -> bytes:
+    """8 WCHAR를 차지하는 인라인/확장 컨트롤 (코드, 6 WCHAR 정보, 코드)"""
+    return struct.pack("<H", code) + b"\0" * 12 + struct.pack("<H", code)
+
+
+def _paragraph(*pieces) -> bytes:
+    """문자열은 UTF-16LE 본문, bytes는 그대로 (컨트롤). 문단 끝(13) 포함."""
+    body = b"".join(p.encode("utf-16-le") if isinstance(p, str) else p for p in pieces)
+    return _record(PARA_HEADER, b"\0" * 22) + _record(PARA_TEXT, body + struct.pack("<H", 13))
+
+
+# ── 레코드/문단 파서 ──────────────────────────────────
+
+def test_iter_records_reads_normal_and_extended_sizes():
+    long_payload = b"x" * 5000
+    data = _record(PARA_HEADER, b"ab") + _record(PARA_TEXT, long_payload) + _record(0x20, b"")
+    assert list(hwp_text._iter_records(data)) == [(PARA_HEADER, b"ab"), (PARA_TEXT, long_payload), (0x20, b"")]
+
+
+def test_iter_records_stops_at_truncated_header():
+    data = _record(PARA_TEXT, b"ok") + struct.pack("<I", PARA_TEXT | (0xFFF << 20))
+    assert list(hwp_text._iter_records(data)) == [(PARA_TEXT, b"ok")]
+
+
+def test_para_text_skips_controls():
+    payload = (
+        _wide_control(11)  # 표 개체
+        + "제1조".encode("utf-16-le")
+        + _wide_control(9)  # 탭 (8 WCHAR, 텍스트로는 \t)
+        + "목적 😀".encode("utf-16-le")
+        + struct.pack("<HH", 24, 30)  # 하이픈, 묶음 빈칸
+        + "끝".encode("utf-16-le")
+        + struct.pack("<H", 13)
+    )
+    assert hwp_text._para_text(payload) == "제1조\t목적 😀- 끝"
+
+
+# ── HWP 파일 ──────────────────────────────────────────
+
+END, FREE, FATSECT, NOSTREAM = 0xFFFFFFFE, 0xFFFFFFFF, 0xFFFFFFFD, 0xFFFFFFFF
+
+
+def _cfb(streams: list[tuple[str, bytes]]) -> bytes:
+    """FileHeader + BodyText/Section* 스트림만 있는 최소 OLE(CFB v3) 파일.
+    스트림은 미니 스트림 기준(4096바이트) 이상으로 채워 일반 섹터에 둔다."""
+    padded = [data.ljust(max(4096, -(-len(data) // 512) * 512), b"\0") for _, data in streams]
+    # 섹터 0: FAT, 섹터 1~: 디렉토리 (Root, FileHeader, BodyText, Section* 항목 × 128바이트)
+    dir_sectors = -(-(len(streams) + 2) * 128 // 512)
+    fat = [FATSECT] + [k + 1 for k in range(1, dir_sectors)] + [END]
+    starts = []
+    for data in padded:
+        start = len(fat)
+        starts.append(start)
+        count = len(data) // 512
+        fat += [start + k + 1 for k in range(count - 1)] + [END]
+    assert len(fat) <= 128
+    fat += [FREE] * (128 - len(fat))
+
+    def entry(name, kind, child=NOSTREAM, left=NOSTREAM, right=NOSTREAM, start=END, size=0):
+        encoded = name.encode("utf-16-le") + b"\0\0"
+        return (
+            encoded.ljust(64, b"\0") + struct.pack("<HBB", len(encoded), kind, 1)
+            + struct.pack("<III", left, right, child) + b"\0" * 36 + struct.pack("<IQ", start, size)
+        )
+
+    sections = streams[1:]
+    entries = [
+        entry("Root Entry", 5, child=1),
+        entry("FileHeader", 2, left=2, start=starts[0], size=len(padded[0])),
+        entry("BodyText", 1, child=3),
+    ] + [
+        entry(name.split("/")[1], 2, right=4 + k if k + 1 < len(sections) else NOSTREAM,
+              start=starts[1 + k], size=len(padded[1 + k]))
+        for k, (name, _) in enumerate(sections)
+    ]
+    directory = b"".join(entries).ljust(dir_sectors * 512, b"\0")
+    header = (
+        b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\0" * 16 + struct.pack("<HHHHH", 0x3E, 3, 0xFFFE, 9, 6) + b"\0" * 6
+        + struct.pack("<IIIIIIIIII", 0, 1, 1, 0, 4096, END, 0, END, 0, 0) + struct.pack("<I", FREE) * 108
+    )
+    return header + struct.pack("<128I", *fat) + directory + b"".join(padded)
+
+
+def _hwp(path, sections: list[bytes], flags: int = hwp_text._FLAG_COMPRESSED):
+    header = (b"HWP Document File".ljust(32, b"\0") + struct.pack("<II", 0x05000300, flags)).ljust(256, b"\0")
+    streams = [("FileHeader", header)]
+    for k, data in enumerate(sections):
+        if flags & hwp_text._FLAG_COMPRESSED:
+            compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+            data = compressor.compress(data) + compressor.flush()
+        streams.append((f"BodyText/Section{k}", data))
+    path.write_bytes(_cfb(streams))
+    return path
+
+
+def test_extract_text_reads_sections_in_order(tmp_path):
+    path = _hwp(tmp_path / "규정.hwp", [
+        _paragraph("제1조(목적) 이 규정은 연차휴가에 관한 사항을 정한다.") + _paragraph(_wide_control(11), "표 안의 셀"),
+        _paragraph("두 번째 구역 문단"),
+    ])
+    assert hwp_text.extract_text(path) == (
+        "제1조(목적) 이 규정은 연차휴가에 관한 사항을 정한다.\n표 안의 셀\n두 번째 구역 문단\n"
+    )
+
+
+def test_extract_text_uncompressed(tmp_path):
+    path = _hwp(tmp_path / "plain.hwp", [_paragraph("압축하지 않은 본문")], flags=0)
+    assert hwp_text.extract_text(path) == "압축하지 않은 본문\n"
+
+
+def test_extract_text_rejects_distribution_document(tmp_path):
+    path = _hwp(tmp_path / "dist.hwp", [_paragraph("배포용")],
+                flags=hwp_text._FLAG_COMPRESSED | hwp_text._FLAG_DISTRIBUTION)
+    with pytest.raises(ValueError):
+        hwp_text.extract_text(path)
+
+
+def test_extract_text_rejects_non_ole(tmp_path):
+    path = tmp_path / "문서.hwpx"
+    path.write_bytes(b"PK\x03\x04 not an ole file")
+    with pytest.raises(ValueError):
+        hwp_text.extract_text(path)
@@ -0,0 +1,34 @@
+"""업로드 계획: 내용 해시로만 '변경 없음'을 판단"""
+from server import ingest_jobs
+from server.database import get_db
+
+
+def _add_document(conn, content_hash: str | None, file_size: int = 10):
+    conn.execute(
+        """INSERT INTO documents (id, file_name, display_name, version_group, store_name, file_size, content_hash)
+        VALUES ('doc_1', '규정.txt', '규정.txt', '규정', 'stores/primary', ?, ?)""",
+        (file_size, content_hash),
+    )
+    conn.commit()
+
+
+def test_legacy_document_without_hash_is_replaced_even_if_size_matches(db):
+    conn = get_db()
+    try:
+        _add_document(conn, content_hash=None, file_size=10)
+        plan = ingest_jobs._plan_upload(conn, "규정.txt", "new-hash", "primary", set())
+    finally:
+        conn.close()
+    assert plan["action"] == "replace"
+    assert plan["hash"] == "new-hash"
+    assert plan["existing"]["id"] == "doc_1"
+
+
+def test_same_hash_is_skipped(db):
+    conn = get_db()
+    try:
+        _add_document(conn, content_hash="same-hash")
+        plan = ingest_jobs._plan_upload(conn, "다른이름.txt", "same-hash", "primary", set())
+    finally:
+        conn.close()
+    assert plan["action"] == "skip"
@@ -0,0 +1,154 @@
+"""브라우저 업로드 스테이징 공간 한도: 워커 수보다 많은 동시 업로드에서도 멈추지 않아야 함"""
+import os
+import threading
+import time
+import uuid
+import pytest
+import config
+from server import ingest_jobs
+from server.database import get_db
+
+BOUNDARY = "test-boundary"
+
+
+def _fake_upload_files(file_paths, store_name, on_result=None, on_sent=None, resume=None, more=None):
+    """Gemini 없이 도착한 파일을 바로 전송 완료 처리"""
+    while True:
+        paths = more(True)
+        if paths is None:
+            return []
+        for path in paths:
+            on_sent(path, f"operations/{uuid.uuid4().hex}")
+            on_result({"success": True, "file": path, "error": None, "document_name": "documents/test"})
+
+
+@pytest.fixture
+def workers(db, monkeypatch):
+    monkeypatch.setattr(config, "INGEST_WORKERS", 2)
+    monkeypatch.setattr(config, "INGEST_STAGING_MAX_MB", 1)
+    monkeypatch.setattr(ingest_jobs, "get_or_create_store", lambda name: "fileSearchStores/test")
+    monkeypatch.setattr(ingest_jobs, "upload_files", _fake_upload_files)
+    monkeypatch.setattr(ingest_jobs, "_classify_documents", lambda conn, job_id, store_type: None)
+    ingest_jobs.start_workers()
+    yield
+    ingest_jobs.stop_workers()
+
+
+class _Upload:
+    """multipart 본문을 조금씩 흘려 넣는 브라우저 업로드"""
+
+    def __init__(self):
+        self.intake = ingest_jobs.ClientIntake(f"multipart/form-data; boundary={BOUNDARY}", "admin_001")
+        self._feed(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="store_type"\r\n\r\nprimary\r\n--{BOUNDARY}\r\n'.encode()
+        )
+
+    def _feed(self, data: bytes):
+        for i in range(0, len(data), 64 * 1024):
+            self.intake.feed(data[i:i + 64 * 1024])
+
+    def send_file(self, size: int):
+        # 다음 구분자까지 보내야 파일 하나가 끝난 것으로 처리됨
+        head = f'Content-Disposition: form-data; name="files"; filename="{uuid.uuid4().hex}.txt"\r\n\r\n'
+        self._feed(head.encode() + os.urandom(size) + f"\r\n--{BOUNDARY}\r\n".encode())
+
+    def finish(self):
+        try:
+            self._feed(f'Content-Disposition: form-data; name="end"\r\n\r\n\r\n--{BOUNDARY}--\r\n'.encode())
+            self.intake.finish()
+        finally:
+            self.intake.close()
+
+
+def _wait_until(condition, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "시간 초과"
+        time.sleep(0.02)
+
+
+def _status(job_id: str) -> str:
+    conn = get_db()
+    try:
+        return conn.execute("SELECT status FROM ingest_jobs WHERE id = ?", (job_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _in_thread(fn) -> threading.Thread:
+    thread = threading.Thread(target=fn, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_more_uploads_than_workers_do_not_deadlock(workers):
+    # 업로드 A, B: 워커 2개가 각각 맡아 수신 중 상태로 대기
+    a, b = _Upload(), _Upload()
+    a.send_file(100 * 1024)
+    b.send_file(100 * 1024)
+    _wait_until(lambda: _status(a.intake.job_id) == _status(b.intake.job_id) == "running")
+    _wait_until(lambda: ingest_jobs.staging_stats()["staged"] == 0)
+
+    # 업로드 C: 맡을 워커가 없어 받은 파일이 한도 대부분을 차지한 채 남음
+    c = _Upload()
+    c.send_file(600 * 1024)
+    assert _status(c.intake.job_id) == "pending"
+    assert ingest_jobs.staging_stats()["staged"] == 600 * 1024
+
+    def finish_a():
+        a.send_file(600 * 1024)
+        a.finish()
+
+    def finish_b():
+        b.send_file(600 * 1024)
+        b.finish()
+
+    def finish_c():
+        c.send_file(600 * 1024)
+        c.finish()
+
+    threads = [_in_thread(finish_a), _in_thread(finish_b), _in_thread(finish_c)]
+    for thread in threads:
+        thread.join(15)
+    assert not any(thread.is_alive() for thread in threads), "스테이징 공간 대기에서 멈춤"
+
+    for upload in (a, b, c):
+        _wait_until(lambda job_id=upload.intake.job_id: _status(job_id) == "done")
+    assert ingest_jobs.staging_stats()["staged"] == 0
+
+
+@pytest.fixture
+def staging(monkeypatch):
+    """빈 스테이징 계정 (한도 1MB). 반납은 이 프로세스의 워커가 한다고 가정."""
+    monkeypatch.setattr(config, "INGEST_STAGING_MAX_MB", 1)
+    monkeypatch.setattr(ingest_jobs, "_workers", [threading.current_thread()])
+    monkeypatch.setattr(ingest_jobs, "_staging", {"partial": 0, "staged": 0, "peak": 0, "waits": 0})
+    monkeypatch.setattr(ingest_jobs, "_staged_files", {})
+    monkeypatch.setattr(ingest_jobs, "_staged_jobs", {})
+
+
+def _stage(job_id: str, path, size: int):
+    ingest_jobs._reserve_staging(job_id, size)
+    path.write_bytes(b"")
+    ingest_jobs._mark_staged(job_id, path, size)
+
+
+def test_reserve_waits_for_own_staged_files(staging, tmp_path):
+    _stage("job_a", tmp_path / "a1", 900 * 1024)
+    reserved = threading.Event()
+    thread = _in_thread(lambda: (ingest_jobs._reserve_staging("job_a", 200 * 1024), reserved.set()))
+
+    assert not reserved.wait(0.3)
+    ingest_jobs._discard_staged(str(tmp_path / "a1"))
+    assert reserved.wait(5)
+    thread.join(5)
+    assert ingest_jobs.staging_stats()["waits"] == 1
+    assert not (tmp_path / "a1").exists()
+
+
+def test_reserve_ignores_other_jobs_staged_files(staging, tmp_path):
+    _stage("job_c", tmp_path / "c1", 900 * 1024)
+    ingest_jobs._reserve_staging("job_a", 200 * 1024)
+    stats = ingest_jobs.staging_stats()
+    assert stats["waits"] == 0
+    assert stats["partial"] + stats["staged"] == 1100 * 1024
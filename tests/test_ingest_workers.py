@@ -0,0 +1,68 @@
+"""업로드 워커 실행권: 한 DB의 워커는 한 프로세스만 실행"""
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import config
+from server import ingest_jobs
+from server.database import get_db
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def idle_workers(db, monkeypatch):
+    """작업을 꺼내지 않는 워커 (실행권·재개 처리만 확인)"""
+    monkeypatch.setattr(ingest_jobs, "_worker", lambda: None)
+    yield
+    ingest_jobs.stop_workers()
+
+
+def _add_job(status: str) -> str:
+    conn = get_db()
+    try:
+        job_id = ingest_jobs.create_job(conn, "path", "primary", "", "admin_001", [])
+        conn.execute("UPDATE ingest_jobs SET status = ? WHERE id = ?", (status, job_id))
+        conn.commit()
+        return job_id
+    finally:
+        conn.close()
+
+
+def _status(job_id: str) -> str:
+    conn = get_db()
+    try:
+        return conn.execute("SELECT status FROM ingest_jobs WHERE id = ?", (job_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _start_workers_in_other_process() -> str:
+    code = (
+        "import sys, config; from pathlib import Path; config.DB_PATH = Path(sys.argv[1]); "
+        "from server import ingest_jobs; print(ingest_jobs.start_workers())"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code, str(config.DB_PATH)], cwd=ROOT, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip().splitlines()[-1]
+
+
+def test_start_resumes_jobs_of_previous_process(idle_workers):
+    job_id = _add_job("running")
+    assert ingest_jobs.start_workers()
+    assert _status(job_id) == "pending"
+
+
+def test_second_process_does_not_touch_running_jobs(idle_workers):
+    assert ingest_jobs.start_workers()
+    job_id = _add_job("running")
+
+    assert _start_workers_in_other_process() == "False"
+    assert _status(job_id) == "running"
+
+
+def test_lock_is_released_when_process_exits(db):
+    assert _start_workers_in_other_process() == "True"
+    assert _start_workers_in_other_process() == "True"
@@ -0,0 +1,28 @@
+from core import query_engine
+from tests.conftest import FakeResponse
+
+
+def _respond(monkeypatch, text: str):
+    monkeypatch.setattr(query_engine, "get_client", lambda: None)
+    monkeypatch.setattr(query_engine.resilience, "call", lambda fn, lane: FakeResponse(text))
+
+
+def test_titles_batch_uses_numbered_titles(monkeypatch):
+    _respond(monkeypatch, '{"1": "연차 일수", "3": "보안 교육"}')
+    messages = ["연차는 며칠?", "출장비 정산 기한은 언제까지인가요? 영수증은 어디에 제출하나요?", "보안 교육"]
+    titles = query_engine.generate_session_titles_batch(messages)
+    assert titles == ["연차 일수", query_engine.fallback_title(messages[1]), "보안 교육"]
+
+
+def test_titles_batch_falls_back_when_response_is_not_an_object(monkeypatch):
+    messages = ["연차는 며칠?", "재택근무 신청 절차를 알려주세요"]
+    for text in ('["연차", "재택"]', '"연차"', "42", "null"):
+        _respond(monkeypatch, text)
+        assert query_engine.generate_session_titles_batch(messages) == [
+            query_engine.fallback_title(m) for m in messages
+        ]
+
+
+def test_titles_batch_falls_back_on_invalid_json(monkeypatch):
+    _respond(monkeypatch, "제목: 연차")
+    assert query_engine.generate_session_titles_batch(["연차는 며칠?"]) == ["연차는 며칠?"]
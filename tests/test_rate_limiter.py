@@ -0,0 +1,120 @@
+"""Rate Limiter: 레인 우선순위와 디스패처 생존"""
+import asyncio
+import threading
+import time
+import pytest
+import config
+from core import rate_limiter
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    """분당 600회(0.1초에 토큰 1개), 버스트 1. 토큰을 비운 상태에서 시작."""
+    monkeypatch.setattr(config, "GEMINI_RATE_LIMIT_RPM", 600)
+    monkeypatch.setattr(config, "GEMINI_RATE_LIMIT_BURST", 1)
+    with rate_limiter._cond:
+        rate_limiter._tokens = 0.0
+        rate_limiter._last_refill = time.monotonic()
+        rate_limiter._paused_until = 0.0
+    yield
+    with rate_limiter._cond:
+        assert not rate_limiter._queue
+
+
+def _grant_order(waiters: list[rate_limiter._Waiter]) -> list[int]:
+    """토큰을 받은 순서대로 waiter 인덱스를 기록 (0.1초 간격으로 배분되므로 순서가 뒤섞이지 않음)"""
+    order = []
+    lock = threading.Lock()
+
+    def wait(index):
+        assert waiters[index].event.wait(5)
+        with lock:
+            order.append(index)
+
+    threads = [threading.Thread(target=wait, args=(i,)) for i in range(len(waiters))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return order
+
+
+def test_higher_priority_lane_is_granted_first(limiter):
+    waiters = [
+        rate_limiter._Waiter(lane)
+        for lane in (rate_limiter.CATEGORY, rate_limiter.TITLE, rate_limiter.FEEDBACK, rate_limiter.CHAT)
+    ]
+    # 한꺼번에 대기열에 넣어 디스패처가 먼저 들어온 요청부터 꺼내지 못하게 함
+    with rate_limiter._cond:
+        for w in waiters:
+            rate_limiter._enqueue(w)
+
+    assert [waiters[i].lane for i in _grant_order(waiters)] == [
+        rate_limiter.CHAT, rate_limiter.FEEDBACK, rate_limiter.TITLE, rate_limiter.CATEGORY,
+    ]
+
+
+def test_same_lane_is_fifo(limiter):
+    waiters = [rate_limiter._Waiter(rate_limiter.TITLE) for _ in range(3)]
+    with rate_limiter._cond:
+        for w in waiters:
+            rate_limiter._enqueue(w)
+
+    assert _grant_order(waiters) == [0, 1, 2]
+
+
+def test_closed_event_loop_does_not_stop_dispatcher(limiter):
+    loop = asyncio.new_event_loop()
+    orphan = rate_limiter._Waiter(rate_limiter.CHAT, loop)
+    loop.close()
+    follower = rate_limiter._Waiter(rate_limiter.CATEGORY)
+    with rate_limiter._cond:
+        rate_limiter._enqueue(orphan)
+        rate_limiter._enqueue(follower)
+
+    assert follower.event.wait(5)
+    assert rate_limiter._dispatcher.is_alive()
+
+
+def test_slot_timeout_leaves_the_queue(limiter):
+    rate_limiter.report_rate_limited(60)
+    try:
+        start = time.monotonic()
+        with pytest.raises(rate_limiter.Busy):
+            with rate_limiter.slot(rate_limiter.CHAT, timeout=0.2):
+                pass
+        assert time.monotonic() - start < 1
+        with rate_limiter._cond:
+            assert not rate_limiter._queue
+    finally:
+        with rate_limiter._cond:
+            rate_limiter._paused_until = 0.0
+            rate_limiter._cond.notify()
+
+
+def test_aslot_timeout_and_cancel_leave_the_queue(limiter):
+    rate_limiter.report_rate_limited(60)
+
+    async def scenario():
+        with pytest.raises(rate_limiter.Busy):
+            async with rate_limiter.aslot(rate_limiter.CHAT, timeout=0.2):
+                pass
+
+        async def wait_forever():
+            async with rate_limiter.aslot(rate_limiter.TITLE):
+                pass
+
+        task = asyncio.ensure_future(wait_forever())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    try:
+        asyncio.run(scenario())
+        with rate_limiter._cond:
+            assert not rate_limiter._queue
+    finally:
+        with rate_limiter._cond:
+            rate_limiter._paused_until = 0.0
+            rate_limiter._cond.notify()
@@ -0,0 +1,116 @@
+"""동일 질문 요청 병합 (single-flight)"""
+import asyncio
+import threading
+import time
+import pytest
+import config
+from core import request_coalescer
+
+
+@pytest.fixture(autouse=True)
+def follower_timeout(monkeypatch):
+    monkeypatch.setattr(config, "COALESCE_FOLLOWER_TIMEOUT_SECONDS", 5)
+
+
+def _run_concurrently(count: int, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+
+def test_concurrent_calls_share_one_upstream_call():
+    calls = []
+    release = threading.Event()
+    results = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return "answer"
+
+    def request():
+        results.append(request_coalescer.run(("q", "same"), fn))
+
+    threading.Timer(0.2, release.set).start()
+    _run_concurrently(5, request)
+
+    assert len(calls) == 1
+    assert results == ["answer"] * 5
+    assert request_coalescer.stats()["in_flight"] == 0
+
+
+def test_leader_error_is_shared():
+    release = threading.Event()
+    errors = []
+
+    def fn():
+        release.wait(5)
+        raise RuntimeError("upstream down")
+
+    def request():
+        try:
+            request_coalescer.run(("q", "error"), fn)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threading.Timer(0.2, release.set).start()
+    _run_concurrently(3, request)
+
+    assert errors == ["upstream down"] * 3
+
+
+def test_follower_timeout_calls_directly(monkeypatch):
+    monkeypatch.setattr(config, "COALESCE_FOLLOWER_TIMEOUT_SECONDS", 0.1)
+    release = threading.Event()
+    leader_started = threading.Event()
+
+    def slow():
+        leader_started.set()
+        release.wait(5)
+        return "leader"
+
+    leader = threading.Thread(target=lambda: request_coalescer.run(("q", "slow"), slow))
+    leader.start()
+    leader_started.wait(5)
+    try:
+        assert request_coalescer.run(("q", "slow"), lambda: "direct") == "direct"
+    finally:
+        release.set()
+        leader.join(5)
+
+
+def test_async_single_flight():
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "answer"
+
+    async def main():
+        return await asyncio.gather(
+            *(request_coalescer.run_async(("q", "async"), fn) for _ in range(5))
+        )
+
+    assert asyncio.run(main()) == ["answer"] * 5
+    assert len(calls) == 1
+
+
+def test_different_keys_are_not_merged():
+    calls = []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.1)
+        return len(calls)
+
+    threads = [
+        threading.Thread(target=request_coalescer.run, args=(("q", i), fn)) for i in range(3)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert len(calls) == 3
@@ -0,0 +1,216 @@
+"""Gemini 호출 복원력: 서킷 브레이커 상태 전이, 데드라인 안 재시도, 스트리밍 재시도"""
+import time
+import httpx
+import pytest
+import config
+from core import rate_limiter, resilience
+
+
+@pytest.fixture(autouse=True)
+def breaker(monkeypatch):
+    """테스트마다 새 브레이커 (임계치 2회, 0.1초 뒤 half-open), 재시도 대기는 짧게, Rate Limiter 비활성"""
+    monkeypatch.setattr(config, "GEMINI_CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(config, "GEMINI_CIRCUIT_RESET_SECONDS", 0.1)
+    monkeypatch.setattr(config, "GEMINI_MAX_RETRIES", 3)
+    monkeypatch.setattr(config, "GEMINI_RETRY_BASE_DELAY", 0.01)
+    monkeypatch.setattr(config, "GEMINI_RETRY_MAX_DELAY", 0.02)
+    monkeypatch.setattr(config, "GEMINI_RATE_LIMIT_RPM", 0)
+    fresh = resilience._CircuitBreaker()
+    monkeypatch.setattr(resilience, "_breaker", fresh)
+    return fresh
+
+
+def _flaky(failures: int, result="ok"):
+    """처음 failures번은 연결 오류, 이후 result 반환. 호출 횟수는 fn.calls"""
+    def fn(timeout):
+        fn.calls += 1
+        if fn.calls <= failures:
+            raise httpx.ConnectError("connection refused")
+        return result
+    fn.calls = 0
+    return fn
+
+
+# ── 서킷 브레이커 ─────────────────────────────────────
+
+def test_breaker_opens_after_threshold(breaker):
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(resilience.CircuitOpenError):
+        breaker.before_call()
+
+
+def test_half_open_allows_single_probe_then_closes(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    time.sleep(0.15)
+
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    with pytest.raises(resilience.CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_failed_probe_reopens(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    time.sleep(0.15)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(resilience.CircuitOpenError):
+        breaker.before_call()
+
+
+def test_released_probe_lets_next_call_through(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    time.sleep(0.15)
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+    assert breaker.state == "half_open"
+
+
+# ── 데드라인 안 재시도 ────────────────────────────────
+
+def test_retryable_errors_are_retried(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_CIRCUIT_FAILURE_THRESHOLD", 5)
+    fn = _flaky(2)
+    assert resilience.call(fn, rate_limiter.CHAT, deadline=5) == "ok"
+    assert fn.calls == 3
+    assert resilience._breaker.state == "closed"
+
+
+def test_non_retryable_error_is_not_retried():
+    calls = []
+
+    def fn(timeout):
+        calls.append(timeout)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        resilience.call(fn, rate_limiter.CHAT, deadline=5)
+    assert len(calls) == 1
+    assert resilience._breaker.failures == 0
+
+
+def test_retries_stop_at_deadline(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_CIRCUIT_FAILURE_THRESHOLD", 0)
+    monkeypatch.setattr(config, "GEMINI_MAX_RETRIES", 100)
+    monkeypatch.setattr(config, "GEMINI_RETRY_BASE_DELAY", 0.05)
+    monkeypatch.setattr(config, "GEMINI_RETRY_MAX_DELAY", 0.05)
+    fn = _flaky(1000)
+    # 실제 경과 시간 대신 재시도 대기의 예정 종료 시각을 검사 (sleep 지연에 흔들리지 않게)
+    wake_ups = []
+
+    def sleep(delay):
+        wake_ups.append(time.monotonic() + delay)
+        real_sleep(delay)
+
+    real_sleep = time.sleep
+    monkeypatch.setattr(resilience.time, "sleep", sleep)
+
+    start = time.monotonic()
+    with pytest.raises(resilience.DeadlineExceeded):
+        resilience.call(fn, rate_limiter.CHAT, deadline=0.3)
+    assert wake_ups and max(wake_ups) < start + 0.3
+    assert fn.calls > 1
+
+
+def test_attempt_receives_remaining_deadline():
+    timeouts = []
+
+    def fn(timeout):
+        timeouts.append(timeout)
+        if len(timeouts) == 1:
+            raise httpx.ReadTimeout("timed out")
+        return "ok"
+
+    resilience.call(fn, rate_limiter.CHAT, deadline=2)
+    assert timeouts[0] <= 2
+    assert timeouts[1] < timeouts[0]
+
+
+def test_rate_limit_pause_fails_as_busy_within_deadline(monkeypatch, breaker):
+    monkeypatch.setattr(config, "GEMINI_RATE_LIMIT_RPM", 600)
+    rate_limiter.report_rate_limited(60)
+    calls = []
+    try:
+        start = time.monotonic()
+        with pytest.raises(resilience.Busy):
+            resilience.call(lambda timeout: calls.append(timeout), rate_limiter.CHAT, deadline=0.3)
+        assert time.monotonic() - start < 1
+    finally:
+        with rate_limiter._cond:
+            rate_limiter._paused_until = 0.0
+            rate_limiter._cond.notify()
+    assert calls == []
+    assert not breaker.probing
+
+
+def test_open_circuit_fails_fast():
+    fn = _flaky(1000)
+    with pytest.raises(resilience.UpstreamUnavailable):
+        resilience.call(fn, rate_limiter.CHAT, deadline=5)
+    calls = fn.calls
+    with pytest.raises(resilience.CircuitOpenError):
+        resilience.call(fn, rate_limiter.CHAT, deadline=5)
+    assert fn.calls == calls
+
+
+# ── 스트리밍 ──────────────────────────────────────────
+
+def test_stream_retries_before_first_chunk():
+    attempts = []
+
+    def open_stream(timeout):
+        attempts.append(timeout)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("connection refused")
+        yield "안녕"
+        yield "하세요"
+
+    assert list(resilience.stream(open_stream, rate_limiter.CHAT, deadline=5)) == ["안녕", "하세요"]
+    assert len(attempts) == 2
+    assert resilience._breaker.failures == 0
+
+
+def test_stream_does_not_retry_after_first_chunk():
+    attempts = []
+
+    def open_stream(timeout):
+        attempts.append(timeout)
+        yield "안녕"
+        raise httpx.ReadError("connection reset")
+
+    received = []
+    with pytest.raises(httpx.ReadError):
+        for chunk in resilience.stream(open_stream, rate_limiter.CHAT, deadline=5):
+            received.append(chunk)
+    assert received == ["안녕"]
+    assert len(attempts) == 1
+    assert resilience._breaker.failures == 1
+
+
+def test_stream_respects_open_circuit(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    with pytest.raises(resilience.CircuitOpenError):
+        next(resilience.stream(lambda timeout: iter(["x"]), rate_limiter.CHAT))
+
+
+def test_closed_stream_releases_probe(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    time.sleep(0.15)
+    chunks = resilience.stream(lambda timeout: iter(["a", "b"]), rate_limiter.CHAT, deadline=5)
+    assert next(chunks) == "a"
+    chunks.close()
+    assert breaker.state == "half_open" and not breaker.probing
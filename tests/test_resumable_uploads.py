@@ -0,0 +1,140 @@
+"""재개 가능한 분할 업로드: 수신 구간 병합, 완료 처리 멱등성, 입력 검증"""
+import pytest
+import config
+from server import resumable_uploads
+from server.database import get_db
+
+
+def _chunks(*ranges):
+    return [{"start_offset": start, "end_offset": end} for start, end in ranges]
+
+
+def test_merge_ranges_joins_overlapping_and_adjacent():
+    assert resumable_uploads._merge_ranges(_chunks((10, 20), (0, 5), (5, 10), (15, 30), (40, 50))) == [
+        [0, 30], [40, 50],
+    ]
+
+
+def test_merge_ranges_keeps_gaps():
+    assert resumable_uploads._merge_ranges(_chunks((0, 4), (6, 8))) == [[0, 4], [6, 8]]
+    assert resumable_uploads._merge_ranges([]) == []
+
+
+def test_is_complete():
+    assert resumable_uploads._is_complete([[0, 10]], 10)
+    assert resumable_uploads._is_complete([], 0)
+    assert not resumable_uploads._is_complete([[0, 4], [6, 10]], 10)
+    assert not resumable_uploads._is_complete([[1, 10]], 10)
+
+
+@pytest.fixture
+def upload(db):
+    return resumable_uploads.create_upload(
+        [{"name": "규정.txt", "size": 10}, {"name": "사진.png", "size": 3}], "primary", "", "admin_001",
+    )
+
+
+def _job_count() -> int:
+    conn = get_db()
+    try:
+        return conn.execute("SELECT count(*) FROM ingest_jobs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_out_of_order_and_repeated_chunks(upload):
+    upload_id = upload["upload_id"]
+    assert resumable_uploads.write_chunk(upload_id, 0, 6, b"6789") == [[6, 10]]
+    assert resumable_uploads.write_chunk(upload_id, 0, 0, b"0123") == [[0, 4], [6, 10]]
+    # 끊긴 뒤 같은 구간 재전송
+    assert resumable_uploads.write_chunk(upload_id, 0, 0, b"012345") == [[0, 10]]
+
+    state = resumable_uploads.get_upload(upload_id)
+    assert state["files"][0]["complete"]
+    assert state["received_bytes"] == 10
+    path = resumable_uploads._file_path(upload_id, 0, "규정.txt")
+    assert path.read_bytes() == b"0123456789"
+
+
+def test_finalize_requires_all_ranges(upload):
+    resumable_uploads.write_chunk(upload["upload_id"], 0, 0, b"0123")
+    with pytest.raises(ValueError):
+        resumable_uploads.finalize(upload["upload_id"])
+    assert _job_count() == 0
+
+
+def test_finalize_is_idempotent(upload):
+    upload_id = upload["upload_id"]
+    resumable_uploads.write_chunk(upload_id, 0, 0, b"0123456789")
+
+    job_id = resumable_uploads.finalize(upload_id)
+    assert resumable_uploads.finalize(upload_id) == job_id
+    assert _job_count() == 1
+
+    conn = get_db()
+    try:
+        files = conn.execute(
+            "SELECT file_name, status FROM ingest_job_files WHERE job_id = ? ORDER BY file_name", (job_id,)
+        ).fetchall()
+    finally:
+        conn.close()
+    # 지원하지 않는 확장자는 실패 항목으로 남음
+    assert {f["file_name"]: f["status"] for f in files} == {"규정.txt": "queued", "사진.png": "failed"}
+
+    with pytest.raises(ValueError):
+        resumable_uploads.write_chunk(upload_id, 0, 0, b"0")
+
+
+def test_chunk_outside_file_is_rejected(upload):
+    with pytest.raises(ValueError):
+        resumable_uploads.write_chunk(upload["upload_id"], 0, 8, b"abc")
+    with pytest.raises(LookupError):
+        resumable_uploads.write_chunk(upload["upload_id"], 5, 0, b"a")
+
+
+def test_create_rejects_unknown_store_type(db):
+    with pytest.raises(ValueError):
+        resumable_uploads.create_upload([{"name": "a.txt", "size": 1}], "secondary", "", "admin_001")
+
+
+def test_expire_stale_removes_abandoned_uploads(upload):
+    upload_id = upload["upload_id"]
+    resumable_uploads.write_chunk(upload_id, 0, 0, b"0123")
+    conn = get_db()
+    conn.execute("UPDATE resumable_uploads SET updated_at = datetime('now', '-1000 hours') WHERE id = ?", (upload_id,))
+    conn.commit()
+    conn.close()
+
+    resumable_uploads.expire_stale()
+    assert resumable_uploads.get_upload(upload_id) is None
+    assert not resumable_uploads._upload_dir(upload_id).exists()
+
+
+# ── API ───────────────────────────────────────────────
+
+def test_create_route_rejects_unknown_store_type(admin_client):
+    res = admin_client.post(
+        "/api/admin/resumable", json={"files": [{"name": "a.txt", "size": 1}], "store_type": "secondary"},
+    )
+    assert res.status_code == 422
+
+
+def test_oversized_chunk_is_refused_before_reading(admin_client, monkeypatch):
+    monkeypatch.setattr(config, "RESUMABLE_CHUNK_MB", 1)
+    upload_id = admin_client.post(
+        "/api/admin/resumable", json={"files": [{"name": "큰파일.txt", "size": 4 * 1024 * 1024}]},
+    ).json()["upload_id"]
+
+    res = admin_client.put(
+        f"/api/admin/resumable/{upload_id}/files/0?offset=0", content=b"x" * (2 * 1024 * 1024 + 1),
+    )
+    assert res.status_code == 413
+
+    # Content-Length 없이 (chunked) 보내도 받는 도중 제한
+    def body():
+        for _ in range(3):
+            yield b"x" * (1024 * 1024)
+
+    res = admin_client.put(f"/api/admin/resumable/{upload_id}/files/0?offset=0", content=body())
+    assert res.status_code == 413
+    assert resumable_uploads.get_upload(upload_id)["received_bytes"] == 0
@@ -0,0 +1,104 @@
+"""API 입력 검증, 채팅·피드백 라우트"""
+import asyncio
+import pytest
+import config
+from server import routes
+from server.database import get_db
+
+
+def _job_count() -> int:
+    conn = get_db()
+    try:
+        return conn.execute("SELECT count(*) FROM ingest_jobs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_path_upload_rejects_unknown_store_type(admin_client, tmp_path):
+    res = admin_client.post("/api/admin/upload", json={"path": str(tmp_path), "store_type": "secondary"})
+    assert res.status_code == 422
+    assert _job_count() == 0
+
+
+def test_client_upload_rejects_unknown_store_type(admin_client):
+    res = admin_client.post(
+        "/api/admin/upload_client",
+        data={"store_type": "secondary"},
+        files={"files": ("규정.txt", "본문".encode(), "text/plain")},
+    )
+    assert res.status_code == 400
+    assert "store_type" in res.json()["detail"]
+    assert _job_count() == 0
+
+
+# ── 채팅/피드백: SQLite는 이벤트 루프 밖에서 ───────────
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+@pytest.fixture
+def loop_checked_db(monkeypatch):
+    """routes의 get_db 호출마다 이벤트 루프 스레드에서 불렸는지 기록"""
+    calls = []
+
+    def get_db_checked():
+        calls.append(_on_event_loop())
+        return get_db()
+
+    monkeypatch.setattr(routes, "get_db", get_db_checked)
+    return calls
+
+
+def test_chat_runs_sqlite_off_the_event_loop(admin_client, loop_checked_db, monkeypatch):
+    async def fake_query(message, history):
+        return {"answer": "연차는 15일입니다", "citations": [{"title": "규정.txt", "uri": ""}],
+                "model": "fake", "fast_path": False}
+
+    monkeypatch.setattr(routes, "query_async", fake_query)
+    monkeypatch.setattr(config, "TITLE_BATCH_ENABLED", True)
+    session_id = admin_client.post("/api/sessions").json()["session_id"]
+    loop_checked_db.clear()
+
+    res = admin_client.post(f"/api/sessions/{session_id}/chat", json={"message": "연차는 며칠인가요"})
+    assert res.status_code == 200
+    assert res.json()["answer"] == "연차는 15일입니다"
+    assert loop_checked_db and not any(loop_checked_db)
+
+    conn = get_db()
+    try:
+        rows = conn.execute("SELECT role FROM messages WHERE session_id = ? ORDER BY id", (session_id,)).fetchall()
+    finally:
+        conn.close()
+    assert [r["role"] for r in rows] == ["user", "assistant"]
+
+
+def test_chat_unknown_session_is_404(admin_client, loop_checked_db):
+    res = admin_client.post("/api/sessions/sess_missing/chat", json={"message": "안녕"})
+    assert res.status_code == 404
+    assert not any(loop_checked_db)
+
+
+def test_feedback_runs_sqlite_off_the_event_loop(admin_client, loop_checked_db, monkeypatch):
+    session_id = admin_client.post("/api/sessions").json()["session_id"]
+    conn = get_db()
+    conn.execute("INSERT INTO messages (session_id, role, content) VALUES (?, 'user', '연차는 며칠인가요')", (session_id,))
+    conn.execute("INSERT INTO messages (session_id, role, content) VALUES (?, 'assistant', '10일입니다')", (session_id,))
+    conn.commit()
+    conn.close()
+
+    async def fake_analyze(original_question, ai_answer, user_feedback):
+        return {"original_question": original_question, "ai_wrong_answer": ai_answer,
+                "user_correction": user_feedback, "extracted_fact": "연차는 15일이다", "confidence": 0.9}
+
+    monkeypatch.setattr(routes, "analyze_feedback_async", fake_analyze)
+    res = admin_client.post("/api/feedback", json={
+        "session_id": session_id, "message_index": 1, "user_feedback": "15일입니다",
+    })
+    assert res.status_code == 200
+    assert res.json()["correction_id"].startswith("corr_")
+    assert loop_checked_db and not any(loop_checked_db)
@@ -0,0 +1,25 @@
+"""세션 제목 저장은 이벤트 루프 밖에서"""
+import asyncio
+from core import session_titles
+from server.database import get_db
+
+
+def test_generate_and_save_writes_off_the_event_loop(db, monkeypatch):
+    calls = []
+
+    def get_db_checked():
+        try:
+            asyncio.get_running_loop()
+            calls.append(True)
+        except RuntimeError:
+            calls.append(False)
+        return get_db()
+
+    async def fake_title(message):
+        return "연차 문의"
+
+    monkeypatch.setattr(session_titles, "get_db", get_db_checked)
+    monkeypatch.setattr(session_titles, "generate_session_title_async", fake_title)
+
+    asyncio.run(session_titles.generate_and_save("s1", "연차는 며칠?"))
+    assert calls == [False]